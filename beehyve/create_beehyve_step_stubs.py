@@ -7,20 +7,24 @@ As the extension just uses regex parsing, the steps need to be defined in a sing
 in a pure text file (i.e., does not detect python imports).
 
 This script will load all steps of **beehyve** and create a dummy file.
+Optionally, it also writes an index of the step definitions,
+which speeds up registering the steps in behave (see :py:mod:`beehyve.utils.registry_index`).
 """
 
-from typing import List, Sequence
+from typing import List, Optional, Sequence
 
 import click
 from behave.matchers import ParseMatcher
 from behave.step_registry import registry
 
 from beehyve.steps.all_steps import *  # noqa: F401,F403
+from beehyve.utils.registry_index import write_registry_index
 
 
 @click.command()
 @click.option("-o", "--output", help="output file path of the stub file", default="beehyve_stubs")
-def main(output: str) -> None:
+@click.option("-r", "--registry-index", help="output file path of the registry index (JSON)", default=None)
+def main(output: str, registry_index: Optional[str]) -> None:
     """Create a stub file for all beehyve steps."""
     step_definition_lines = []
 
@@ -31,6 +35,9 @@ def main(output: str) -> None:
 
     _write_to_file(step_definition_lines, output)
 
+    if registry_index is not None:
+        write_registry_index(registry_index, registry)
+
 
 def _convert_givens_to_stub() -> List[str]:
     givens = registry.steps["given"]
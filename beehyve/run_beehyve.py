@@ -0,0 +1,227 @@
+"""Script to run behave scenarios in parallel.
+
+Discovers all scenarios of the given feature files or directories, distributes them across shards,
+and runs every shard with behave in its own subprocess.
+As each subprocess runs exactly one shard, monkeypatching fixtures, context variables,
+and any other global state are fully isolated between shards. The subprocesses are regular (non-daemonic)
+processes, so scenarios can start process pools of their own.
+
+The JSON reports of all shards are merged into a single report using behave's JSON format.
+The assignment of scenarios to shards only depends on the given number of jobs and the seed,
+so runs are reproducible.
+"""
+
+import json
+import os
+import random
+import shlex
+import subprocess  # nosec: only used to run behave using the current interpreter
+import sys
+import tempfile
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import click
+from behave.parser import parse_file
+
+FAILED_STATUSES = ("failed", "error", "undefined")
+
+
+@click.command()
+@click.argument("paths", nargs=-1, type=click.Path(exists=True))
+@click.option("-j", "--jobs", help="number of parallel subprocesses", type=int, default=os.cpu_count() or 1)
+@click.option("-s", "--seed", help="seed used to shuffle scenarios before sharding", type=int, default=None)
+@click.option("-o", "--output", help="output file path of the merged JSON report", default="beehyve_report.json")
+@click.option("-a", "--behave-args", help='additional arguments passed to behave, e.g., "--tags=~@slow"', default="")
+@click.option("-u", "--update-snapshots", help="write missing or changed dataframe snapshots", is_flag=True)
+def main(
+    paths: Tuple[str, ...], jobs: int, seed: Optional[int], output: str, behave_args: str, update_snapshots: bool
+) -> None:
+    """Run behave scenarios in parallel using one subprocess per shard."""
+    locations = discover_scenarios(paths or ("features",))
+    shards = shard_scenarios(locations, jobs, seed=seed)
+
+    args = shlex.split(behave_args)
+    if update_snapshots:
+        args.extend(["-D", "update_snapshots=true"])
+
+    results = run_shards(shards, args)
+
+    for exit_code, _, log in results:
+        if exit_code != 0:
+            click.echo(log)
+
+    report = merge_reports([shard_report for _, shard_report, _ in results])
+    _write_report(report, output)
+
+    click.echo(_summarize_report(report))
+
+    sys.exit(max([exit_code for exit_code, _, _ in results], default=0))
+
+
+def discover_scenarios(paths: Sequence[str]) -> List[str]:
+    """Find all scenarios of the given feature files or directories.
+
+    Scenario outlines are expanded, i.e., every row of the examples is a separate scenario.
+
+    :param paths: paths to feature files or directories containing feature files
+    :return: the locations of all scenarios (:code:`<file>:<line>`) in order of the files and lines
+    """
+    locations = []
+    for feature_file in _find_feature_files(paths):
+        feature = parse_file(feature_file)
+        if feature is None:
+            continue
+        locations.extend([str(scenario.location) for scenario in feature.walk_scenarios()])
+    return locations
+
+
+def _find_feature_files(paths: Sequence[str]) -> List[str]:
+    feature_files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for directory, _, file_names in os.walk(path):
+                feature_files.extend(
+                    [os.path.join(directory, file_name) for file_name in file_names if file_name.endswith(".feature")]
+                )
+        else:
+            feature_files.append(path)
+    return sorted(feature_files)
+
+
+def shard_scenarios(locations: Sequence[str], n_shards: int, *, seed: Optional[int] = None) -> List[List[str]]:
+    """Distribute scenarios across shards.
+
+    Scenarios are distributed round-robin, after shuffling them if a seed is given.
+    Each shard keeps the original order of its scenarios.
+
+    :param locations: the locations of the scenarios to distribute
+    :param n_shards: the maximum number of shards, only non-empty shards are returned
+    :param seed: a seed used to shuffle the scenarios before distributing them, defaults to None (no shuffling)
+    :return: a list of shards, each being a list of scenario locations
+    """
+    if n_shards < 1:
+        raise ValueError(f"number of shards has to be positive, got {n_shards}")
+
+    order = list(range(len(locations)))
+    if seed is not None:
+        random.Random(seed).shuffle(order)  # nosec: not used for security purposes
+
+    shards: List[List[int]] = [[] for _ in range(min(n_shards, len(locations)))]
+    for i, position in enumerate(order):
+        shards[i % len(shards)].append(position)
+
+    return [[locations[position] for position in sorted(shard)] for shard in shards]
+
+
+def run_shards(shards: Sequence[Sequence[str]], behave_args: Sequence[str]) -> List[Tuple[int, List[Any], str]]:
+    """Run each shard with behave in a separate subprocess using the current Python interpreter.
+
+    :param shards: a list of shards, each being a list of scenario locations
+    :param behave_args: additional arguments passed to behave
+    :return: the exit code, the JSON report, and the console output of every shard
+    """
+    if not shards:
+        return []
+
+    with tempfile.TemporaryDirectory() as report_dir:
+        report_paths = [os.path.join(report_dir, f"shard_{i}") for i in range(len(shards))]
+        processes = [_start_shard(shard, behave_args, report_path) for shard, report_path in zip(shards, report_paths)]
+        return [_collect_shard(process, report_path) for process, report_path in zip(processes, report_paths)]
+
+
+def _start_shard(locations: Sequence[str], behave_args: Sequence[str], report_path: str) -> subprocess.Popen:
+    command = [
+        sys.executable,
+        "-m",
+        "behave",
+        *locations,
+        *behave_args,
+        "--format",
+        "json",
+        "--outfile",
+        report_path + ".json",
+        "--format",
+        "progress2",
+    ]
+    with open(report_path + ".log", "w") as log:
+        return subprocess.Popen(command, stdout=log, stderr=subprocess.STDOUT)  # nosec: fixed command of behave
+
+
+def _collect_shard(process: subprocess.Popen, report_path: str) -> Tuple[int, List[Any], str]:
+    exit_code = process.wait()
+
+    with open(report_path + ".log") as log:
+        output = log.read()
+
+    report = []
+    if os.path.exists(report_path + ".json"):
+        with open(report_path + ".json") as f:
+            report = json.load(f)
+
+    return exit_code, report, output
+
+
+def merge_reports(reports: Sequence[Sequence[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    """Merge the JSON reports of multiple behave runs into a single report.
+
+    Features are merged by their location, scenarios are ordered by their location within a feature.
+    If a scenario is part of multiple reports, the result of the run that did not skip it is used.
+
+    :param reports: behave reports created by the JSON formatter
+    :return: a single report in the format of behave's JSON formatter
+    """
+    features: Dict[str, Dict[str, Any]] = {}
+    elements: Dict[str, Dict[str, Dict[str, Any]]] = {}
+
+    for report in reports:
+        for feature in report:
+            location = feature["location"]
+            if location not in features:
+                features[location] = {key: val for key, val in feature.items() if key != "elements"}
+                elements[location] = {}
+
+            for element in feature.get("elements", []):
+                existing = elements[location].get(element["location"])
+                if existing is None or (existing.get("status") == "skipped" and element.get("status") != "skipped"):
+                    elements[location][element["location"]] = element
+
+    merged = []
+    for location in sorted(features, key=_location_sort_key):
+        feature = features[location]
+        feature["elements"] = [elements[location][key] for key in sorted(elements[location], key=_location_sort_key)]
+        feature["status"] = _merge_status([element.get("status") for element in feature["elements"]])
+        merged.append(feature)
+
+    return merged
+
+
+def _location_sort_key(location: str) -> Tuple[str, int]:
+    file_name, _, line = location.rpartition(":")
+    return file_name, int(line)
+
+
+def _merge_status(statuses: Sequence[Optional[str]]) -> str:
+    for status in FAILED_STATUSES:
+        if status in statuses:
+            return "failed"
+    if "passed" in statuses:
+        return "passed"
+    return "skipped"
+
+
+def _summarize_report(report: Sequence[Dict[str, Any]]) -> str:
+    counts: Dict[str, int] = {}
+    for feature in report:
+        for element in feature["elements"]:
+            if element["type"] == "scenario":
+                counts[element["status"]] = counts.get(element["status"], 0) + 1
+    return ", ".join([f"{count} scenarios {status}" for status, count in sorted(counts.items())])
+
+
+def _write_report(report: Sequence[Dict[str, Any]], file_name: str) -> None:
+    with open(file_name, "w") as f:
+        json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -4,4 +4,5 @@
 from beehyve.steps.function_steps import *
 from beehyve.steps.monkeypatch_steps import *
 from beehyve.steps.pandas_steps import *
+from beehyve.steps.performance_steps import *
 from beehyve.steps.variable_steps import *
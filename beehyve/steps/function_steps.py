@@ -1,25 +1,50 @@
 """Collection of step definitions for executing functions."""
 
-from typing import Mapping, Sequence, Tuple
+from typing import Any, Mapping, Optional, Sequence, Tuple
 
 from behave import register_type, when
 from behave.runner import Context
 
 from beehyve.steps import types
-from beehyve.utils.functions import execute_function, execute_function_from_context
+from beehyve.utils.functions import (
+    FunctionCall,
+    execute_function,
+    execute_function_from_context,
+    execute_function_measuring_memory,
+    execute_function_on_chunks,
+    execute_functions_concurrently,
+)
+from beehyve.utils.variables import add_var
+
+RSS_SAMPLING_INTERVAL_USERDATA = "rss_sampling_interval"
 
 register_type(Result=types.parse_func_result)
 register_type(Module=types.parse_module)
 register_type(Arguments=types.parse_args)
 register_type(KWArguments=types.parse_kwargs)
+register_type(ChunkedFile=types.parse_chunked_file_path)
+register_type(
+    ChunkOptions=types.create_limited_kwarg_parser(["chunksize", "executor", "max_workers", "combine", "output"])
+)
 
 
 @when("the function {func_name:w} of module {module:Module} is called writing the results to {result_names:Result}")
 @when("{result_names:Result} <- {module:Module}.{func_name:w}()")
 @when("the function {func_name:w} of module {module:Module} is called")
 @when("{module:Module}.{func_name:w}() is called")
+@when(
+    "the function {func_name:w} of module {module:Module} is called writing the results to {result_names:Result} "
+    "within {timeout:g} seconds"
+)
+@when("{result_names:Result} <- {module:Module}.{func_name:w}() within {timeout:g} seconds")
+@when("the function {func_name:w} of module {module:Module} is called within {timeout:g} seconds")
+@when("{module:Module}.{func_name:w}() is called within {timeout:g} seconds")
 def step_execute_function_from_context(
-    context: Context, func_name: str, module: str, result_names: Tuple[str, ...] = ()
+    context: Context,
+    func_name: str,
+    module: str,
+    result_names: Tuple[str, ...] = (),
+    timeout: Optional[float] = None,
 ) -> None:
     """Execute an arbitrary python function using the variables in the context.
 
@@ -30,8 +55,11 @@ def step_execute_function_from_context(
     :param module: the module where the function can be found,
         i.e., you should be able to import <func_name> from <module>
     :param result_names: a tuple of variable names to which the result(s) of the function should be assigned
+    :param timeout: the maximum duration of the call in seconds, defaults to None
     """
-    execute_function_from_context(context=context, func_name=func_name, module=module, result_names=result_names)
+    execute_function_from_context(
+        context=context, func_name=func_name, module=module, result_names=result_names, timeout=timeout
+    )
 
 
 @when(
@@ -45,6 +73,20 @@ def step_execute_function_from_context(
     "using arguments {args:Arguments} and keyword arguments {kwargs:KWArguments}"
 )
 @when("{module:Module}.{func_name:w}({args:Arguments}{kwargs:KWArguments}) is called")
+@when(
+    "the function {func_name:w} of module {module:Module} is called "
+    "using arguments {args:Arguments} and keyword arguments {kwargs:KWArguments} "
+    "writing the results to {result_names:Result} within {timeout:g} seconds"
+)
+@when(
+    "{result_names:Result} <- {module:Module}.{func_name:w}({args:Arguments}{kwargs:KWArguments}) "
+    "within {timeout:g} seconds"
+)
+@when(
+    "the function {func_name:w} of module {module:Module} is called "
+    "using arguments {args:Arguments} and keyword arguments {kwargs:KWArguments} within {timeout:g} seconds"
+)
+@when("{module:Module}.{func_name:w}({args:Arguments}{kwargs:KWArguments}) is called within {timeout:g} seconds")
 def step_execute_function_with_given_variables(
     context: Context,
     func_name: str,
@@ -52,6 +94,7 @@ def step_execute_function_with_given_variables(
     args: Sequence[str],
     kwargs: Mapping[str, str],
     result_names: Tuple[str, ...] = (),
+    timeout: Optional[float] = None,
 ) -> None:
     """Execute an arbitrary python function using the given variables names as args and kwargs.
 
@@ -64,6 +107,7 @@ def step_execute_function_with_given_variables(
     :param result_names: a tuple of variable names to which the result(s) of the function should be assigned
     :param args: variable names of the variables which should be used as arguments to the function
     :param kwargs: a mapping of function kwarg to variable name which should be passed to the function
+    :param timeout: the maximum duration of the call in seconds, defaults to None
     """
     execute_function(
         context=context,
@@ -72,4 +116,152 @@ def step_execute_function_with_given_variables(
         result_names=result_names,
         args=args,
         kwargs=kwargs,
+        timeout=timeout,
+    )
+
+
+@when(
+    "the function {func_name:w} of module {module:Module} is called writing the results to {result_names:Result} "
+    "measuring its peak memory"
+)
+@when("{result_names:Result} <- {module:Module}.{func_name:w}() measuring its peak memory")
+@when("the function {func_name:w} of module {module:Module} is called measuring its peak memory")
+@when("{module:Module}.{func_name:w}() is called measuring its peak memory")
+@when(
+    "the function {func_name:w} of module {module:Module} is called "
+    "using arguments {args:Arguments} and keyword arguments {kwargs:KWArguments} "
+    "writing the results to {result_names:Result} measuring its peak memory"
+)
+@when(
+    "{result_names:Result} <- {module:Module}.{func_name:w}({args:Arguments}{kwargs:KWArguments}) "
+    "measuring its peak memory"
+)
+@when(
+    "the function {func_name:w} of module {module:Module} is called "
+    "using arguments {args:Arguments} and keyword arguments {kwargs:KWArguments} measuring its peak memory"
+)
+@when("{module:Module}.{func_name:w}({args:Arguments}{kwargs:KWArguments}) is called measuring its peak memory")
+def step_execute_function_measuring_memory(
+    context: Context,
+    func_name: str,
+    module: str,
+    args: Optional[Sequence[str]] = None,
+    kwargs: Optional[Mapping[str, str]] = None,
+    result_names: Tuple[str, ...] = (),
+) -> None:
+    """Execute an arbitrary python function and store its memory usage in the variable :code:`<func_name>_memory`.
+
+    For more details see :py:func:`execute_function_measuring_memory`.
+    The memory usage is stored as a dict of the fields of :py:class:`beehyve.utils.memory.MemoryUsage` in bytes.
+    The RSS of the process is only sampled if the user data :code:`rss_sampling_interval` is set to an interval
+    in seconds, e.g., using :code:`-D rss_sampling_interval=0.01`.
+
+    :param context: the current context
+    :param func_name: the name of the function to execute
+    :param module: the module where the function can be found,
+        i.e., you should be able to import <func_name> from <module>
+    :param args: variable names of the variables which should be used as arguments to the function,
+        defaults to None (the variables named like the parameters of the function are used)
+    :param kwargs: a mapping of function kwarg to variable name which should be passed to the function, defaults to None
+    :param result_names: a tuple of variable names to which the result(s) of the function should be assigned
+    """
+    userdata = context.config.userdata
+    rss_interval = (
+        userdata.getfloat(RSS_SAMPLING_INTERVAL_USERDATA) if RSS_SAMPLING_INTERVAL_USERDATA in userdata else None
+    )
+    usage = execute_function_measuring_memory(
+        context=context,
+        func_name=func_name,
+        module=module,
+        args=args,
+        kwargs=kwargs,
+        result_names=result_names,
+        rss_interval=rss_interval,
+    )
+    add_var(context, f"{func_name}_memory", usage._asdict())
+
+
+@when("the following functions are called concurrently")
+@when("the following functions are called concurrently within {timeout:g} seconds")
+def step_execute_functions_concurrently(context: Context, timeout: Optional[float] = None) -> None:
+    """Execute several python functions, awaiting the results of async functions concurrently.
+
+    For more details see :py:func:`execute_functions_concurrently`.
+
+    :param context: the current context, containing a table with the columns :code:`function`,
+        e.g., :code:`module.func(var_1, b=var_2)`, and optionally :code:`results`, e.g., :code:`(res_1, res_2)`
+    :param timeout: the maximum time to wait for the results of all functions in seconds, defaults to None
+    """
+    calls = []
+    for row in context.table:
+        module, func_name, args, kwargs = types.parse_function_call(row["function"])
+        results = row.get("results", "").strip()
+        result_names = types.parse_func_result(results) if results else ()
+        calls.append(FunctionCall(func_name, module, args, kwargs, result_names))
+
+    execute_functions_concurrently(context=context, calls=calls, timeout=timeout)
+
+
+@when(
+    "the function {func_name:w} of module {module:Module} is called on chunks of {file_name:ChunkedFile} "
+    "as {chunk_arg:w} writing the results to {result_names:Result} (options: {options:ChunkOptions})"
+)
+@when(
+    "{result_names:Result} <- {module:Module}.{func_name:w}({args:Arguments}{kwargs:KWArguments}) "
+    "on chunks of {file_name:ChunkedFile} as {chunk_arg:w} ({options:ChunkOptions})"
+)
+@when(
+    "the function {func_name:w} of module {module:Module} is called on chunks of {file_name:ChunkedFile} "
+    "as {chunk_arg:w} writing the results to {result_names:Result}"
+)
+@when(
+    "{result_names:Result} <- {module:Module}.{func_name:w}({args:Arguments}{kwargs:KWArguments}) "
+    "on chunks of {file_name:ChunkedFile} as {chunk_arg:w}"
+)
+@when(
+    "the function {func_name:w} of module {module:Module} is called on chunks of {file_name:ChunkedFile} "
+    "as {chunk_arg:w} (options: {options:ChunkOptions})"
+)
+@when(
+    "{module:Module}.{func_name:w}({args:Arguments}{kwargs:KWArguments}) is called "
+    "on chunks of {file_name:ChunkedFile} as {chunk_arg:w} ({options:ChunkOptions})"
+)
+def step_execute_function_on_chunks(
+    context: Context,
+    func_name: str,
+    module: str,
+    file_name: str,
+    chunk_arg: str,
+    args: Sequence[str] = (),
+    kwargs: Mapping[str, str] = None,
+    result_names: Tuple[str, ...] = (),
+    options: Mapping[str, Any] = None,
+) -> None:
+    """Execute an arbitrary python function on every chunk of rows of a CSV or Parquet file.
+
+    For more details see :py:func:`execute_function_on_chunks`.
+
+    :param context: the current context
+    :param func_name: the name of the function to execute
+    :param module: the module where the function can be found,
+        i.e., you should be able to import <func_name> from <module>
+    :param file_name: the name of the CSV or Parquet file
+    :param chunk_arg: the name of the keyword argument used to pass the chunk to the function
+    :param args: variable names of the variables which should be used as arguments to the function
+    :param kwargs: a mapping of function kwarg to variable name which should be passed to the function
+    :param result_names: a tuple of variable names to which the combined output should be assigned
+    :param options: a mapping of the optional keyword arguments :code:`chunksize`, :code:`executor`,
+        :code:`max_workers`, :code:`combine`, and :code:`output` to be passed to
+        :py:func:`execute_function_on_chunks`
+    """
+    execute_function_on_chunks(
+        context=context,
+        func_name=func_name,
+        module=module,
+        file_name=file_name,
+        chunk_arg=chunk_arg,
+        args=args,
+        kwargs=kwargs,
+        result_names=result_names,
+        **(options or {}),
     )
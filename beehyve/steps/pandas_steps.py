@@ -1,30 +1,71 @@
 """Collection of step definitions for loading and comparing pandas DataFrames and Series."""
 
+import importlib
+import os
 from typing import Any, Dict, Mapping
 
-import pandas as pd
 from behave import given, register_type, then
 from behave.runner import Context
-from behave_pandas import table_to_dataframe
 
 from beehyve.steps import types
-from beehyve.utils.pandas import compare_dataframes, compare_series
+from beehyve.utils.lazy import lazy_import
 from beehyve.utils.variables import add_var, get_var
 
+# the utilities import pandas, which is only done once the first step using them is run
+files = lazy_import("beehyve.utils.files")
+pandas_utils = lazy_import("beehyve.utils.pandas")
+snapshots = lazy_import("beehyve.utils.snapshots")
+streaming = lazy_import("beehyve.utils.streaming")
+synthetic = lazy_import("beehyve.utils.synthetic")
+tables = lazy_import("beehyve.utils.tables")
+
 DEFAULT_COLUMN_LEVEL = 1
 
 register_type(Dict=types.parse_dict)
 register_type(CSVFile=types.parse_csv_file_path)
+register_type(ParquetFile=types.parse_parquet_file_path)
+register_type(FeatherFile=types.parse_feather_file_path)
+register_type(Module=types.parse_module)
 
 register_type(
     FrameEqualsKWArgs=types.create_limited_kwarg_parser(
-        ["ignore_index", "common_columns_only", "ignore_dtypes", "atol", "rtol", "check_exact"]
+        [
+            "ignore_index",
+            "common_columns_only",
+            "ignore_dtypes",
+            "ignore_row_order",
+            "atol",
+            "rtol",
+            "check_exact",
+            "max_report_rows",
+        ]
+    )
+)
+
+register_type(
+    CSVEqualsKWArgs=types.create_limited_kwarg_parser(
+        [
+            "ignore_index",
+            "common_columns_only",
+            "ignore_dtypes",
+            "atol",
+            "rtol",
+            "check_exact",
+            "max_report_rows",
+            "chunksize",
+        ]
+    )
+)
+
+register_type(
+    ChunksEqualsKWArgs=types.create_limited_kwarg_parser(
+        ["ignore_index", "common_columns_only", "ignore_dtypes", "atol", "rtol", "check_exact", "max_report_rows"]
     )
 )
 
 register_type(
     SeriesEqualsKWArgs=types.create_limited_kwarg_parser(
-        ["ignore_index", "ignore_dtypes", "ignore_names", "atol", "rtol", "check_exact"]
+        ["ignore_index", "ignore_dtypes", "ignore_names", "ignore_row_order", "atol", "rtol", "check_exact"]
     )
 )
 
@@ -34,12 +75,12 @@ register_type(
 def step_load_table_into_df(context: Context, name: str) -> None:
     """Load and parse a behave table into a :class:`pandas.DataFrame`.
 
-    Uses `behave_pandas <https://pypi.org/project/behave-pandas/>`_.
+    Uses :py:func:`parse_table`, i.e., identical tables are only parsed once if the table cache is enabled.
 
     :param context: the current context
     :param name: the name of the variable to which the dataframe should be assigned
     """
-    add_var(context, name, table_to_dataframe(context.table, column_levels=DEFAULT_COLUMN_LEVEL))
+    add_var(context, name, tables.parse_table(context.table, column_levels=DEFAULT_COLUMN_LEVEL))
 
 
 @given("the following table is loaded into series {name:w}")
@@ -47,12 +88,12 @@ def step_load_table_into_df(context: Context, name: str) -> None:
 def step_load_table_into_series(context: Context, name: str) -> None:
     """Load and parse a behave table into a :class:`pandas.Series`.
 
-    Uses `behave_pandas <https://pypi.org/project/behave-pandas/>`_.
+    Uses :py:func:`parse_table`, i.e., identical tables are only parsed once if the table cache is enabled.
 
     :param context: the current context
     :param name: the name of the variable to which the series should be assigned
     """
-    add_var(context, name, table_to_dataframe(context.table, column_levels=DEFAULT_COLUMN_LEVEL).squeeze())
+    add_var(context, name, tables.parse_table(context.table, column_levels=DEFAULT_COLUMN_LEVEL).squeeze())
 
 
 @given("the CSV file {file_name:CSVFile} is loaded into dataframe {name:w} (read_csv kwargs: {kwargs:Dict})")
@@ -64,6 +105,8 @@ def step_load_csv_into_df_with_kwargs(
 ) -> None:
     """Load a CSV into a :class:`pandas.DataFrame` with additional kwargs.
 
+    Uses :py:func:`read_csv`, i.e., the file is only parsed once if the CSV cache is enabled.
+
     :param context: the current context
     :param file_name: the name of the CSV file to load
     :param name: the name of the variable to which the dataframe should be assigned
@@ -71,7 +114,78 @@ def step_load_csv_into_df_with_kwargs(
     """
     if not kwargs:
         kwargs = dict()
-    df = pd.read_csv(file_name, **kwargs)
+    df = files.read_csv(file_name, **kwargs)
+    add_var(context, name, df)
+
+
+@given("the Parquet file {file_name:ParquetFile} is loaded into dataframe {name:w} (read kwargs: {kwargs:Dict})")
+@given("dataframe {name:w} <- read({file_name:ParquetFile}, kwargs={kwargs:Dict})")
+@given("the Parquet file {file_name:ParquetFile} is loaded into dataframe {name:w}")
+@given("dataframe {name:w} <- read({file_name:ParquetFile})")
+def step_load_parquet_into_df_with_kwargs(
+    context: Context, file_name: str, name: str, kwargs: Dict[str, Any] = None
+) -> None:
+    """Load a Parquet file into a :class:`pandas.DataFrame` with optional column selection and row filters.
+
+    Uses :py:func:`read_parquet`.
+
+    :param context: the current context
+    :param file_name: the name of the Parquet file to load
+    :param name: the name of the variable to which the dataframe should be assigned
+    :param kwargs: a dict containing the optional kwargs :code:`columns` and :code:`filters`
+        to be passed to :py:func:`read_parquet`
+    """
+    if not kwargs:
+        kwargs = dict()
+    df = files.read_parquet(file_name, **kwargs)
+    add_var(context, name, df)
+
+
+@given("the Feather file {file_name:FeatherFile} is loaded into dataframe {name:w} (read kwargs: {kwargs:Dict})")
+@given("dataframe {name:w} <- read({file_name:FeatherFile}, kwargs={kwargs:Dict})")
+@given("the Feather file {file_name:FeatherFile} is loaded into dataframe {name:w}")
+@given("dataframe {name:w} <- read({file_name:FeatherFile})")
+def step_load_feather_into_df_with_kwargs(
+    context: Context, file_name: str, name: str, kwargs: Dict[str, Any] = None
+) -> None:
+    """Load a Feather / Arrow IPC file into a :class:`pandas.DataFrame` with optional column selection and row filters.
+
+    Uses :py:func:`read_feather`, i.e., the file is memory-mapped.
+
+    :param context: the current context
+    :param file_name: the name of the Feather file to load
+    :param name: the name of the variable to which the dataframe should be assigned
+    :param kwargs: a dict containing the optional kwargs :code:`columns` and :code:`filters`
+        to be passed to :py:func:`read_feather`
+    """
+    if not kwargs:
+        kwargs = dict()
+    df = files.read_feather(file_name, **kwargs)
+    add_var(context, name, df)
+
+
+@given("a synthetic dataframe {name:w} with {n_rows:g} rows is generated from the following schema (seed: {seed:d})")
+@given("dataframe {name:w} <- generate({n_rows:g} rows, seed={seed:d})")
+@given("a synthetic dataframe {name:w} with {n_rows:g} rows is generated from the following schema")
+@given("dataframe {name:w} <- generate({n_rows:g} rows)")
+def step_generate_synthetic_df(context: Context, name: str, n_rows: float, seed: int = None) -> None:
+    """Generate a large :class:`pandas.DataFrame` of random values from a schema, e.g., for load tests.
+
+    The schema contains a row per column with the columns :code:`column` and :code:`dtype`
+    and optionally :code:`distribution`, :code:`cardinality`, :code:`null_rate`, and :code:`references`
+    (e.g., :code:`users.user_id`, the referenced dataframe needs to be a variable).
+    For more details see :py:func:`beehyve.utils.synthetic.generate_dataframe`.
+
+    :param context: the current context
+    :param name: the name of the variable to which the dataframe should be assigned
+    :param n_rows: the number of rows, e.g., :code:`1e7`
+    :param seed: the seed of the random number generators, defaults to None (seed 0)
+    """
+    columns = [synthetic.parse_column_spec(row) for row in context.table]
+    references = {spec.reference[0]: get_var(context, spec.reference[0]) for spec in columns if spec.reference}
+    df = synthetic.generate_dataframe(
+        columns, int(n_rows), seed=synthetic.DEFAULT_SEED if seed is None else seed, references=references
+    )
     add_var(context, name, df)
 
 
@@ -91,8 +205,8 @@ def step_df_equal_to_table_w_kwargs(context: Context, name: str, kwargs: Mapping
     if not kwargs:
         kwargs = dict()
     df1 = get_var(context, name)
-    df2 = table_to_dataframe(context.table, column_levels=DEFAULT_COLUMN_LEVEL)
-    compare_dataframes(df1, df2, **kwargs)
+    df2 = tables.parse_table(context.table, column_levels=DEFAULT_COLUMN_LEVEL)
+    pandas_utils.compare_dataframes(df1, df2, **kwargs)
 
 
 @then("dataframe {name1:w} is equal to dataframe {name2:w} (kwargs: {kwargs:FrameEqualsKWArgs})")
@@ -113,7 +227,68 @@ def step_df_equal_to_df_w_kwargs(context: Context, name1: str, name2: str, kwarg
         kwargs = dict()
     df1 = get_var(context, name1)
     df2 = get_var(context, name2)
-    compare_dataframes(df1, df2, **kwargs)
+    pandas_utils.compare_dataframes(df1, df2, **kwargs)
+
+
+@then("dataframe {name:w} is equal to CSV file {file_name:CSVFile} (kwargs: {kwargs:CSVEqualsKWArgs})")
+@then("dataframe {name:w} equals read({file_name:CSVFile}) ({kwargs:CSVEqualsKWArgs})")
+@then("dataframe {name:w} is equal to CSV file {file_name:CSVFile}")
+@then("dataframe {name:w} equals read({file_name:CSVFile})")
+# the steps with read_csv kwargs are registered first, so that they are not matched by the kwargs above
+@then(
+    "dataframe {name:w} is equal to CSV file {file_name:CSVFile} "
+    "(kwargs: {kwargs:CSVEqualsKWArgs}, read_csv kwargs: {read_kwargs:Dict})"
+)
+@then("dataframe {name:w} equals read({file_name:CSVFile}, kwargs={read_kwargs:Dict}) ({kwargs:CSVEqualsKWArgs})")
+@then("dataframe {name:w} is equal to CSV file {file_name:CSVFile} (read_csv kwargs: {read_kwargs:Dict})")
+@then("dataframe {name:w} equals read({file_name:CSVFile}, kwargs={read_kwargs:Dict})")
+def step_df_equal_to_csv_w_kwargs(
+    context: Context,
+    name: str,
+    file_name: str,
+    kwargs: Mapping[str, Any] = None,
+    read_kwargs: Mapping[str, Any] = None,
+) -> None:
+    """Check whether a dataframe is equal to a CSV file, reading and comparing the file in chunks of rows.
+
+    Uses :py:func:`compare_dataframe_to_csv`, i.e., the file is never loaded into memory as a whole.
+
+    :param context: the current context
+    :param name: the name of the variable in which the dataframe is stored
+    :param file_name: the name of the CSV file containing the expected dataframe
+    :param kwargs: a mapping of keyword argments to be passed to :py:func:`compare_dataframe_to_csv`
+    :param read_kwargs: a dict containing kwargs to be passed to :func:`pandas.read_csv`
+    """
+    if not kwargs:
+        kwargs = dict()
+    df = get_var(context, name)
+    files.compare_dataframe_to_csv(df, file_name, read_kwargs=read_kwargs, **kwargs)
+
+
+@then("dataframe {name:w} matches snapshot {snapshot_name:w} (kwargs: {kwargs:FrameEqualsKWArgs})")
+@then("dataframe {name:w} equals snapshot({snapshot_name:w}) ({kwargs:FrameEqualsKWArgs})")
+@then("dataframe {name:w} matches snapshot {snapshot_name:w}")
+@then("dataframe {name:w} equals snapshot({snapshot_name:w})")
+def step_df_equal_to_snapshot_w_kwargs(
+    context: Context, name: str, snapshot_name: str, kwargs: Mapping[str, Any] = None
+) -> None:
+    """Check whether a dataframe matches a snapshot stored in the directory :code:`snapshots` next to the feature file.
+
+    Uses :py:func:`compare_dataframe_to_snapshot`.
+    Snapshots are updated if the environment variable :code:`BEEHYVE_UPDATE_SNAPSHOTS` is set to 1
+    or behave is run with :code:`-D update_snapshots=true`.
+
+    :param context: the current context
+    :param name: the name of the variable in which the dataframe is stored
+    :param snapshot_name: the name of the snapshot
+    :param kwargs: a mapping of keyword argments to be passed to :py:func:`compare_dataframes`
+    """
+    if not kwargs:
+        kwargs = dict()
+    df = get_var(context, name)
+    directory = os.path.join(os.path.dirname(context.feature.filename), snapshots.SNAPSHOT_DIR_NAME)
+    update = snapshots.is_update_requested() or context.config.userdata.getbool("update_snapshots")
+    snapshots.compare_dataframe_to_snapshot(df, snapshot_name, directory, update, **kwargs)
 
 
 @then("series {name:w} is equal to (kwargs: {kwargs:SeriesEqualsKWArgs})")
@@ -132,8 +307,8 @@ def step_series_equal_to_table_w_kwargs(context: Context, name: str, kwargs: Map
     if not kwargs:
         kwargs = dict()
     series1 = get_var(context, name)
-    series2 = table_to_dataframe(context.table, column_levels=DEFAULT_COLUMN_LEVEL).squeeze()
-    compare_series(series1, series2, **kwargs)
+    series2 = tables.parse_table(context.table, column_levels=DEFAULT_COLUMN_LEVEL).squeeze()
+    pandas_utils.compare_series(series1, series2, **kwargs)
 
 
 @then("series {name1:w} is equal to series {name2:w} (kwargs: {kwargs:SeriesEqualsKWArgs})")
@@ -156,4 +331,97 @@ def step_series_equal_to_series_w_kwargs(
         kwargs = dict()
     series1 = get_var(context, name1)
     series2 = get_var(context, name2)
-    compare_series(series1, series2, **kwargs)
+    pandas_utils.compare_series(series1, series2, **kwargs)
+
+
+@then("the chunks of {name:w} are equal to dataframe {expected:w} (kwargs: {kwargs:ChunksEqualsKWArgs})")
+@then("chunks({name:w}) equals {expected:w} ({kwargs:ChunksEqualsKWArgs})")
+@then("the chunks of {name:w} are equal to dataframe {expected:w}")
+@then("chunks({name:w}) equals {expected:w}")
+def step_chunks_equal_to_df_w_kwargs(
+    context: Context, name: str, expected: str, kwargs: Mapping[str, Any] = None
+) -> None:
+    """Check whether the chunks of a result (e.g., a generator of dataframes) are equal to a dataframe.
+
+    Uses :py:func:`beehyve.utils.streaming.compare_chunks`, i.e., the chunks are compared one after another
+    and are consumed by this step.
+
+    :param context: the current context
+    :param name: the name of the variable in which the chunks are stored
+    :param expected: the name of the variable in which the expected dataframe is stored
+    :param kwargs: a mapping of keyword argments to be passed to :py:func:`compare_dataframes`
+    """
+    if not kwargs:
+        kwargs = dict()
+    streaming.compare_chunks(get_var(context, name), get_var(context, expected), **kwargs)
+
+
+@then("the chunks of {name:w} are equal to CSV file {file_name:CSVFile} (kwargs: {kwargs:CSVEqualsKWArgs})")
+@then("chunks({name:w}) equals read({file_name:CSVFile}) ({kwargs:CSVEqualsKWArgs})")
+@then("the chunks of {name:w} are equal to CSV file {file_name:CSVFile}")
+@then("chunks({name:w}) equals read({file_name:CSVFile})")
+# the steps with read_csv kwargs are registered first, so that they are not matched by the kwargs above
+@then(
+    "the chunks of {name:w} are equal to CSV file {file_name:CSVFile} "
+    "(kwargs: {kwargs:CSVEqualsKWArgs}, read_csv kwargs: {read_kwargs:Dict})"
+)
+@then("chunks({name:w}) equals read({file_name:CSVFile}, kwargs={read_kwargs:Dict}) ({kwargs:CSVEqualsKWArgs})")
+@then("the chunks of {name:w} are equal to CSV file {file_name:CSVFile} (read_csv kwargs: {read_kwargs:Dict})")
+@then("chunks({name:w}) equals read({file_name:CSVFile}, kwargs={read_kwargs:Dict})")
+def step_chunks_equal_to_csv_w_kwargs(
+    context: Context,
+    name: str,
+    file_name: str,
+    kwargs: Mapping[str, Any] = None,
+    read_kwargs: Mapping[str, Any] = None,
+) -> None:
+    """Check whether the chunks of a result (e.g., a generator of dataframes) are equal to a CSV file.
+
+    Uses :py:func:`beehyve.utils.streaming.compare_chunks_to_csv`, i.e., neither the results nor the file
+    are loaded into memory as a whole and the chunks are consumed by this step.
+
+    :param context: the current context
+    :param name: the name of the variable in which the chunks are stored
+    :param file_name: the name of the CSV file containing the expected dataframe
+    :param kwargs: a mapping of keyword argments to be passed to :py:func:`compare_chunks_to_csv`
+    :param read_kwargs: a dict containing kwargs to be passed to :func:`pandas.read_csv`
+    """
+    if not kwargs:
+        kwargs = dict()
+    streaming.compare_chunks_to_csv(get_var(context, name), file_name, read_kwargs=read_kwargs, **kwargs)
+
+
+@then("the chunks of {name:w} have {n_rows:d} rows in total (at most {max_rows:d} rows per chunk)")
+@then("len(chunks({name:w})) equals {n_rows:d} (max_rows={max_rows:d})")
+@then("the chunks of {name:w} have {n_rows:d} rows in total")
+@then("len(chunks({name:w})) equals {n_rows:d}")
+def step_chunks_have_n_rows(context: Context, name: str, n_rows: int, max_rows: int = None) -> None:
+    """Check the total number of rows of the chunks of a result (e.g., a generator of dataframes).
+
+    Uses :py:func:`beehyve.utils.streaming.count_rows`, i.e., the chunks are consumed by this step.
+
+    :param context: the current context
+    :param name: the name of the variable in which the chunks are stored
+    :param n_rows: the expected number of rows of all chunks
+    :param max_rows: the maximum number of rows of every chunk, defaults to None (chunks of any size)
+    """
+    n_chunks, actual_rows = streaming.count_rows(get_var(context, name), max_rows=max_rows)
+    assert actual_rows == n_rows, f"the {n_chunks} chunks of {name} have {actual_rows} rows, expected {n_rows}"
+
+
+@then("every chunk of {name:w} satisfies {module:Module}.{func_name:w}")
+@then("chunks({name:w}) satisfy {module:Module}.{func_name:w}")
+def step_chunks_satisfy_invariant(context: Context, name: str, module: str, func_name: str) -> None:
+    """Check an invariant for every chunk of a result (e.g., a generator of dataframes).
+
+    The function is called with every chunk and fails by returning a falsy value (except for None)
+    or by raising an :py:class:`AssertionError`. Uses :py:func:`beehyve.utils.streaming.check_chunks`,
+    i.e., the chunks are consumed by this step.
+
+    :param context: the current context
+    :param name: the name of the variable in which the chunks are stored
+    :param module: the module where the function can be found
+    :param func_name: the name of the function checking a single chunk
+    """
+    check = getattr(importlib.import_module(module), func_name)
+    streaming.check_chunks(get_var(context, name), check)
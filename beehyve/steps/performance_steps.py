@@ -0,0 +1,281 @@
+"""Collection of step definitions for measuring the performance of functions."""
+
+from typing import Any, Callable, Mapping, Optional, Sequence
+
+from behave import register_type, then, when
+from behave.runner import Context
+
+from beehyve.steps import types
+from beehyve.utils import benchmarking
+from beehyve.utils.functions import prepare_function_call
+from beehyve.utils.lazy import lazy_import
+from beehyve.utils.variables import add_var, get_from_module, get_var
+
+# the memory and scaling utilities import pandas, which is only done once the first step using them is run
+memory = lazy_import("beehyve.utils.memory")
+scaling = lazy_import("beehyve.utils.scaling")
+
+BENCHMARK_HISTORY_USERDATA = "benchmark_history"
+
+register_type(Module=types.parse_module)
+register_type(Arguments=types.parse_args)
+register_type(KWArguments=types.parse_kwargs)
+register_type(RuntimeStatistic=types.parse_runtime_statistic)
+register_type(TimeUnit=types.parse_time_unit)
+register_type(MemoryMeasure=types.parse_memory_measure)
+register_type(MemoryUnit=types.parse_memory_unit)
+register_type(Complexity=types.parse_complexity)
+
+
+@when("the function {func_name:w} of module {module:Module} is benchmarked {repeat:d} times")
+@when(
+    "the function {func_name:w} of module {module:Module} is benchmarked {repeat:d} times "
+    "after {warmup:d} warm-up runs"
+)
+@when("{module:Module}.{func_name:w}() is benchmarked {repeat:d} times")
+@when("{module:Module}.{func_name:w}() is benchmarked {repeat:d} times after {warmup:d} warm-up runs")
+@when(
+    "the function {func_name:w} of module {module:Module} is benchmarked {repeat:d} times "
+    "using arguments {args:Arguments} and keyword arguments {kwargs:KWArguments}"
+)
+@when(
+    "the function {func_name:w} of module {module:Module} is benchmarked {repeat:d} times "
+    "after {warmup:d} warm-up runs using arguments {args:Arguments} and keyword arguments {kwargs:KWArguments}"
+)
+@when("{module:Module}.{func_name:w}({args:Arguments}{kwargs:KWArguments}) is benchmarked {repeat:d} times")
+@when(
+    "{module:Module}.{func_name:w}({args:Arguments}{kwargs:KWArguments}) is benchmarked {repeat:d} times "
+    "after {warmup:d} warm-up runs"
+)
+@when(
+    "the function {func_name:w} of module {module:Module} is benchmarked {repeat:d} times "
+    "writing the statistics to {result_name:w}"
+)
+@when(
+    "the function {func_name:w} of module {module:Module} is benchmarked {repeat:d} times "
+    "after {warmup:d} warm-up runs writing the statistics to {result_name:w}"
+)
+@when("{result_name:w} <- {module:Module}.{func_name:w}() benchmarked {repeat:d} times")
+@when("{result_name:w} <- {module:Module}.{func_name:w}() benchmarked {repeat:d} times after {warmup:d} warm-up runs")
+@when(
+    "the function {func_name:w} of module {module:Module} is benchmarked {repeat:d} times "
+    "using arguments {args:Arguments} and keyword arguments {kwargs:KWArguments} "
+    "writing the statistics to {result_name:w}"
+)
+@when(
+    "the function {func_name:w} of module {module:Module} is benchmarked {repeat:d} times "
+    "after {warmup:d} warm-up runs using arguments {args:Arguments} and keyword arguments {kwargs:KWArguments} "
+    "writing the statistics to {result_name:w}"
+)
+@when(
+    "{result_name:w} <- {module:Module}.{func_name:w}({args:Arguments}{kwargs:KWArguments}) "
+    "benchmarked {repeat:d} times"
+)
+@when(
+    "{result_name:w} <- {module:Module}.{func_name:w}({args:Arguments}{kwargs:KWArguments}) "
+    "benchmarked {repeat:d} times after {warmup:d} warm-up runs"
+)
+def step_benchmark_function(
+    context: Context,
+    func_name: str,
+    module: str,
+    repeat: int,
+    warmup: int = 0,
+    args: Optional[Sequence[str]] = None,
+    kwargs: Optional[Mapping[str, str]] = None,
+    result_name: Optional[str] = None,
+) -> None:
+    """Call a function repeatedly and store the statistics of its runtime in a variable.
+
+    Unless a variable name is given, the statistics are stored in the variable :code:`<func_name>_runtime`.
+    The arguments are loaded from the context once (see :py:func:`beehyve.utils.functions.prepare_function_call`),
+    so the function should not modify them. The statistics are stored as a dict of the fields of
+    :py:class:`beehyve.utils.benchmarking.RuntimeStats` in seconds.
+    If the user data :code:`benchmark_history` is set to a file name, e.g., using :code:`-D benchmark_history=<file>`,
+    the statistics are appended to this file (see :py:func:`beehyve.utils.benchmarking.append_benchmark_history`).
+
+    :param context: the current context
+    :param func_name: the name of the function to benchmark
+    :param module: the module where the function can be found,
+        i.e., you should be able to import <func_name> from <module>
+    :param repeat: the number of measured calls
+    :param warmup: the number of calls before the measured calls, defaults to 0
+    :param args: variable names of the variables which should be used as arguments to the function,
+        defaults to None (the variables named like the parameters of the function are used)
+    :param kwargs: a mapping of function kwarg to variable name which should be passed to the function, defaults to None
+    :param result_name: the name of the variable in which the statistics are stored,
+        defaults to None (:code:`<func_name>_runtime`)
+    """
+    func = prepare_function_call(context=context, func_name=func_name, module=module, args=args, kwargs=kwargs)
+    stats = benchmarking.compute_runtime_stats(benchmarking.benchmark(func, repeat=repeat, warmup=warmup))
+
+    add_var(context, result_name or f"{func_name}_runtime", stats._asdict())
+
+    userdata = context.config.userdata
+    if BENCHMARK_HISTORY_USERDATA in userdata:
+        record = {
+            "feature": context.feature.name,
+            "scenario": context.scenario.name,
+            "function": f"{module}.{func_name}",
+            "warmup": warmup,
+            **stats._asdict(),
+        }
+        benchmarking.append_benchmark_history(userdata[BENCHMARK_HISTORY_USERDATA], record)
+
+
+@then("the {statistic:RuntimeStatistic} runtime of {func_name:w} is below {limit:g} {unit:TimeUnit}")
+def step_runtime_below(context: Context, statistic: str, func_name: str, limit: float, unit: str) -> None:
+    """Check whether a statistic of the runtime of a benchmarked function is below a limit.
+
+    :param context: the current context
+    :param statistic: the statistic to check, one of :code:`min`, :code:`median`, :code:`mean`, :code:`p95`,
+        :code:`p99`, or :code:`max`
+    :param func_name: the name of the benchmarked function
+    :param limit: the exclusive upper limit of the statistic
+    :param unit: the unit of the limit, one of :code:`s`, :code:`ms`, :code:`µs`, or :code:`us`
+    """
+    _check_runtime_below(get_var(context, f"{func_name}_runtime"), statistic, func_name, limit, unit)
+
+
+@then("the {statistic:RuntimeStatistic} runtime stored in {name:w} is below {limit:g} {unit:TimeUnit}")
+def step_stored_runtime_below(context: Context, statistic: str, name: str, limit: float, unit: str) -> None:
+    """Check whether a statistic of the runtime stored in a variable by a benchmark is below a limit.
+
+    :param context: the current context
+    :param statistic: the statistic to check, one of :code:`min`, :code:`median`, :code:`mean`, :code:`p95`,
+        :code:`p99`, or :code:`max`
+    :param name: the name of the variable in which the statistics are stored
+    :param limit: the exclusive upper limit of the statistic
+    :param unit: the unit of the limit, one of :code:`s`, :code:`ms`, :code:`µs`, or :code:`us`
+    """
+    _check_runtime_below(get_var(context, name), statistic, name, limit, unit)
+
+
+@then("the peak {measure:MemoryMeasure} of {func_name:w} is below {limit:g} {unit:MemoryUnit}")
+def step_peak_memory_below(context: Context, measure: str, func_name: str, limit: float, unit: str) -> None:
+    """Check whether the peak memory used by a function call is below a limit.
+
+    The function needs to be called measuring its peak memory (see the steps in
+    :py:mod:`beehyve.steps.function_steps`).
+
+    :param context: the current context
+    :param measure: the measured memory, :code:`memory` for allocations traced by :py:mod:`tracemalloc`
+        or :code:`RSS` for the sampled resident set size of the process
+    :param func_name: the name of the called function
+    :param limit: the (exclusive) upper limit
+    :param unit: the unit of the limit, one of :code:`B`, :code:`KB`, :code:`MB`, :code:`GB`,
+        :code:`KiB`, :code:`MiB`, or :code:`GiB`
+    """
+    peak = _get_peak_memory(context, measure, func_name)
+    limit_bytes = memory.to_bytes(limit, unit)
+    assert peak < limit_bytes, (
+        f"peak {measure} of {func_name} is {peak / memory.MEMORY_UNITS[unit]:.3f} {unit}, "
+        f"which is not below {limit} {unit}"
+    )
+
+
+@then("the peak {measure:MemoryMeasure} of {func_name:w} is below {factor:g} times the size of its input dataframes")
+def step_peak_memory_below_input_size(context: Context, measure: str, func_name: str, factor: float) -> None:
+    """Check whether the peak memory used by a function call is below a multiple of the size of its input dataframes.
+
+    The size of the input dataframes and series is determined using :code:`memory_usage(deep=True)`
+    (see :py:func:`beehyve.utils.memory.get_input_size`).
+
+    :param context: the current context
+    :param measure: the measured memory, :code:`memory` for allocations traced by :py:mod:`tracemalloc`
+        or :code:`RSS` for the sampled resident set size of the process
+    :param func_name: the name of the called function
+    :param factor: the (exclusive) upper limit as a multiple of the size of the input dataframes
+    """
+    peak = _get_peak_memory(context, measure, func_name)
+    input_size = get_var(context, f"{func_name}_memory")["input_size"]
+    assert peak < factor * input_size, (
+        f"peak {measure} of {func_name} is {peak / max(input_size, 1):.2f} times the size of its input dataframes "
+        f"({peak} B and {input_size} B), which is not below {factor}"
+    )
+
+
+@when("the scaling of {module:Module}.{func_name:w} is measured on {name:w} resampled up to {max_size:g} rows")
+def step_measure_scaling_resampled(context: Context, module: str, func_name: str, name: str, max_size: float) -> None:
+    """Measure the runtime of a function on inputs of increasing size, sampled with replacement from a variable.
+
+    The sizes are halved starting from the maximum size (see :py:func:`beehyve.utils.scaling.get_sizes`),
+    the inputs are sampled using a fixed seed (see :py:func:`beehyve.utils.scaling.resample`).
+    The measurements are stored in the variable :code:`<func_name>_scaling` as a list of dicts with the keys
+    :code:`size` and :code:`runtime` (in seconds).
+
+    :param context: the current context
+    :param module: the module where the function can be found
+    :param func_name: the name of the function, called with the input as its only argument
+    :param name: the name of the variable to sample from, a dataframe, series, or numpy array
+    :param max_size: the number of rows of the largest input
+    """
+    value = get_var(context, name)
+    _measure_scaling(context, module, func_name, lambda size: scaling.resample(value, size), max_size)
+
+
+@when(
+    "the scaling of {module:Module}.{func_name:w} is measured on inputs of "
+    "{input_module:Module}.{input_func_name:w} up to {max_size:g} rows"
+)
+def step_measure_scaling_generated(
+    context: Context, module: str, func_name: str, input_module: str, input_func_name: str, max_size: float
+) -> None:
+    """Measure the runtime of a function on generated inputs of increasing size.
+
+    As :py:func:`step_measure_scaling_resampled`, but the inputs are created by calling a function with the size.
+
+    :param context: the current context
+    :param module: the module where the function can be found
+    :param func_name: the name of the function, called with the input as its only argument
+    :param input_module: the module where the function creating the inputs can be found
+    :param input_func_name: the name of the function creating the inputs, called with the size as its only argument
+    :param max_size: the number of rows of the largest input
+    """
+    make_input = get_from_module(input_module, input_func_name)
+    _measure_scaling(context, module, func_name, make_input, max_size)
+
+
+@then("{func_name:w} scales at most {complexity:Complexity}")
+def step_scales_at_most(context: Context, func_name: str, complexity: str) -> None:
+    """Check that the runtime of a function grows at most as fast as a given complexity, e.g., :code:`O(n log n)`.
+
+    The scaling of the function needs to be measured before, for details see
+    :py:func:`beehyve.utils.scaling.check_complexity`.
+
+    :param context: the current context
+    :param func_name: the name of the measured function
+    :param complexity: the complexity, one of :code:`O(1)`, :code:`O(log n)`, :code:`O(n)`, :code:`O(n log n)`,
+        :code:`O(n^2)`, or :code:`O(n^3)`
+    """
+    measurements = [scaling.ScalingMeasurement(**record) for record in get_var(context, f"{func_name}_scaling")]
+    scaling.check_complexity(measurements, complexity)
+
+
+def _measure_scaling(
+    context: Context, module: str, func_name: str, make_input: Callable[[int], Any], max_size: float
+) -> None:
+    func = get_from_module(module, func_name)
+    measurements = scaling.measure_scaling(func, make_input, scaling.get_sizes(int(max_size)))
+    add_var(context, f"{func_name}_scaling", [measurement._asdict() for measurement in measurements])
+
+
+def _get_peak_memory(context: Context, measure: str, func_name: str) -> int:
+    usage = get_var(context, f"{func_name}_memory")
+    if measure == "memory":
+        return usage["peak"]
+    if usage["rss_peak"] is None:
+        raise ValueError(
+            f"the RSS of {func_name} was not sampled, set the user data rss_sampling_interval "
+            "to an interval in seconds (only available on Linux)"
+        )
+    return usage["rss_peak"]
+
+
+def _check_runtime_below(stats: Mapping[str, float], statistic: str, name: str, limit: float, unit: str) -> None:
+    runtime = stats[statistic]
+    limit_seconds = benchmarking.to_seconds(limit, unit)
+    assert runtime < limit_seconds, (
+        f"{statistic} runtime of {name} is {runtime / benchmarking.TIME_UNITS[unit]:.3f} {unit}, "
+        f"which is not below {limit} {unit}"
+    )
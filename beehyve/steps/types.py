@@ -91,6 +91,54 @@ def parse_csv_file_path(string: str) -> str:
     return string
 
 
+@parse.with_pattern(r"(/?\w+?/)*\w+?\.(parquet|PARQUET|pq)")
+def parse_parquet_file_path(string: str) -> str:
+    """Parse a file path of a Parquet file."""
+    return string
+
+
+@parse.with_pattern(r"(/?\w+?/)*\w+?\.(feather|FEATHER|arrow|ARROW|ipc)")
+def parse_feather_file_path(string: str) -> str:
+    """Parse a file path of a Feather / Arrow IPC file."""
+    return string
+
+
+@parse.with_pattern(r"(/?\w+?/)*\w+?\.(csv|CSV|parquet|PARQUET|pq)")
+def parse_chunked_file_path(string: str) -> str:
+    """Parse a file path of a CSV or Parquet file, which can be read in chunks."""
+    return string
+
+
+@parse.with_pattern(r"(min|median|mean|p95|p99|max)")
+def parse_runtime_statistic(string: str) -> str:
+    """Parse the name of a statistic of runtimes, see :py:class:`beehyve.utils.benchmarking.RuntimeStats`."""
+    return string
+
+
+@parse.with_pattern(r"(s|ms|µs|us)")
+def parse_time_unit(string: str) -> str:
+    """Parse a unit of time, i.e., seconds, milliseconds, or microseconds."""
+    return string
+
+
+@parse.with_pattern(r"(memory|RSS)")
+def parse_memory_measure(string: str) -> str:
+    """Parse the kind of measured memory, i.e., traced allocations (memory) or the resident set size (RSS)."""
+    return string
+
+
+@parse.with_pattern(r"(B|KB|MB|GB|KiB|MiB|GiB)")
+def parse_memory_unit(string: str) -> str:
+    """Parse a unit of memory, e.g., bytes, megabytes, or mebibytes."""
+    return string
+
+
+@parse.with_pattern(r"O\((1|log n|n|n log n|n\^2|n\^3)\)")
+def parse_complexity(string: str) -> str:
+    """Parse a complexity in big O notation, see :py:data:`beehyve.utils.scaling.COMPLEXITIES`."""
+    return string
+
+
 def create_limited_kwarg_parser(
     allowed_kwargs: Sequence[str],
 ) -> Callable[[str], Mapping[str, Any]]:
@@ -128,3 +176,22 @@ def create_limited_kwarg_parser(
         return mapping
 
     return _parse_limited_kwargs
+
+
+_FUNCTION_CALL_PARSER = parse.compile(
+    "{module:Module}.{func_name:w}({args:Arguments}{kwargs:KWArguments})",
+    extra_types={"Module": parse_module, "Arguments": parse_args, "KWArguments": parse_kwargs},
+)
+
+
+def parse_function_call(string: str) -> Tuple[str, str, Sequence[str], Mapping[str, str]]:
+    """Parse a function call using variable names as arguments, e.g., :code:`module.func(var_1, b=var_2)`.
+
+    :param string: the function call
+    :raises ValueError: if the given string is not a function call
+    :return: the module, the function name, the positional arguments, and the keyword arguments
+    """
+    result = _FUNCTION_CALL_PARSER.parse(string.strip())
+    if result is None:
+        raise ValueError(f"the given value {string} cannot be interpreted as function call")
+    return result["module"], result["func_name"], result["args"], result["kwargs"]
@@ -0,0 +1,142 @@
+"""Collection of functions to measure the runtime of functions and to keep a history of the measurements.
+
+The history is a JSON Lines file, i.e., every line is the JSON record of a single benchmark,
+so the records of parallel runs can be appended to the same file and runtimes can be compared across commits
+(see :py:func:`read_benchmark_history`).
+"""
+
+import json
+import math
+import statistics
+import subprocess  # nosec: only used to get the current commit
+import threading
+import time
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence
+
+TIME_UNITS = {"s": 1.0, "ms": 1e-3, "µs": 1e-6, "us": 1e-6}
+
+_UNKNOWN = "unknown"
+_commit: Optional[str] = None
+_lock = threading.Lock()
+
+
+class RuntimeStats(NamedTuple):
+    """Statistics of the runtimes of a benchmarked function in seconds."""
+
+    repeat: int
+    min: float
+    median: float
+    mean: float
+    p95: float
+    p99: float
+    max: float
+
+
+def benchmark(func: Callable[[], Any], repeat: int, warmup: int = 0) -> List[float]:
+    """Call a function repeatedly and measure the wall time of every call.
+
+    :param func: the function to call, without arguments
+    :param repeat: the number of measured calls
+    :param warmup: the number of calls before the measured calls, e.g., to fill caches, defaults to 0
+    :raises ValueError: if the number of measured calls is not positive
+    :return: the runtimes of the measured calls in seconds
+    """
+    if repeat < 1:
+        raise ValueError(f"a function needs to be benchmarked at least once, got {repeat} repetitions")
+
+    for _ in range(warmup):
+        func()
+
+    runtimes = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        runtimes.append(time.perf_counter() - start)
+    return runtimes
+
+
+def percentile(values: Sequence[float], q: float) -> float:
+    """Compute a percentile of values, interpolating linearly between the closest ranks (like numpy's default).
+
+    :param values: the values, at least one
+    :param q: the percentile between 0 and 100
+    :return: the percentile
+    """
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * q / 100
+    lower, upper = math.floor(rank), math.ceil(rank)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+def compute_runtime_stats(runtimes: Sequence[float]) -> RuntimeStats:
+    """Compute the statistics of the runtimes of a benchmark.
+
+    :param runtimes: the runtimes in seconds, at least one
+    :return: the statistics
+    """
+    return RuntimeStats(
+        repeat=len(runtimes),
+        min=min(runtimes),
+        median=statistics.median(runtimes),
+        mean=statistics.mean(runtimes),
+        p95=percentile(runtimes, 95),
+        p99=percentile(runtimes, 99),
+        max=max(runtimes),
+    )
+
+
+def to_seconds(value: float, unit: str) -> float:
+    """Convert a duration to seconds.
+
+    :param value: the duration
+    :param unit: the unit of the duration, one of :code:`s`, :code:`ms`, :code:`µs`, or :code:`us`
+    :raises ValueError: if the unit is unknown
+    :return: the duration in seconds
+    """
+    if unit not in TIME_UNITS:
+        raise ValueError(f"unknown time unit {unit}, use one of {', '.join(TIME_UNITS)}")
+    return value * TIME_UNITS[unit]
+
+
+def get_commit() -> Optional[str]:
+    """Get the commit of the git repository in the working directory, which is recorded with every benchmark.
+
+    :return: the hash of the current commit, or None if it cannot be determined
+    """
+    global _commit
+    with _lock:
+        if _commit is None:
+            try:
+                result = subprocess.run(  # nosec: fixed command without user input
+                    ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True
+                )
+                _commit = result.stdout.strip()
+            except (OSError, subprocess.CalledProcessError):
+                _commit = _UNKNOWN
+        return None if _commit == _UNKNOWN else _commit
+
+
+def append_benchmark_history(file_name: str, record: Dict[str, Any]) -> None:
+    """Append the record of a benchmark to a history file.
+
+    The record is extended by the current time and commit (see :py:func:`get_commit`).
+
+    :param file_name: the path of the history file, which is created if it does not exist
+    :param record: the record of the benchmark, e.g., the name of the function and its runtime statistics
+    """
+    line = json.dumps({"timestamp": time.time(), "commit": get_commit(), **record})
+    with _lock, open(file_name, "a") as f:
+        f.write(line + "\n")
+
+
+def read_benchmark_history(file_name: str, function: Optional[str] = None) -> List[Dict[str, Any]]:
+    """Read the records of a history file.
+
+    :param file_name: the path of the history file
+    :param function: the name of the function (:code:`<module>.<function>`) to read the records for,
+        defaults to None (all records)
+    :return: the records in the order they were appended
+    """
+    with open(file_name) as f:
+        records = [json.loads(line) for line in f if line.strip()]
+    return [record for record in records if function is None or record.get("function") == function]
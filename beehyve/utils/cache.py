@@ -0,0 +1,142 @@
+"""Collection of caching utilities used to avoid repeated work across steps and scenarios."""
+
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, NamedTuple
+
+
+class CacheStats(NamedTuple):
+    """Statistics of a :py:class:`LRUCache`."""
+
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    size: int
+    max_size: int
+
+
+def _unit_size(_value: Any) -> int:
+    return 1
+
+
+class LRUCache:
+    """A thread-safe least-recently-used cache with a limit on the total size of its values.
+
+    By default every value has a size of 1, i.e., :code:`max_size` limits the number of entries.
+    Pass a :code:`size_of` function to limit, e.g., the memory used by the cached values instead.
+    Values larger than :code:`max_size` are never stored.
+    """
+
+    def __init__(self, max_size: int, size_of: Callable[[Any], int] = _unit_size) -> None:
+        """Initialize an empty cache.
+
+        :param max_size: the maximum total size of all cached values, a size of 0 disables the cache
+        :param size_of: a function determining the size of a value, defaults to 1 for each value
+        """
+        self._max_size = max_size
+        self._size_of = size_of
+        self._entries: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._sizes: "OrderedDict[Hashable, int]" = OrderedDict()
+        self._size = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._lock = threading.RLock()
+
+    @property
+    def enabled(self) -> bool:
+        """Whether the cache is able to store any values."""
+        return self._max_size > 0
+
+    def __contains__(self, key: Hashable) -> bool:
+        """Check whether a key is cached without counting a hit or a miss."""
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self) -> int:
+        """Get the number of cached entries."""
+        with self._lock:
+            return len(self._entries)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Get a cached value and mark it as most recently used.
+
+        :param key: the key of the value
+        :param default: the value to return if the key is not cached, defaults to None
+        :return: the cached value or the default
+        """
+        with self._lock:
+            if key not in self._entries:
+                self._misses += 1
+                return default
+
+            self._hits += 1
+            self._entries.move_to_end(key)
+            self._sizes.move_to_end(key)
+            return self._entries[key]
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Store a value, evicting the least recently used values if the cache is full.
+
+        :param key: the key of the value
+        :param value: the value to store
+        """
+        size = self._size_of(value)
+
+        with self._lock:
+            self._remove(key)
+
+            if size > self._max_size:
+                return
+
+            self._entries[key] = value
+            self._sizes[key] = size
+            self._size += size
+
+            self._evict(self._max_size)
+
+    def resize(self, max_size: int) -> None:
+        """Change the maximum total size, evicting values if necessary.
+
+        :param max_size: the new maximum total size, a size of 0 disables the cache
+        """
+        with self._lock:
+            self._max_size = max_size
+            self._evict(max_size)
+
+    def clear(self) -> None:
+        """Remove all cached values and reset the statistics."""
+        with self._lock:
+            self._entries.clear()
+            self._sizes.clear()
+            self._size = 0
+            self._hits = 0
+            self._misses = 0
+            self._evictions = 0
+
+    def stats(self) -> CacheStats:
+        """Get the current statistics of the cache.
+
+        :return: hits, misses, evictions, the number of entries, the total size, and the maximum size
+        """
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                entries=len(self._entries),
+                size=self._size,
+                max_size=self._max_size,
+            )
+
+    def _remove(self, key: Hashable) -> None:
+        if key in self._entries:
+            del self._entries[key]
+            self._size -= self._sizes.pop(key)
+
+    def _evict(self, max_size: int) -> None:
+        while self._size > max_size and self._entries:
+            key, _ = self._entries.popitem(last=False)
+            self._size -= self._sizes.pop(key)
+            self._evictions += 1
@@ -0,0 +1,33 @@
+"""Collection of functions to count events inside of beehyve, e.g., how often a shortcut was taken."""
+
+import threading
+from collections import Counter
+from typing import Dict
+
+_counters: "Counter[str]" = Counter()
+_lock = threading.Lock()
+
+
+def increment_counter(name: str, value: int = 1) -> None:
+    """Increment a process-wide counter.
+
+    :param name: the name of the counter, e.g., :code:`"<function>.<event>"`
+    :param value: the value to add to the counter, defaults to 1
+    """
+    with _lock:
+        _counters[name] += value
+
+
+def get_counters() -> Dict[str, int]:
+    """Get the current values of all counters.
+
+    :return: a mapping of counter names to their values
+    """
+    with _lock:
+        return dict(_counters)
+
+
+def reset_counters() -> None:
+    """Reset all counters."""
+    with _lock:
+        _counters.clear()
@@ -0,0 +1,143 @@
+"""Collection of functions to run coroutines and async generators returned by functions called in steps.
+
+All awaitables are run on a single event loop, which is created on first use and reused for the whole run,
+so objects bound to the loop (e.g., clients or connection pools stored in variables) stay usable across steps.
+The loop is closed when the process exits or by calling :py:func:`close_event_loop`.
+"""
+
+import asyncio
+import atexit
+import inspect
+import threading
+from typing import (
+    Any,
+    AsyncGenerator,
+    Awaitable,
+    Generator,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+)
+
+_loop: Optional[asyncio.AbstractEventLoop] = None
+_lock = threading.Lock()
+
+
+def get_event_loop() -> asyncio.AbstractEventLoop:
+    """Get the event loop used to run awaitables, creating it on first use.
+
+    :return: the event loop of the current run
+    """
+    global _loop
+    with _lock:
+        if _loop is None or _loop.is_closed():
+            _loop = asyncio.new_event_loop()
+            atexit.register(close_event_loop)
+        return _loop
+
+
+def close_event_loop() -> None:
+    """Cancel all pending tasks, finalize all async generators, and close the event loop."""
+    global _loop
+    with _lock:
+        loop, _loop = _loop, None
+
+    if loop is None or loop.is_closed():
+        return
+
+    tasks = asyncio.all_tasks(loop)
+    for task in tasks:
+        task.cancel()
+    loop.run_until_complete(_gather(tasks, return_exceptions=True))
+    loop.run_until_complete(loop.shutdown_asyncgens())
+    loop.close()
+
+
+def run_awaitable(awaitable: Awaitable, timeout: Optional[float] = None) -> Any:
+    """Run an awaitable, e.g., a coroutine, on the event loop until it completes.
+
+    :param awaitable: the awaitable to run
+    :param timeout: the maximum time to wait in seconds, defaults to None (wait until completed)
+    :raises AssertionError: if the awaitable did not complete within the timeout, it is cancelled in this case
+    :return: the result of the awaitable
+    """
+    try:
+        return get_event_loop().run_until_complete(asyncio.wait_for(awaitable, timeout))
+    except asyncio.TimeoutError as e:
+        raise AssertionError(f"{_get_name(awaitable)} did not complete within {timeout} seconds") from e
+
+
+def run_concurrently(values: Sequence[Any], timeout: Optional[float] = None) -> List[Any]:
+    """Run several awaitables concurrently on the event loop until all of them complete.
+
+    :param values: the awaitables to run, all other values are returned as they are
+    :param timeout: the maximum time to wait for all awaitables in seconds, defaults to None (wait until completed)
+    :raises AssertionError: if the awaitables did not complete within the timeout, all of them are cancelled then
+    :return: the results in the order of the given values
+    """
+
+    async def as_awaitable(value: Any) -> Any:
+        return await value if inspect.isawaitable(value) else value
+
+    try:
+        return get_event_loop().run_until_complete(
+            asyncio.wait_for(_gather([as_awaitable(value) for value in values]), timeout)
+        )
+    except asyncio.TimeoutError as e:
+        pending = [_get_name(value) for value in values if inspect.isawaitable(value)]
+        raise AssertionError(f"{', '.join(pending)} did not complete within {timeout} seconds") from e
+
+
+def iterate_async_generator(
+    agen: AsyncGenerator[Any, Any], timeout: Optional[float] = None
+) -> Generator[Any, None, None]:
+    """Iterate an async generator synchronously, running the event loop to get each item.
+
+    Items are only produced once they are requested, i.e., the async generator is consumed lazily.
+
+    :param agen: the async generator
+    :param timeout: the maximum time to wait for each item in seconds, defaults to None (wait until produced)
+    :raises AssertionError: if an item was not produced within the timeout
+    :yield: the items of the async generator
+    """
+    try:
+        while True:
+            try:
+                item = run_awaitable(agen.__anext__(), timeout)
+            except StopAsyncIteration:
+                return
+            yield item
+    finally:
+        # generators closed while the loop is running are finalized by the loop itself
+        loop = _loop
+        if loop is not None and not loop.is_closed() and not loop.is_running():
+            loop.run_until_complete(agen.aclose())
+
+
+def resolve_async_result(result: Any, timeout: Optional[float] = None) -> Any:
+    """Resolve the result of a function call if it is asynchronous.
+
+    Awaitables (e.g., the coroutines returned by :code:`async def` functions) are run until they complete
+    (see :py:func:`run_awaitable`), async generators are converted to generators
+    (see :py:func:`iterate_async_generator`), all other results are returned as they are.
+
+    :param result: the result of a function call
+    :param timeout: the maximum time to wait for the result (or each item of an async generator) in seconds,
+        defaults to None (wait until completed)
+    :return: the resolved result
+    """
+    if inspect.isawaitable(result):
+        return run_awaitable(result, timeout)
+    if inspect.isasyncgen(result):
+        return iterate_async_generator(result, timeout)
+    return result
+
+
+async def _gather(awaitables: Iterable[Awaitable], return_exceptions: bool = False) -> List[Any]:
+    # gathered within a coroutine, so the awaitables are bound to the running loop
+    return await asyncio.gather(*awaitables, return_exceptions=return_exceptions)
+
+
+def _get_name(awaitable: Any) -> str:
+    return getattr(awaitable, "__qualname__", repr(awaitable))
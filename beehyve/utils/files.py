@@ -0,0 +1,340 @@
+"""Collection of functions to read files into pandas objects and to write them."""
+
+import importlib
+import os
+from types import ModuleType
+from typing import (
+    Any,
+    Hashable,
+    Iterable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+
+import pandas as pd
+
+from beehyve.utils.cache import CacheStats, LRUCache
+from beehyve.utils.pandas import compare_dataframes, isolated_copy
+
+DEFAULT_CSV_CACHE_MAX_BYTES = 2 * 1024**3
+DEFAULT_CSV_CHUNK_SIZE = 100_000
+DEFAULT_PARQUET_CHUNK_SIZE = 100_000
+
+_MISSING = object()
+
+Filters = Union[List[Tuple[str, str, Any]], List[List[Tuple[str, str, Any]]]]
+
+
+def _dataframe_size(df: pd.DataFrame) -> int:
+    return int(df.memory_usage(index=True, deep=True).sum())
+
+
+_csv_cache = LRUCache(max_size=0, size_of=_dataframe_size)
+
+
+def enable_csv_cache(max_bytes: int = DEFAULT_CSV_CACHE_MAX_BYTES) -> None:
+    """Enable the process-wide cache for CSV files loaded by :py:func:`read_csv`.
+
+    Cached dataframes are evicted in least-recently-used order once their total memory usage
+    (determined by :py:meth:`pd.DataFrame.memory_usage`) exceeds the given limit.
+
+    :param max_bytes: the maximum memory used by all cached dataframes, defaults to 2 GiB
+    """
+    _csv_cache.resize(max_bytes)
+
+
+def disable_csv_cache() -> None:
+    """Disable the CSV cache and remove all cached dataframes."""
+    _csv_cache.resize(0)
+    _csv_cache.clear()
+
+
+def get_csv_cache_stats() -> CacheStats:
+    """Get the hit and miss counters as well as the memory usage of the CSV cache.
+
+    :return: the current statistics of the CSV cache
+    """
+    return _csv_cache.stats()
+
+
+def read_csv(file_name: str, **kwargs: Any) -> pd.DataFrame:
+    """Load a CSV file into a dataframe.
+
+    If the CSV cache is enabled (see :py:func:`enable_csv_cache`) files are parsed only once.
+    The cache is keyed on the resolved file path, the modification time and size of the file,
+    and the given keyword arguments, so changing the file invalidates the cached dataframe.
+    Every call returns an isolated copy of the cached dataframe (see :py:func:`isolated_copy`).
+
+    :param file_name: the path of the CSV file
+    :param kwargs: keyword arguments passed to :py:func:`pd.read_csv`
+    :return: the loaded dataframe
+    """
+    if not _csv_cache.enabled:
+        return pd.read_csv(file_name, **kwargs)
+
+    key = _get_csv_cache_key(file_name, kwargs)
+
+    df = _csv_cache.get(key, _MISSING)
+    if df is _MISSING:
+        df = pd.read_csv(file_name, **kwargs)
+        _csv_cache.put(key, df)
+
+    return isolated_copy(df)
+
+
+def _get_csv_cache_key(file_name: str, kwargs: Mapping[str, Any]) -> Hashable:
+    path = os.path.realpath(file_name)
+    stat = os.stat(path)
+    return path, stat.st_mtime_ns, stat.st_size, repr(sorted(kwargs.items()))
+
+
+def compare_dataframe_to_csv(
+    df: pd.DataFrame,
+    file_name: str,
+    *,
+    chunksize: int = DEFAULT_CSV_CHUNK_SIZE,
+    read_kwargs: Optional[Mapping[str, Any]] = None,
+    **compare_kwargs: Any,
+) -> None:
+    """Compare a dataframe to a CSV file without loading the whole file into memory.
+
+    The file is read in chunks of rows (using the :code:`chunksize` of :py:func:`pd.read_csv`)
+    and each chunk is compared to the corresponding rows of the dataframe using :py:func:`compare_dataframes`.
+    Each chunk is cast to the dtypes of the dataframe where this is lossless, so that the dtypes of all chunks
+    do not depend on the values in the chunk (e.g., integers in a column of floats).
+    The comparison stops at the first chunk that does not match, i.e., the memory used
+    is proportional to the chunk size rather than the size of the file (see :py:func:`read_csv_chunks`).
+
+    :param df: the actual dataframe
+    :param file_name: the path of the CSV file containing the expected dataframe
+    :param chunksize: the number of rows to read and compare at once, defaults to 100,000
+    :param read_kwargs: keyword arguments passed to :py:func:`pd.read_csv`, defaults to None
+    :param compare_kwargs: keyword arguments passed to :py:func:`compare_dataframes`,
+        ignoring the row order is not supported
+    :raises ValueError: if the row order should be ignored
+    """
+    if compare_kwargs.get("ignore_row_order"):
+        raise ValueError("ignoring the row order is not supported when comparing to a CSV file in chunks")
+
+    n_rows = 0
+    for chunk in read_csv_chunks(file_name, chunksize=chunksize, read_kwargs=read_kwargs, dtypes=df.dtypes):
+        start, stop = n_rows, n_rows + len(chunk)
+        if stop > len(df):
+            raise AssertionError(f"CSV file {file_name} has more rows than the dataframe ({len(df)})")
+
+        try:
+            compare_dataframes(df.iloc[start:stop], chunk, **compare_kwargs)
+        except AssertionError as e:
+            raise AssertionError(f"Rows {start} to {stop - 1} do not match CSV file {file_name}\n\n{e}") from None
+
+        n_rows = stop
+
+    if n_rows != len(df):
+        raise AssertionError(f"Number of rows do not match. Got {len(df)} and {n_rows} in CSV file {file_name}")
+
+
+def read_csv_chunks(
+    file_name: str,
+    *,
+    chunksize: int = DEFAULT_CSV_CHUNK_SIZE,
+    read_kwargs: Optional[Mapping[str, Any]] = None,
+    dtypes: Optional[Mapping[Hashable, Any]] = None,
+) -> Iterator[pd.DataFrame]:
+    """Read a CSV file in chunks of rows without loading the whole file into memory.
+
+    Unless a :code:`dtype` is passed in :code:`read_kwargs`, the columns of every chunk are cast to the given
+    dtypes (or the dtypes of the first chunk) where this is lossless, e.g., integers are cast to floats but
+    floats with decimals or missing values are not cast to integers. Text columns are always read as text.
+    The CSV cache is not used.
+
+    :param file_name: the path of the CSV file
+    :param chunksize: the number of rows of every chunk (except for the last one), defaults to 100,000
+    :param read_kwargs: keyword arguments passed to :py:func:`pd.read_csv`, defaults to None
+    :param dtypes: the expected dtypes of the columns, e.g., of a dataframe the chunks are compared to,
+        defaults to None (the dtypes of the first chunk)
+    :yield: the chunks of the file, whose index continues across chunks
+    """
+    read_kwargs = dict(read_kwargs) if read_kwargs else dict()
+    if "dtype" in read_kwargs:
+        with pd.read_csv(file_name, chunksize=chunksize, **read_kwargs) as reader:
+            yield from reader
+        return
+
+    if dtypes is None:
+        dtypes = pd.read_csv(file_name, nrows=chunksize, **read_kwargs).dtypes
+    dtypes = dict(dtypes)
+    read_kwargs["dtype"] = {col: str for col, dtype in dtypes.items() if pd.api.types.is_string_dtype(dtype)}
+
+    with pd.read_csv(file_name, chunksize=chunksize, **read_kwargs) as reader:
+        for chunk in reader:
+            yield _cast_lossless(chunk, dtypes)
+
+
+def _cast_lossless(df: pd.DataFrame, dtypes: Mapping[Hashable, Any]) -> pd.DataFrame:
+    for col, dtype in dtypes.items():
+        if col not in df.columns or df[col].dtype == dtype:
+            continue
+        try:
+            casted = df[col].astype(dtype)
+            lossless = casted.astype(df[col].dtype).equals(df[col])
+        except (TypeError, ValueError):
+            continue
+        if lossless:
+            df[col] = casted
+    return df
+
+
+def read_parquet(
+    file_name: str,
+    *,
+    columns: Optional[Sequence[str]] = None,
+    filters: Optional[Filters] = None,
+) -> pd.DataFrame:
+    """Load a Parquet file into a dataframe.
+
+    The column selection and row filters are pushed down to :py:func:`pyarrow.parquet.read_table`,
+    i.e., only the selected columns are read and row groups not matching the filters are skipped.
+    The file is memory-mapped while reading.
+
+    :param file_name: the path of the Parquet file
+    :param columns: the names of the columns to load, defaults to None (all columns)
+    :param filters: row filters in disjunctive normal form, e.g., :code:`[("col", ">", 0)]`,
+        see :py:func:`pyarrow.parquet.filters_to_expression`, defaults to None (all rows)
+    :return: the loaded dataframe
+    """
+    parquet = import_pyarrow("pyarrow.parquet")
+
+    table = parquet.read_table(
+        file_name,
+        columns=list(columns) if columns is not None else None,
+        filters=filters,
+        memory_map=True,
+    )
+
+    return table.to_pandas(split_blocks=True)
+
+
+def read_parquet_chunks(
+    file_name: str,
+    *,
+    chunksize: int = DEFAULT_PARQUET_CHUNK_SIZE,
+    columns: Optional[Sequence[str]] = None,
+) -> Iterator[pd.DataFrame]:
+    """Read a Parquet file in chunks of rows without loading the whole file into memory.
+
+    Uses :py:meth:`pyarrow.parquet.ParquetFile.iter_batches`, i.e., only the selected columns are read.
+    Unless an index is stored in the file, the index continues across chunks like for :py:func:`read_csv_chunks`.
+
+    :param file_name: the path of the Parquet file
+    :param chunksize: the maximum number of rows of every chunk, defaults to 100,000
+    :param columns: the names of the columns to load, defaults to None (all columns)
+    :yield: the chunks of the file
+    """
+    parquet = import_pyarrow("pyarrow.parquet")
+
+    n_rows = 0
+    with parquet.ParquetFile(file_name, memory_map=True) as parquet_file:
+        batches = parquet_file.iter_batches(
+            batch_size=chunksize, columns=list(columns) if columns is not None else None, use_pandas_metadata=True
+        )
+        for batch in batches:
+            chunk = batch.to_pandas(split_blocks=True)
+            if isinstance(chunk.index, pd.RangeIndex):
+                chunk.index = pd.RangeIndex(n_rows, n_rows + len(chunk))
+            n_rows += len(chunk)
+            yield chunk
+
+
+def write_parquet_chunks(chunks: Iterable[pd.DataFrame], file_name: str) -> int:
+    """Write chunks of rows to a single Parquet file one after another, without concatenating them.
+
+    Every chunk is written as a row group using the schema of the first chunk. The index is not written.
+    No file is written if there are no chunks.
+
+    :param chunks: the chunks, dataframes with the same columns and dtypes
+    :param file_name: the path of the Parquet file, which is overwritten if it exists
+    :return: the number of written rows
+    """
+    pa = import_pyarrow("pyarrow")
+    parquet = import_pyarrow("pyarrow.parquet")
+
+    writer = None
+    n_rows = 0
+    try:
+        for chunk in chunks:
+            table = pa.Table.from_pandas(chunk, schema=writer.schema if writer else None, preserve_index=False)
+            if writer is None:
+                writer = parquet.ParquetWriter(file_name, table.schema)
+            writer.write_table(table)
+            n_rows += len(chunk)
+    finally:
+        if writer is not None:
+            writer.close()
+    return n_rows
+
+
+def read_feather(
+    file_name: str,
+    *,
+    columns: Optional[Sequence[str]] = None,
+    filters: Optional[Filters] = None,
+) -> pd.DataFrame:
+    """Load a Feather / Arrow IPC file into a dataframe.
+
+    The file is memory-mapped, i.e., only the selected columns and the columns used by the filters are accessed
+    and the data of the file is not copied in full before filtering.
+
+    :param file_name: the path of the Feather / Arrow IPC file
+    :param columns: the names of the columns to load, defaults to None (all columns)
+    :param filters: row filters in disjunctive normal form, e.g., :code:`[("col", ">", 0)]`,
+        see :py:func:`pyarrow.parquet.filters_to_expression`, defaults to None (all rows)
+    :return: the loaded dataframe
+    """
+    feather = import_pyarrow("pyarrow.feather")
+
+    read_columns = None
+    if columns is not None:
+        # the columns used by the filters are needed until the rows are filtered
+        read_columns = list(columns)
+        read_columns.extend([col for col in _get_filter_columns(filters) if col not in read_columns])
+
+    table = feather.read_table(file_name, columns=read_columns, memory_map=True)
+
+    if filters:
+        parquet = import_pyarrow("pyarrow.parquet")
+        table = table.filter(parquet.filters_to_expression(filters))
+
+    if columns is not None:
+        table = table.select(list(columns))
+
+    return table.to_pandas(split_blocks=True)
+
+
+def _get_filter_columns(filters: Optional[Filters]) -> List[str]:
+    if not filters:
+        return []
+    # filters are either a conjunction of predicates or a disjunction of conjunctions,
+    # predicates are tuples or lists themselves, so only nested predicates indicate a disjunction
+    conjunctions = filters if isinstance(filters[0][0], (tuple, list)) else [filters]
+    return [predicate[0] for conjunction in conjunctions for predicate in conjunction]
+
+
+def import_pyarrow(module_name: str) -> ModuleType:
+    """Import pyarrow or one of its modules, which is an optional dependency.
+
+    :param module_name: the name of the module, e.g., :code:`pyarrow.parquet`
+    :raises ImportError: if pyarrow is not installed, explaining how to install it
+    :return: the imported module
+    """
+    try:
+        return importlib.import_module(module_name)
+    except ImportError as e:
+        raise ImportError(
+            "pyarrow is required for Parquet and Feather files and for spilling variables, "
+            "install it using 'pip install beehyve[arrow]'"
+        ) from e
@@ -1,12 +1,182 @@
 """Collection of functions used to call arbitrary functions in step definitions."""
 
+import functools
+import hashlib
+import importlib
 import inspect
-from collections.abc import Iterable
-from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple, Union
+import pickle  # nosec: only used to fingerprint values, nothing is unpickled
+import sys
+import time
+from collections.abc import Iterable, Iterator
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    List,
+    Mapping,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
 from behave.runner import Context
 
-from beehyve.utils.variables import add_var, get_from_module, get_var, has_var
+from beehyve.utils.cache import CacheStats, LRUCache
+from beehyve.utils.lazy import lazy_import
+from beehyve.utils.variables import add_var, get_var, has_var
+
+if TYPE_CHECKING:
+    from beehyve.utils.memory import MemoryUsage
+
+# only used for the function cache, so they are imported once the first value is fingerprinted
+np = lazy_import("numpy")
+pd = lazy_import("pandas")
+pandas_utils = lazy_import("beehyve.utils.pandas")
+# only used for coroutines and async generators returned by called functions
+event_loop = lazy_import("beehyve.utils.event_loop")
+memory = lazy_import("beehyve.utils.memory")
+# only used for functions applied to the chunks of files
+files = lazy_import("beehyve.utils.files")
+partitions = lazy_import("beehyve.utils.partitions")
+
+DEFAULT_FUNCTION_CACHE_MAX_ENTRIES = 128
+DEFAULT_CHUNK_SIZE = 100_000
+MAX_SIGNATURE_HANDLERS = 1024
+
+NO_FUNCTION_CACHE_TAG = "no_function_cache"
+DETECT_MUTATIONS_TAG = "detect_mutations"
+
+_MISSING = object()
+
+_IMMUTABLE_TYPES = (str, bytes, int, float, complex, bool)
+
+_function_cache = LRUCache(max_size=0)
+
+_signature_handlers = LRUCache(max_size=MAX_SIGNATURE_HANDLERS)
+
+
+def enable_function_cache(max_entries: int = DEFAULT_FUNCTION_CACHE_MAX_ENTRIES) -> None:
+    """Enable the process-wide memoization of functions called by steps executing functions.
+
+    Applies to :py:func:`execute_function` and :py:func:`execute_function_from_context`.
+    Results are cached for calls with at least one argument, keyed on the function and fingerprints of the
+    argument values (see :py:func:`fingerprint`). Calls without arguments are never cached,
+    as they usually depend on some global state.
+    Cached results are evicted in least-recently-used order once the given number of entries is exceeded.
+    Only enable the cache if the called functions are pure, i.e., neither modify their arguments
+    nor have any other side effects. Scenarios can opt out using the tag :code:`@no_function_cache`
+    (see :py:func:`before_tag`).
+
+    :param max_entries: the maximum number of cached results, defaults to 128
+    """
+    _function_cache.resize(max_entries)
+
+
+def disable_function_cache() -> None:
+    """Disable the function cache and remove all cached results."""
+    _function_cache.resize(0)
+    _function_cache.clear()
+
+
+def get_function_cache_stats() -> CacheStats:
+    """Get the hit and miss counters as well as the number of entries of the function cache.
+
+    :return: the current statistics of the function cache
+    """
+    return _function_cache.stats()
+
+
+def before_tag(context: Context, tag: str) -> None:
+    """Handle tags in behave feature files for disabling the function cache and detecting modified arguments.
+
+    Scenarios calling functions that must not be memoized can be tagged using :code:`@no_function_cache`.
+    Scenarios tagged using :code:`@detect_mutations` fail if a called function modifies any of its arguments
+    (see :py:func:`call_detecting_mutations`).
+
+    :param context: the current context
+    :param tag: the tag to process, only implemented for :code:`tag in ("no_function_cache", "detect_mutations")`
+    """
+    # attributes of the context are removed again at the end of the scenario
+    if tag == NO_FUNCTION_CACHE_TAG:
+        context.no_function_cache = True
+    elif tag == DETECT_MUTATIONS_TAG:
+        context.detect_mutations = True
+
+
+def fingerprint(value: Any) -> Optional[Hashable]:
+    """Compute a fingerprint of the content of a value.
+
+    Dataframes and series are hashed using :py:func:`beehyve.utils.pandas.hash_dataframe`,
+    numpy arrays using their raw data, lists, tuples, sets, and dicts recursively.
+    Immutable builtins (strings, bytes, numbers, and None) are used as is,
+    and all other values are hashed in their pickled form.
+
+    :param value: the value
+    :return: a fingerprint, which is equal for values with equal content,
+        or None if no fingerprint can be computed for the value
+    """
+    if isinstance(value, pd.DataFrame):
+        content_hash = pandas_utils.hash_dataframe(value)
+        return None if content_hash is None else ("DataFrame", content_hash)
+
+    if isinstance(value, pd.Series):
+        content_hash = pandas_utils.hash_dataframe(value.to_frame(name=repr(value.name)))
+        return None if content_hash is None else ("Series", content_hash)
+
+    if isinstance(value, np.ndarray) and value.dtype != object:
+        digest = hashlib.blake2b(np.ascontiguousarray(value).view(np.uint8).ravel().data, digest_size=16)
+        return "ndarray", str(value.dtype), value.shape, digest.hexdigest()
+
+    if isinstance(value, (list, tuple, set, frozenset, dict)):
+        return _fingerprint_collection(value)
+
+    # only immutable builtins are used as is, instances of other classes usually hash by identity
+    if value is None or type(value) in _IMMUTABLE_TYPES:
+        return type(value).__name__, value
+
+    try:
+        return "pickle", hashlib.blake2b(pickle.dumps(value), digest_size=16).hexdigest()
+    except Exception:  # pylint: disable=broad-except
+        return None
+
+
+def call_detecting_mutations(
+    func: Callable, args_vals: Sequence[Any], kwargs_vals: Mapping[str, Any], timeout: Optional[float] = None
+) -> Any:
+    """Call a function and check that it does not modify any of its arguments.
+
+    The arguments are fingerprinted (see :py:func:`fingerprint`) before and after the call,
+    arguments without a fingerprint are not checked.
+    Coroutines returned by the function are awaited before the arguments are checked
+    (see :py:func:`beehyve.utils.event_loop.resolve_async_result`).
+
+    :param func: the function to call
+    :param args_vals: the positional arguments
+    :param kwargs_vals: the keyword arguments
+    :param timeout: the maximum duration of the call in seconds, async functions are cancelled once it is exceeded
+        and sync functions fail after they completed, defaults to None (wait until completed)
+    :raises AssertionError: if the function modified any of its arguments, naming the modified parameters
+    :return: the results of the function
+    """
+    arguments = _bind_arguments(func, args_vals, kwargs_vals)
+    fingerprints = {name: fingerprint(value) for name, value in arguments.items()}
+
+    results = _call_with_timeout(func, args_vals, kwargs_vals, timeout)
+
+    modified = [
+        name
+        for name, value in arguments.items()
+        if fingerprints[name] is not None and fingerprint(value) != fingerprints[name]
+    ]
+    if modified:
+        func_name = getattr(func, "__qualname__", repr(func))
+        raise AssertionError(f"function {func_name} modified its arguments: {', '.join(modified)}")
+
+    return results
 
 
 def execute_function(
@@ -17,10 +187,13 @@ def execute_function(
     args: Sequence[str],
     kwargs: Mapping[str, str],
     result_names: Tuple[str, ...] = (),
+    timeout: Optional[float] = None,
 ) -> None:
     """Import and run a function from a given module.
 
     Uses the given args and kwargs from the context as arguments.
+    Coroutine functions are awaited and async generators are converted to generators
+    (see :py:func:`beehyve.utils.event_loop.resolve_async_result`).
 
     :param context: the current context
     :param func_name: the name of the function to execute
@@ -29,24 +202,46 @@ def execute_function(
     :param args: variable names of the variables which should be used as arguments to the function
     :param kwargs: a mapping of function kwarg to variable name which should be passed to the function
     :param result_names: a tuple of variable names to which the result(s) of the function should be assigned
+    :param timeout: the maximum duration of the call in seconds, async functions are cancelled once it is exceeded
+        and sync functions fail after they completed, defaults to None (wait until completed)
     """
-    func = get_from_module(module, func_name)
+    func = _resolve_function(module, func_name)
 
-    args_vals = _load_args_from_context(context, args)
-    kwargs_vals = _load_kwargs_from_context(context, kwargs)
+    variables = _get_variables(context)
+    args_vals = _load_args_from_context(variables, args)
+    kwargs_vals = _load_kwargs_from_context(variables, kwargs)
 
-    results = func(*args_vals, **kwargs_vals)
+    results = _call_function(context, func, args_vals, kwargs_vals, timeout)
 
     _assign_results(context, results, result_names)
 
 
-def _load_args_from_context(context: Context, args: Sequence[str]) -> Sequence[Any]:
-    args_vals = [get_var(context, arg) for arg in args]
+def _resolve_function(module: str, func_name: str) -> Callable:
+    # modules are looked up in sys.modules first, which avoids the overhead of importlib for imported modules,
+    # the function itself is not cached so that monkeypatching it still takes effect
+    module_obj = sys.modules.get(module)
+    if module_obj is None:
+        module_obj = importlib.import_module(module)
+    return getattr(module_obj, func_name)
+
+
+def _get_variables(context: Context) -> Mapping[str, Any]:
+    return context.vars if "vars" in context else {}
+
+
+def _get_variable(variables: Mapping[str, Any], name: str) -> Any:
+    if name not in variables:
+        raise KeyError(f"variable {name} has not been set")
+    return variables[name]
+
+
+def _load_args_from_context(variables: Mapping[str, Any], args: Sequence[str]) -> Sequence[Any]:
+    args_vals = [_get_variable(variables, arg) for arg in args]
     return args_vals
 
 
-def _load_kwargs_from_context(context: Context, kwargs: Mapping[str, str]) -> Mapping[str, Any]:
-    kwargs_vals = {keyword: get_var(context, kwarg) for keyword, kwarg in kwargs.items()}
+def _load_kwargs_from_context(variables: Mapping[str, Any], kwargs: Mapping[str, str]) -> Mapping[str, Any]:
+    kwargs_vals = {keyword: _get_variable(variables, kwarg) for keyword, kwarg in kwargs.items()}
     return kwargs_vals
 
 
@@ -56,45 +251,401 @@ def execute_function_from_context(
     func_name: str,
     module: str,
     result_names: Tuple[str, ...] = (),
+    timeout: Optional[float] = None,
 ) -> None:
     """Import and run a function from a given module.
 
     It expects the variables in the context to have the exact same names
     as the arguments of the function signature.
+    Coroutine functions are awaited and async generators are converted to generators
+    (see :py:func:`beehyve.utils.event_loop.resolve_async_result`).
 
     :param context: the current context
     :param func_name: the name of the function to execute
     :param module: the module where the function can be found,
         i.e., you should be able to import <func_name> from <module>
     :param result_names: a tuple of variable names to which the result(s) of the function should be assigned
+    :param timeout: the maximum duration of the call in seconds, async functions are cancelled once it is exceeded
+        and sync functions fail after they completed, defaults to None (wait until completed)
     """
-    func = get_from_module(module, func_name)
+    func = _resolve_function(module, func_name)
 
     signature = _get_func_signature(func)
 
-    _check_func_signature(context, signature)
+    args_vals, kwargs_vals = signature.bind_context(context)
+
+    results = _call_function(context, func, args_vals, kwargs_vals, timeout)
+
+    _assign_results(context, results, result_names)
+
+
+def prepare_function_call(
+    *,
+    context: Context,
+    func_name: str,
+    module: str,
+    args: Optional[Sequence[str]] = None,
+    kwargs: Optional[Mapping[str, str]] = None,
+    timeout: Optional[float] = None,
+) -> Callable[[], Any]:
+    """Import a function from a given module and load its arguments, to call it repeatedly (e.g., to measure it).
+
+    The arguments are loaded from the context once, either using the given variable names
+    (as in :py:func:`execute_function`) or, if neither args nor kwargs are given, by the names of the parameters
+    of the function (as in :py:func:`execute_function_from_context`).
+    Calls are never memoized, but are checked for modified arguments and awaited like the calls of
+    :py:func:`execute_function`.
+
+    :param context: the current context
+    :param func_name: the name of the function to execute
+    :param module: the module where the function can be found,
+        i.e., you should be able to import <func_name> from <module>
+    :param args: variable names of the variables which should be used as arguments to the function, defaults to None
+    :param kwargs: a mapping of function kwarg to variable name which should be passed to the function,
+        defaults to None
+    :param timeout: the maximum duration of the call in seconds, async functions are cancelled once it is exceeded
+        and sync functions fail after they completed, defaults to None (wait until completed)
+    :return: a function without arguments calling the function and returning its results
+    """
+    func, args_vals, kwargs_vals = _load_function_call(context, func_name, module, args, kwargs)
+    return functools.partial(_run_function, context, func, args_vals, kwargs_vals, timeout)
+
+
+def execute_function_measuring_memory(
+    *,
+    context: Context,
+    func_name: str,
+    module: str,
+    args: Optional[Sequence[str]] = None,
+    kwargs: Optional[Mapping[str, str]] = None,
+    result_names: Tuple[str, ...] = (),
+    timeout: Optional[float] = None,
+    rss_interval: Optional[float] = None,
+) -> "MemoryUsage":
+    """Import and run a function from a given module, measuring the peak of the memory allocated by the call.
+
+    The arguments are loaded as in :py:func:`prepare_function_call` and the call is never memoized.
+    See :py:func:`beehyve.utils.memory.measure_memory` for details on the measurement.
 
-    args_vals, kwargs_vals = signature.get_argument_values_for_context(context)
+    :param context: the current context
+    :param func_name: the name of the function to execute
+    :param module: the module where the function can be found,
+        i.e., you should be able to import <func_name> from <module>
+    :param args: variable names of the variables which should be used as arguments to the function, defaults to None
+    :param kwargs: a mapping of function kwarg to variable name which should be passed to the function,
+        defaults to None
+    :param result_names: a tuple of variable names to which the result(s) of the function should be assigned
+    :param timeout: the maximum duration of the call in seconds, async functions are cancelled once it is exceeded
+        and sync functions fail after they completed, defaults to None (wait until completed)
+    :param rss_interval: the interval of sampling the RSS of the process in seconds,
+        defaults to None (RSS is not sampled)
+    :return: the memory used by the call, including the size of the dataframes and series passed to it
+    """
+    func, args_vals, kwargs_vals = _load_function_call(context, func_name, module, args, kwargs)
+    input_size = memory.get_input_size([*args_vals, *kwargs_vals.values()])
 
-    results = func(*args_vals, **kwargs_vals)
+    results, usage = memory.measure_memory(
+        functools.partial(_run_function, context, func, args_vals, kwargs_vals, timeout),
+        input_size=input_size,
+        rss_interval=rss_interval,
+    )
 
     _assign_results(context, results, result_names)
+    return usage
 
 
-def _get_func_signature(func: Callable) -> "SignatureHandler":
-    signature = inspect.signature(func)
+def execute_function_on_chunks(
+    *,
+    context: Context,
+    func_name: str,
+    module: str,
+    file_name: str,
+    chunk_arg: str,
+    args: Optional[Sequence[str]] = None,
+    kwargs: Optional[Mapping[str, str]] = None,
+    result_names: Tuple[str, ...] = (),
+    chunksize: int = DEFAULT_CHUNK_SIZE,
+    executor: Optional[str] = None,
+    max_workers: Optional[int] = None,
+    combine: Optional[str] = None,
+    output: Optional[str] = None,
+    timeout: Optional[float] = None,
+) -> None:
+    """Import a function from a given module and apply it to every chunk of rows of a CSV or Parquet file.
+
+    The arguments are loaded from the context as in :py:func:`execute_function`, and every chunk
+    (see :py:func:`beehyve.utils.partitions.read_chunks`) is passed as an additional keyword argument.
+    The calls are never memoized and can run in a pool of threads or processes
+    (see :py:func:`beehyve.utils.partitions.map_chunks`), async functions are only supported without a pool.
+
+    The outputs are written to a Parquet file (the result is the number of written rows) if an output is given,
+    reduced using a combiner if given, or concatenated otherwise (see :py:mod:`beehyve.utils.partitions`).
+
+    :param context: the current context
+    :param func_name: the name of the function to execute
+    :param module: the module where the function can be found,
+        i.e., you should be able to import <func_name> from <module>
+    :param file_name: the path of the CSV or Parquet file
+    :param chunk_arg: the name of the keyword argument used to pass the chunk to the function
+    :param args: variable names of the variables which should be used as arguments to the function, defaults to None
+    :param kwargs: a mapping of function kwarg to variable name which should be passed to the function,
+        defaults to None
+    :param result_names: a tuple of variable names to which the combined output should be assigned
+    :param chunksize: the maximum number of rows of every chunk, defaults to 100,000
+    :param executor: the kind of pool, :code:`thread` or :code:`process`, defaults to None (no pool)
+    :param max_workers: the number of workers of the pool, defaults to None (the number of CPUs)
+    :param combine: the combiner function (:code:`<module>.<function>`) called with the combined outputs so far
+        and the next output, defaults to None (the outputs are concatenated)
+    :param output: the path of a Parquet file the outputs are written to, defaults to None
+    :param timeout: the maximum duration of the call in seconds, async functions are cancelled once it is exceeded
+        and sync functions fail after they completed, defaults to None (wait until completed)
+    :raises ValueError: if a variable is passed as the chunk argument as well
+    """
+    func, args_vals, kwargs_vals = _load_function_call(context, func_name, module, args or [], kwargs or {})
+    if chunk_arg in kwargs_vals:
+        raise ValueError(f"argument {chunk_arg} is used for the chunks and cannot be passed a variable")
+
+    if executor is None:
+        call = functools.partial(_run_function_with_chunk, context, func, args_vals, kwargs_vals, timeout, chunk_arg)
+    else:
+        # a partial of a module-level function can be pickled for process pools
+        call = functools.partial(_call_with_chunk, func, args_vals, kwargs_vals, chunk_arg)
+
+    outputs = partitions.map_chunks(
+        call, partitions.read_chunks(file_name, chunksize=chunksize), executor=executor, max_workers=max_workers
+    )
+
+    if output is not None:
+        results = files.write_parquet_chunks(outputs, output)
+    elif combine is not None:
+        combine_module, combine_name = combine.rsplit(".", 1)
+        results = partitions.reduce_outputs(outputs, _resolve_function(combine_module, combine_name))
+    else:
+        results = partitions.concat_outputs(outputs)
+
+    if result_names:
+        _assign_results(context, results, result_names)
+
+
+def _run_function_with_chunk(
+    context: Context,
+    func: Callable,
+    args_vals: Sequence[Any],
+    kwargs_vals: Mapping[str, Any],
+    timeout: Optional[float],
+    chunk_arg: str,
+    chunk: Any,
+) -> Any:
+    return _run_function(context, func, args_vals, {**kwargs_vals, chunk_arg: chunk}, timeout)
+
+
+def _call_with_chunk(
+    func: Callable, args_vals: Sequence[Any], kwargs_vals: Mapping[str, Any], chunk_arg: str, chunk: Any
+) -> Any:
+    result = func(*args_vals, **kwargs_vals, **{chunk_arg: chunk})
+    if inspect.iscoroutine(result):
+        result.close()
+    if inspect.isawaitable(result) or inspect.isasyncgen(result):
+        raise TypeError(f"{func.__qualname__} is asynchronous, which is only supported without a pool")
+    return result
+
+
+def _load_function_call(
+    context: Context,
+    func_name: str,
+    module: str,
+    args: Optional[Sequence[str]],
+    kwargs: Optional[Mapping[str, str]],
+) -> Tuple[Callable, Sequence[Any], Mapping[str, Any]]:
+    func = _resolve_function(module, func_name)
+
+    args_vals: Sequence[Any]
+    kwargs_vals: Mapping[str, Any]
+    if args is None and kwargs is None:
+        args_vals, kwargs_vals = _get_func_signature(func).bind_context(context)
+    else:
+        variables = _get_variables(context)
+        args_vals = _load_args_from_context(variables, args or [])
+        kwargs_vals = _load_kwargs_from_context(variables, kwargs or {})
+
+    if "read_only_vars" in context:
+        args_vals, kwargs_vals = _get_read_only_views(args_vals, kwargs_vals)
+
+    return func, args_vals, kwargs_vals
+
+
+class FunctionCall(NamedTuple):
+    """A call of a function using variables in the context, see :py:func:`execute_function`."""
 
-    return SignatureHandler(signature)
+    func_name: str
+    module: str
+    args: Sequence[str]
+    kwargs: Mapping[str, str]
+    result_names: Tuple[str, ...] = ()
 
 
-def _check_func_signature(context: Context, signature: "SignatureHandler") -> None:
-    has_required_args = signature.context_has_required_args(context)
-    has_required_varargs = signature.context_has_required_varargs(context)
-    has_required_kwargs = signature.context_has_required_kwargs(context)
-    has_required_varkw = signature.context_has_required_varkw(context)
+def execute_functions_concurrently(
+    *,
+    context: Context,
+    calls: Sequence[FunctionCall],
+    timeout: Optional[float] = None,
+) -> None:
+    """Import and run several functions, awaiting the coroutines returned by async functions concurrently.
 
-    if not (has_required_args and has_required_varargs and has_required_kwargs and has_required_varkw):
-        raise ValueError("Not all required arguments are in the context.")
+    All functions are called first, then the returned coroutines are run concurrently on the event loop
+    (see :py:func:`beehyve.utils.event_loop.run_concurrently`) and the results are assigned in the order of the calls.
+    Results are neither memoized nor checked for modified arguments.
+
+    :param context: the current context
+    :param calls: the calls of the functions, using variables in the context as arguments
+    :param timeout: the maximum time to wait for all results in seconds, defaults to None (wait until completed)
+    """
+    variables = _get_variables(context)
+    results = []
+    try:
+        for call in calls:
+            func = _resolve_function(call.module, call.func_name)
+            args_vals = _load_args_from_context(variables, call.args)
+            kwargs_vals = _load_kwargs_from_context(variables, call.kwargs)
+            if "read_only_vars" in context:
+                args_vals, kwargs_vals = _get_read_only_views(args_vals, kwargs_vals)
+            results.append(func(*args_vals, **kwargs_vals))
+    except Exception:
+        # coroutines of the functions called so far are never awaited
+        for result in results:
+            if inspect.iscoroutine(result):
+                result.close()
+        raise
+
+    for call, result in zip(calls, event_loop.run_concurrently(results, timeout)):
+        _assign_results(context, event_loop.resolve_async_result(result, timeout), call.result_names)
+
+
+def _fingerprint_collection(value: Union[list, tuple, set, frozenset, dict]) -> Optional[Hashable]:
+    if isinstance(value, dict):
+        items: Iterable = sorted(value.items(), key=repr)
+    elif isinstance(value, (set, frozenset)):
+        items = sorted(value, key=repr)
+    else:
+        items = value
+
+    fingerprints = tuple([fingerprint(item) for item in items])
+    if any([item is None for item in fingerprints]):
+        return None
+    return type(value).__name__, fingerprints
+
+
+def _call_function(
+    context: Context,
+    func: Callable,
+    args_vals: Sequence[Any],
+    kwargs_vals: Mapping[str, Any],
+    timeout: Optional[float] = None,
+) -> Any:
+    if "read_only_vars" in context:
+        args_vals, kwargs_vals = _get_read_only_views(args_vals, kwargs_vals)
+
+    if not _function_cache.enabled or "no_function_cache" in context or not (args_vals or kwargs_vals):
+        return _run_function(context, func, args_vals, kwargs_vals, timeout)
+
+    key = _get_function_cache_key(func, args_vals, kwargs_vals)
+    if key is None:
+        return _run_function(context, func, args_vals, kwargs_vals, timeout)
+
+    results = _function_cache.get(key, _MISSING)
+    if results is _MISSING:
+        results = _run_function(context, func, args_vals, kwargs_vals, timeout)
+        # generators and other iterators can only be consumed once, so they are not cached,
+        # neither are missing results, as the function is most likely only called for its side effects
+        if results is None or _is_lazy(results):
+            return results
+        # the cache keeps its own copy, so later modifications of the results do not affect it
+        _function_cache.put(key, _copy_results(results))
+        return results
+
+    return _copy_results(results)
+
+
+def _get_read_only_views(
+    args_vals: Sequence[Any], kwargs_vals: Mapping[str, Any]
+) -> Tuple[Sequence[Any], Mapping[str, Any]]:
+    args_views = [pandas_utils.read_only_view(value) for value in args_vals]
+    kwargs_views = {keyword: pandas_utils.read_only_view(value) for keyword, value in kwargs_vals.items()}
+    return args_views, kwargs_views
+
+
+def _run_function(
+    context: Context,
+    func: Callable,
+    args_vals: Sequence[Any],
+    kwargs_vals: Mapping[str, Any],
+    timeout: Optional[float] = None,
+) -> Any:
+    if "detect_mutations" in context:
+        return call_detecting_mutations(func, args_vals, kwargs_vals, timeout)
+    return _call_with_timeout(func, args_vals, kwargs_vals, timeout)
+
+
+def _call_with_timeout(
+    func: Callable, args_vals: Sequence[Any], kwargs_vals: Mapping[str, Any], timeout: Optional[float]
+) -> Any:
+    start = time.perf_counter()
+    result = func(*args_vals, **kwargs_vals)
+
+    # the event loop is only imported if a function is asynchronous
+    if inspect.isawaitable(result) or inspect.isasyncgen(result):
+        return event_loop.resolve_async_result(result, timeout)
+
+    # sync functions cannot be cancelled, so they fail after they completed
+    duration = time.perf_counter() - start
+    if timeout is not None and duration > timeout:
+        name = getattr(func, "__qualname__", repr(func))
+        raise AssertionError(f"{name} did not complete within {timeout} seconds, it took {duration:.3f} seconds")
+    return result
+
+
+def _bind_arguments(func: Callable, args_vals: Sequence[Any], kwargs_vals: Mapping[str, Any]) -> Dict[str, Any]:
+    # arguments are named by the parameters of the function if possible, and by their position or keyword otherwise
+    try:
+        return dict(_get_func_signature(func)._signature.bind(*args_vals, **kwargs_vals).arguments)
+    except (TypeError, ValueError):
+        return {**{f"args[{i}]": value for i, value in enumerate(args_vals)}, **kwargs_vals}
+
+
+def _get_function_cache_key(
+    func: Callable, args_vals: Sequence[Any], kwargs_vals: Mapping[str, Any]
+) -> Optional[Hashable]:
+    args_fingerprint = fingerprint(tuple(args_vals))
+    kwargs_fingerprint = fingerprint(dict(kwargs_vals))
+    if args_fingerprint is None or kwargs_fingerprint is None:
+        return None
+    return func, args_fingerprint, kwargs_fingerprint
+
+
+def _is_lazy(results: Any) -> bool:
+    if isinstance(results, tuple):
+        return any([isinstance(result, Iterator) for result in results])
+    return isinstance(results, Iterator)
+
+
+def _copy_results(results: Any) -> Any:
+    if isinstance(results, tuple):
+        return tuple([pandas_utils.isolated_copy(result) for result in results])
+    return pandas_utils.isolated_copy(results)
+
+
+def _get_func_signature(func: Callable) -> "SignatureHandler":
+    # signature handlers are cached per function object, i.e., a monkeypatched function gets its own handler
+    try:
+        handler = _signature_handlers.get(func)
+    except TypeError:
+        return SignatureHandler(inspect.signature(func))
+
+    if handler is None:
+        handler = SignatureHandler(inspect.signature(func))
+        _signature_handlers.put(func, handler)
+
+    return handler
 
 
 def _assign_results(
@@ -133,6 +684,14 @@ class SignatureHandler:
 
         self._args, self._varargs, self._kwargs, self._varkw = self._split_signature()
 
+        # the name, kind and whether it is required of all parameters in order, used to bind them in a single pass
+        self._plan = tuple(
+            [
+                (parameter.name, parameter.kind, parameter.default is inspect.Parameter.empty)
+                for parameter in self._signature.parameters.values()
+            ]
+        )
+
     def _split_signature(
         self,
     ) -> Tuple[
@@ -220,6 +779,42 @@ class SignatureHandler:
 
         return args_vals, kwargs_vals
 
+    def bind_context(self, context: Context) -> Tuple[List[Any], Dict[str, Any]]:
+        """Check and get all argument values corresponding to this signature from the context in a single pass.
+
+        Equivalent to checking all :code:`context_has_required_*` methods
+        and calling :py:meth:`get_argument_values_for_context` afterwards.
+
+        :param context: the current context
+        :raises ValueError: if not all required arguments are in the context
+        :return: args (positional args and varargs in correct order), kwargs (keyword only args and varkw as mapping)
+        """
+        variables = _get_variables(context)
+
+        args_vals: List[Any] = []
+        kwargs_vals: Dict[str, Any] = {}
+
+        for name, kind, is_required in self._plan:
+            if name not in variables:
+                if is_required:
+                    raise ValueError("Not all required arguments are in the context.")
+                continue
+
+            value = variables[name]
+
+            if kind is inspect.Parameter.POSITIONAL_ONLY or kind is inspect.Parameter.POSITIONAL_OR_KEYWORD:
+                args_vals.append(value)
+            elif kind is inspect.Parameter.VAR_POSITIONAL:
+                args_vals.extend(self._varargs_vals_to_tuple(value))
+            elif kind is inspect.Parameter.KEYWORD_ONLY:
+                kwargs_vals[name] = value
+            else:
+                if not isinstance(value, dict):
+                    raise ValueError("varkw values have to be a dict")
+                kwargs_vals.update(value)
+
+        return args_vals, kwargs_vals
+
     def _get_args_vals_from_context(self, context: Context) -> List[Any]:
         return [get_var(context, arg.name) for arg in self._args if has_var(context, arg.name)]
 
@@ -0,0 +1,373 @@
+"""Collection of behave hooks recording the wall time, CPU time, and memory usage of steps and scenarios.
+
+The hooks are wired into the environment in the same way as :py:func:`beehyve.utils.monkeypatch.before_tag`,
+e.g., :code:`from beehyve.utils.instrumentation import after_all, after_scenario, after_step, before_scenario,
+before_step`. The recorded data can be exported as JSON or in the Chrome trace format
+(see :py:func:`export_json` and :py:func:`export_chrome_trace`).
+"""
+
+import json
+import os
+import sys
+import threading
+import time
+import tracemalloc
+import weakref
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+from behave import step_registry
+from behave.model import Scenario, Step
+from behave.runner import Context
+
+from beehyve.utils.counters import get_counters
+
+DEFAULT_TOP_N = 10
+
+
+class StepRecord(NamedTuple):
+    """Measurements of a single executed step."""
+
+    feature: str
+    scenario: str
+    step: str
+    pattern: str
+    status: str
+    start: float
+    wall_time: float
+    cpu_time: float
+    memory_peak: int
+    variable_sizes: Dict[str, int]
+
+
+class ScenarioRecord(NamedTuple):
+    """Measurements of a single executed scenario."""
+
+    feature: str
+    scenario: str
+    status: str
+    start: float
+    wall_time: float
+    cpu_time: float
+
+
+class _Start(NamedTuple):
+    wall_time: float
+    cpu_time: float
+    memory: int
+    variable_names: frozenset
+
+
+_step_records: List[StepRecord] = []
+_scenario_records: List[ScenarioRecord] = []
+_lock = threading.Lock()
+
+_step_patterns: "weakref.WeakKeyDictionary[step_registry.StepRegistry, Dict[Tuple[str, str], str]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+_step_start: Optional[_Start] = None
+_scenario_start: Optional[_Start] = None
+
+
+def before_scenario(context: Context, scenario: Scenario) -> None:
+    """Start measuring a scenario, to be called in the :code:`before_scenario` hook of the environment.
+
+    :param context: the current context
+    :param scenario: the scenario that is about to be run
+    """
+    global _scenario_start
+    _scenario_start = _start_measuring(context, trace_memory=False)
+
+
+def after_scenario(context: Context, scenario: Scenario) -> None:
+    """Record the measurements of a scenario, to be called in the :code:`after_scenario` hook of the environment.
+
+    :param context: the current context
+    :param scenario: the scenario that has been run
+    """
+    if _scenario_start is None:
+        return
+
+    with _lock:
+        _scenario_records.append(
+            ScenarioRecord(
+                feature=scenario.feature.name if scenario.feature else "",
+                scenario=scenario.name,
+                status=_get_status(scenario),
+                start=_scenario_start.wall_time,
+                wall_time=time.perf_counter() - _scenario_start.wall_time,
+                cpu_time=time.process_time() - _scenario_start.cpu_time,
+            )
+        )
+
+
+def before_step(context: Context, step: Step) -> None:
+    """Start measuring a step, to be called in the :code:`before_step` hook of the environment.
+
+    Starts tracing memory allocations using :py:mod:`tracemalloc` if it is not running yet.
+
+    :param context: the current context
+    :param step: the step that is about to be run
+    """
+    global _step_start
+    _step_start = _start_measuring(context, trace_memory=True)
+
+
+def after_step(context: Context, step: Step) -> None:
+    """Record the measurements of a step, to be called in the :code:`after_step` hook of the environment.
+
+    Besides the times and the peak of allocated memory during the step,
+    the sizes of all variables added to :code:`context.vars` by the step are recorded.
+
+    :param context: the current context
+    :param step: the step that has been run
+    """
+    if _step_start is None:
+        return
+
+    wall_time = time.perf_counter() - _step_start.wall_time
+    cpu_time = time.process_time() - _step_start.cpu_time
+    memory_peak = max(tracemalloc.get_traced_memory()[1] - _step_start.memory, 0)
+
+    # only new variables are accessed, as accessing others may, e.g., reload spilled variables
+    variables = context.vars if "vars" in context else {}
+    variable_sizes = {
+        name: get_size(variables[name]) for name in list(variables) if name not in _step_start.variable_names
+    }
+
+    scenario = getattr(context, "scenario", None)
+    pattern = _get_step_pattern(context, step)
+
+    with _lock:
+        _step_records.append(
+            StepRecord(
+                feature=context.feature.name if getattr(context, "feature", None) else "",
+                scenario=scenario.name if scenario else "",
+                step=f"{step.keyword} {step.name}",
+                pattern=pattern,
+                status=_get_status(step),
+                start=_step_start.wall_time,
+                wall_time=wall_time,
+                cpu_time=cpu_time,
+                memory_peak=memory_peak,
+                variable_sizes=variable_sizes,
+            )
+        )
+
+
+def after_all(context: Context) -> None:
+    """Print a summary and export the recorded data, to be called in the :code:`after_all` hook of the environment.
+
+    The files are configured using behave's user data, i.e., :code:`-D instrumentation_json=<file>`
+    and :code:`-D instrumentation_trace=<file>`. The number of entries in the summary can be set
+    using :code:`-D instrumentation_top_n=<n>`.
+
+    :param context: the current context
+    """
+    userdata = context.config.userdata
+
+    if "instrumentation_json" in userdata:
+        export_json(userdata["instrumentation_json"])
+    if "instrumentation_trace" in userdata:
+        export_chrome_trace(userdata["instrumentation_trace"])
+
+    print(summarize(top_n=userdata.getint("instrumentation_top_n", DEFAULT_TOP_N)))
+
+
+def get_step_records() -> List[StepRecord]:
+    """Get the measurements of all steps recorded so far.
+
+    :return: a list of step records in order of execution
+    """
+    with _lock:
+        return list(_step_records)
+
+
+def get_scenario_records() -> List[ScenarioRecord]:
+    """Get the measurements of all scenarios recorded so far.
+
+    :return: a list of scenario records in order of execution
+    """
+    with _lock:
+        return list(_scenario_records)
+
+
+def reset_instrumentation() -> None:
+    """Remove all recorded measurements."""
+    with _lock:
+        _step_records.clear()
+        _scenario_records.clear()
+
+
+def get_size(value: Any) -> int:
+    """Estimate the memory used by a value.
+
+    Uses :py:meth:`pd.DataFrame.memory_usage` for pandas objects, the number of bytes of numpy arrays,
+    and :py:func:`sys.getsizeof` for all other values.
+
+    :param value: the value
+    :return: the estimated size in bytes
+    """
+    if isinstance(value, pd.DataFrame):
+        return int(value.memory_usage(index=True, deep=True).sum())
+    if isinstance(value, pd.Series):
+        return int(value.memory_usage(index=True, deep=True))
+    if isinstance(value, np.ndarray):
+        return int(value.nbytes)
+    return sys.getsizeof(value)
+
+
+def export_json(file_name: str) -> None:
+    """Export all recorded measurements as JSON.
+
+    Besides the steps and scenarios, the file contains the current values of all counters
+    (see :py:func:`beehyve.utils.counters.get_counters`), e.g., how often dataframes were compared using the fast path.
+
+    :param file_name: the path of the JSON file
+    """
+    data = {
+        "steps": [record._asdict() for record in get_step_records()],
+        "scenarios": [record._asdict() for record in get_scenario_records()],
+        "counters": get_counters(),
+    }
+    with open(file_name, "w") as f:
+        json.dump(data, f, indent=2)
+
+
+def export_chrome_trace(file_name: str) -> None:
+    """Export all recorded measurements in the Chrome trace format.
+
+    The file can be opened using, e.g., :code:`chrome://tracing` or `Perfetto <https://ui.perfetto.dev>`_.
+    Every scenario and step is a complete event, so steps are nested inside their scenarios.
+
+    :param file_name: the path of the trace file
+    """
+    pid = os.getpid()
+    events = [
+        _get_trace_event(record.scenario, "scenario", record.start, record.wall_time, pid, record._asdict())
+        for record in get_scenario_records()
+    ]
+    events.extend(
+        [
+            _get_trace_event(record.step, "step", record.start, record.wall_time, pid, record._asdict())
+            for record in get_step_records()
+        ]
+    )
+
+    with open(file_name, "w") as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
+
+
+def summarize(top_n: int = DEFAULT_TOP_N) -> str:
+    """Summarize the recorded measurements.
+
+    Steps are grouped by the pattern of their step definition.
+
+    :param top_n: the number of step patterns and scenarios to show, defaults to 10
+    :return: the slowest step patterns (by total wall time) and the slowest scenarios
+    """
+    patterns: Dict[str, Tuple[int, float, int]] = {}
+    for step_record in get_step_records():
+        count, wall_time, memory_peak = patterns.get(step_record.pattern, (0, 0.0, 0))
+        patterns[step_record.pattern] = (
+            count + 1,
+            wall_time + step_record.wall_time,
+            max(memory_peak, step_record.memory_peak),
+        )
+
+    lines = [f"Slowest step patterns (top {top_n}):"]
+    for pattern, (count, wall_time, memory_peak) in sorted(patterns.items(), key=lambda item: -item[1][1])[:top_n]:
+        lines.append(
+            f"    {wall_time:9.3f}s total, {count:6d} calls, {_format_bytes(memory_peak)} peak memory: {pattern}"
+        )
+
+    lines.append(f"Slowest scenarios (top {top_n}):")
+    for scenario_record in sorted(get_scenario_records(), key=lambda record: -record.wall_time)[:top_n]:
+        lines.append(f"    {scenario_record.wall_time:9.3f}s: {scenario_record.feature} -- {scenario_record.scenario}")
+
+    return "\n".join(lines)
+
+
+def reset_memory_peak() -> int:
+    """Reset the peak of the memory traced by :py:mod:`tracemalloc`, starting tracing if it is not running yet.
+
+    :py:func:`tracemalloc.reset_peak` is only available on Python 3.9 and later. On earlier versions,
+    tracing is restarted instead, which discards the traces of all earlier allocations,
+    so that the peak never includes allocations made before it was reset.
+
+    :return: the currently traced memory in bytes, i.e., the baseline of the peak
+    """
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+    elif hasattr(tracemalloc, "reset_peak"):
+        tracemalloc.reset_peak()
+    else:
+        tracemalloc.stop()
+        tracemalloc.start()
+    return tracemalloc.get_traced_memory()[0]
+
+
+def _start_measuring(context: Context, *, trace_memory: bool) -> _Start:
+    memory = 0
+    if trace_memory:
+        memory = reset_memory_peak()
+
+    variable_names = frozenset(context.vars) if "vars" in context else frozenset()
+
+    return _Start(time.perf_counter(), time.process_time(), memory, variable_names)
+
+
+def _get_step_pattern(context: Context, step: Step) -> str:
+    # behave does not keep the match of a step, so the step definition is looked up again
+    # in the registry used by the runner (which may be replaced when behave is run multiple times),
+    # the patterns are cached per registry as steps with the same text are usually run many times
+    runner = getattr(context, "_runner", None)
+    registry = runner.step_registry if runner is not None else step_registry.registry
+    with _lock:
+        patterns = _step_patterns.setdefault(registry, {})
+        pattern = patterns.get((step.step_type, step.name))
+    if pattern is not None:
+        return pattern
+
+    pattern = _find_step_pattern(registry, step)
+    with _lock:
+        patterns[(step.step_type, step.name)] = pattern
+    return pattern
+
+
+def _find_step_pattern(registry: step_registry.StepRegistry, step: Step) -> str:
+    for step_type in (step.step_type, "step"):
+        for matcher in registry.steps.get(step_type, []):
+            if matcher.check_match(step.name) is not None:
+                return matcher.pattern
+    return step.name
+
+
+def _get_status(model: Any) -> str:
+    status = model.status
+    return getattr(status, "name", str(status))
+
+
+def _get_trace_event(
+    name: str, category: str, start: float, duration: float, pid: int, args: Dict[str, Any]
+) -> Dict[str, Any]:
+    return {
+        "name": name,
+        "cat": category,
+        "ph": "X",
+        "ts": start * 1e6,
+        "dur": duration * 1e6,
+        "pid": pid,
+        "tid": 0,
+        "args": {key: val for key, val in args.items() if key not in ("start", "wall_time")},
+    }
+
+
+def _format_bytes(size: float, units: Sequence[str] = ("B", "KiB", "MiB", "GiB")) -> str:
+    for unit in units[:-1]:
+        if abs(size) < 1024:
+            return f"{size:7.1f} {unit}"
+        size /= 1024
+    return f"{size:7.1f} {units[-1]}"
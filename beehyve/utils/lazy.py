@@ -0,0 +1,40 @@
+"""Collection of functions to defer importing heavy dependencies until they are used."""
+
+import importlib.util
+import sys
+import threading
+from types import ModuleType
+
+_lock = threading.Lock()
+
+
+def lazy_import(name: str) -> ModuleType:
+    """Import a module lazily, i.e., the module is only executed once one of its attributes is accessed.
+
+    Uses :py:class:`importlib.util.LazyLoader`. If the module has already been imported, it is returned as is.
+    This keeps importing the step definitions of beehyve fast, as, e.g., pandas is only imported
+    once a step using it is run.
+
+    :param name: the fully qualified name of the module, e.g., :code:`"beehyve.utils.pandas"`
+    :raises ModuleNotFoundError: if the module cannot be found
+    :return: the (lazily loaded) module
+    """
+    with _lock:
+        if name in sys.modules:
+            return sys.modules[name]
+
+        spec = importlib.util.find_spec(name)
+        if spec is None or spec.loader is None:
+            raise ModuleNotFoundError(f"No module named '{name}'", name=name)
+
+        loader = importlib.util.LazyLoader(spec.loader)
+        spec.loader = loader
+        module = importlib.util.module_from_spec(spec)
+        sys.modules[name] = module
+        loader.exec_module(module)
+
+    parent, _, child = name.rpartition(".")
+    if parent:
+        setattr(sys.modules[parent], child, module)
+
+    return module
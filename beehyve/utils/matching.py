@@ -0,0 +1,193 @@
+"""Collection of functions to speed up resolving step lines to their step definitions.
+
+behave tries the step definitions of a registry one after another for every step line,
+which becomes measurable for the many aliases of beehyve steps on large suites.
+The :py:class:`StepIndex` buckets the step definitions by the first word of their pattern
+and skips step definitions whose literal text is not part of the step line before running the full parse.
+Matches reuse the location of the step definition instead of determining it for every step line.
+The index is installed in the :code:`before_all` hook of the environment, e.g.,
+:code:`from beehyve.utils.matching import before_all`.
+"""
+
+import re
+import string
+from typing import Dict, List, NamedTuple, Optional, Pattern, Sequence, Tuple
+
+from behave.matchers import Match, Matcher, MatchWithError, ParseMatcher
+from behave.model import Step
+from behave.runner import Context
+from behave.step_registry import StepRegistry
+
+STEP_TYPES = ("given", "when", "then", "step")
+
+
+class _Candidate(NamedTuple):
+    position: int
+    matcher: Matcher
+    literals: Optional[Pattern[str]]
+
+
+def get_literal_segments(matcher: Matcher) -> Optional[Tuple[str, ...]]:
+    """Get the literal text of the pattern of a step definition, i.e., everything except its fields.
+
+    :param matcher: the step definition
+    :return: the literal segments of the pattern in order, starting with the (possibly empty) prefix,
+        or None if the step definition is not parse-based
+    """
+    if not isinstance(matcher, ParseMatcher):
+        return None
+
+    try:
+        parts = list(string.Formatter().parse(matcher.pattern))
+    except ValueError:
+        return None
+
+    segments = [literal for literal, _, _, _ in parts] or [""]
+    return (segments[0], *[segment for segment in segments[1:] if segment])
+
+
+def compile_literal_segments(segments: Sequence[str]) -> Pattern[str]:
+    """Compile a regex matching all texts starting with the prefix and containing all other segments in order.
+
+    Matching this regex is a necessary condition for the (case-insensitive) parse pattern to match a text.
+
+    :param segments: the literal segments of a pattern, see :py:func:`get_literal_segments`
+    :return: the compiled regex
+    """
+    expression = "".join([re.escape(segments[0]), *[".*?" + re.escape(segment) for segment in segments[1:]]])
+    return re.compile(expression, re.IGNORECASE | re.DOTALL)
+
+
+def _get_bucket_key(prefix: str) -> Optional[str]:
+    # the first word of the prefix, if the pattern starts with a complete word of ASCII characters
+    if not prefix.isascii() or not prefix or prefix[0].isspace():
+        return None
+    words = prefix.split(maxsplit=1)
+    return words[0].lower() if len(words) > 1 or prefix[-1].isspace() else None
+
+
+def _get_step_key(name: str) -> Optional[str]:
+    # step lines that cannot be lower-cased reliably are matched against all step definitions
+    if not name.isascii():
+        return None
+    return next(iter(name.split(maxsplit=1)), "").lower()
+
+
+def _make_match(matcher: Matcher, name: str) -> Optional[Match]:
+    # same as Matcher.match, but reuses the location of the step definition cached by the matcher
+    try:
+        arguments = matcher.check_match(name)
+    except Exception as e:  # pylint: disable=broad-except
+        return MatchWithError(matcher.func, e)
+
+    if arguments is None:
+        return None
+
+    match = Match(None, arguments)
+    match.func = matcher.func
+    match.location = matcher.location
+    return match
+
+
+class StepIndex:
+    """Index of the step definitions of a registry, used to find the step definition of a step line.
+
+    The step definitions are tried in the same order as by behave, i.e., the first matching step definition is used
+    and step definitions of type :code:`step` are tried after those of the type of the step line.
+    Changes of the registry are detected by the number of step definitions and rebuild the index.
+    """
+
+    def __init__(self, registry: StepRegistry) -> None:
+        """Initialize an index, which is built once the first step line is looked up.
+
+        :param registry: the step registry to index
+        """
+        self.registry = registry
+        self._sizes: Tuple[int, ...] = ()
+        self._buckets: Dict[str, Dict[Optional[str], List[_Candidate]]] = {}
+        self._candidates: Dict[Tuple[str, Optional[str]], Sequence[_Candidate]] = {}
+
+    def find_match(self, step: Step) -> Optional[Match]:
+        """Find the step definition matching a step line, replaces :code:`StepRegistry.find_match`.
+
+        :param step: the step line
+        :return: the match including the parsed arguments, or None if no step definition matches
+        """
+        _, result = self._find(step)
+        return result
+
+    def find_step_definition(self, step: Step) -> Optional[Matcher]:
+        """Find the step definition matching a step line, replaces :code:`StepRegistry.find_step_definition`.
+
+        :param step: the step line
+        :return: the step definition, or None if no step definition matches
+        """
+        matcher, _ = self._find(step)
+        return matcher
+
+    def _find(self, step: Step) -> Tuple[Optional[Matcher], Optional[Match]]:
+        name = step.name
+        for candidate in self._get_candidates(step.step_type, _get_step_key(name)):
+            if candidate.literals is not None and candidate.literals.match(name) is None:
+                continue
+            result = _make_match(candidate.matcher, name)
+            if result:
+                return candidate.matcher, result
+        return None, None
+
+    def _get_candidates(self, step_type: str, key: Optional[str]) -> Sequence[_Candidate]:
+        sizes = tuple(map(len, self.registry.steps.values()))
+        if sizes != self._sizes:
+            self._build(sizes)
+
+        candidates = self._candidates.get((step_type, key))
+        if candidates is None:
+            candidates = self._candidates[(step_type, key)] = self._merge_candidates(step_type, key)
+        return candidates
+
+    def _build(self, sizes: Tuple[int, ...]) -> None:
+        self._buckets = {}
+        for step_type in STEP_TYPES:
+            buckets: Dict[Optional[str], List[_Candidate]] = {}
+            for position, matcher in enumerate(self.registry.steps.get(step_type, [])):
+                segments = get_literal_segments(matcher)
+                if segments is None:
+                    buckets.setdefault(None, []).append(_Candidate(position, matcher, None))
+                else:
+                    key = _get_bucket_key(segments[0])
+                    literals = compile_literal_segments(segments)
+                    buckets.setdefault(key, []).append(_Candidate(position, matcher, literals))
+            self._buckets[step_type] = buckets
+        self._candidates = {}
+        self._sizes = sizes
+
+    def _merge_candidates(self, step_type: str, key: Optional[str]) -> Sequence[_Candidate]:
+        candidates = []
+        for current_type in dict.fromkeys([step_type, "step"]):
+            buckets = self._buckets.get(current_type, {})
+            if key is None:
+                current_candidates = [candidate for bucket in buckets.values() for candidate in bucket]
+            else:
+                current_candidates = buckets.get(key, []) + buckets.get(None, [])
+            candidates.extend(sorted(current_candidates, key=lambda candidate: candidate.position))
+        return tuple(candidates)
+
+
+def install_step_index(registry: StepRegistry) -> StepIndex:
+    """Use a :py:class:`StepIndex` to find the step definitions of the given registry.
+
+    :param registry: the step registry, e.g., the one used by the runner (:code:`context._runner.step_registry`)
+    :return: the installed index
+    """
+    index = StepIndex(registry)
+    registry.find_match = index.find_match
+    registry.find_step_definition = index.find_step_definition
+    return index
+
+
+def before_all(context: Context) -> None:
+    """Install a :py:class:`StepIndex` for the registry of the runner, to be called in the :code:`before_all` hook.
+
+    :param context: the current context
+    """
+    install_step_index(context._runner.step_registry)
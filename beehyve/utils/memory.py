@@ -0,0 +1,137 @@
+"""Collection of functions to measure the peak memory used by a function call.
+
+The peak is measured using :py:mod:`tracemalloc`, which traces all allocations of python objects
+including numpy arrays and pandas objects, but none made by other libraries directly (e.g., pyarrow).
+Those are covered by optionally sampling the resident set size (RSS) of the process in a background thread,
+which is read from :code:`/proc/self/statm` and hence only available on Linux.
+"""
+
+import os
+import threading
+import tracemalloc
+from typing import Any, Callable, Iterable, NamedTuple, Optional, Tuple
+
+import pandas as pd
+
+from beehyve.utils.instrumentation import get_size, reset_memory_peak
+
+MEMORY_UNITS = {
+    "B": 1,
+    "KB": 1000,
+    "MB": 1000**2,
+    "GB": 1000**3,
+    "KiB": 1024,
+    "MiB": 1024**2,
+    "GiB": 1024**3,
+}
+
+_STATM_PATH = "/proc/self/statm"
+
+
+class MemoryUsage(NamedTuple):
+    """The memory used by a function call in bytes."""
+
+    peak: int
+    rss_peak: Optional[int]
+    input_size: int
+
+
+def get_rss() -> Optional[int]:
+    """Get the current resident set size of the process.
+
+    :return: the resident set size in bytes, or None if it cannot be determined on this platform
+    """
+    try:
+        with open(_STATM_PATH) as f:
+            pages = int(f.read().split()[1])
+    except (OSError, IndexError, ValueError):
+        return None
+    return pages * os.sysconf("SC_PAGE_SIZE")
+
+
+def get_input_size(values: Iterable[Any]) -> int:
+    """Get the total memory used by the dataframes and series among the given values.
+
+    Uses :py:meth:`pd.DataFrame.memory_usage` including the index and the contents of object columns.
+
+    :param values: the values, e.g., the arguments of a function call
+    :return: the total size of all dataframes and series in bytes
+    """
+    return sum([get_size(value) for value in values if isinstance(value, (pd.DataFrame, pd.Series))])
+
+
+def measure_memory(
+    func: Callable[[], Any], input_size: int = 0, rss_interval: Optional[float] = None
+) -> Tuple[Any, MemoryUsage]:
+    """Call a function and measure the peak of the memory allocated during the call.
+
+    If :py:mod:`tracemalloc` is tracing already (e.g., for the instrumentation hooks), its peak is reset
+    (see :py:func:`reset_memory_peak`) and tracing continues after the call,
+    otherwise tracing is only active during the call. Both peaks are relative to the memory used before the call.
+
+    :param func: the function to call, without arguments
+    :param input_size: the size of the inputs of the function in bytes, see :py:func:`get_input_size`, defaults to 0
+    :param rss_interval: the interval of sampling the RSS in seconds, defaults to None (RSS is not sampled)
+    :return: the results of the function and its memory usage
+    """
+    was_tracing = tracemalloc.is_tracing()
+    start = reset_memory_peak()
+
+    sampler = _RSSSampler(rss_interval) if rss_interval is not None else None
+    try:
+        if sampler is not None:
+            sampler.start()
+        results = func()
+    finally:
+        if sampler is not None:
+            sampler.stop()
+        peak = max(tracemalloc.get_traced_memory()[1] - start, 0)
+        if not was_tracing:
+            tracemalloc.stop()
+
+    rss_peak = sampler.peak if sampler is not None else None
+    return results, MemoryUsage(peak=peak, rss_peak=rss_peak, input_size=input_size)
+
+
+def to_bytes(value: float, unit: str) -> int:
+    """Convert an amount of memory to bytes.
+
+    :param value: the amount of memory
+    :param unit: the unit of the amount, one of :code:`B`, :code:`KB`, :code:`MB`, :code:`GB`,
+        :code:`KiB`, :code:`MiB`, or :code:`GiB`
+    :raises ValueError: if the unit is unknown
+    :return: the amount in bytes
+    """
+    if unit not in MEMORY_UNITS:
+        raise ValueError(f"unknown memory unit {unit}, use one of {', '.join(MEMORY_UNITS)}")
+    return int(value * MEMORY_UNITS[unit])
+
+
+class _RSSSampler(threading.Thread):
+    def __init__(self, interval: float) -> None:
+        super().__init__(name="beehyve-rss-sampler", daemon=True)
+        self.interval = interval
+        self.baseline = get_rss()
+        self.max_rss = self.baseline
+        self._stopped = threading.Event()
+
+    @property
+    def peak(self) -> Optional[int]:
+        if self.baseline is None or self.max_rss is None:
+            return None
+        return max(self.max_rss - self.baseline, 0)
+
+    def run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            self._sample()
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self.join()
+        # the final sample covers calls shorter than the interval
+        self._sample()
+
+    def _sample(self) -> None:
+        rss = get_rss()
+        if rss is not None and self.max_rss is not None:
+            self.max_rss = max(self.max_rss, rss)
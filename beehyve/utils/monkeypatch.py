@@ -1,23 +1,27 @@
 """Collection of functions used for monkeypatching."""
 
-from typing import Any, Generator, Optional
+from typing import TYPE_CHECKING, Any, Generator, Optional
 
 from behave import fixture, use_fixture
 from behave.runner import Context
-from pytest import MonkeyPatch
 
 from beehyve.utils.variables import get_from_module
 
+if TYPE_CHECKING:
+    from pytest import MonkeyPatch
+
 
 @fixture
-def use_monkeypatching(context: Context) -> Generator[MonkeyPatch, None, None]:
+def use_monkeypatching(context: Context) -> Generator["MonkeyPatch", None, None]:
     """Behave fixture setting up monkeypatching.
 
-    Uses :py:class:`MonkeyPatch` from pytest.
+    Uses :py:class:`MonkeyPatch` from pytest, which is only imported once the fixture is used.
 
     :param context: the current context
     :yield: a MonkeyPatch object to use
     """
+    from pytest import MonkeyPatch
+
     context.monkeypatch = MonkeyPatch()
     yield context.monkeypatch
 
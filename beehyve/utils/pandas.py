@@ -1,9 +1,25 @@
 """Collection of functions for pandas dataframes."""
 
-from typing import Sequence
+import contextlib
+import copy
+import hashlib
+from typing import (
+    Any,
+    Dict,
+    Hashable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Tuple,
+)
 
+import numpy as np
 import pandas as pd
 
+from beehyve.utils.counters import increment_counter
+
 IGNORE_DF_DTYPE_KWARGS = {
     "check_dtype": False,
     "check_column_type": False,
@@ -20,6 +36,100 @@ IGNORE_SERIES_DTYPE_KWARGS = {
     "check_freq": False,
 }
 
+_MISMATCH_CHUNK_SIZE = 1_000_000
+
+
+def isolated_copy(value: Any) -> Any:
+    """Create a copy of a value that can be modified without affecting the original.
+
+    Dataframes and series are copied lazily if pandas' copy-on-write mode is active,
+    i.e., the data is only copied once either of the objects is modified.
+    All other values are deep-copied.
+
+    :param value: the value to copy
+    :return: an independent copy of the value
+    """
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return value.copy(deep=not copy_on_write_enabled())
+    return copy.deepcopy(value)
+
+
+def copy_on_write_enabled() -> bool:
+    """Check whether pandas' copy-on-write mode is active.
+
+    :return: True if shallow copies of pandas objects are copied lazily on modification, False otherwise
+    """
+    if int(pd.__version__.split(".")[0]) >= 3:
+        return True
+    try:
+        return pd.get_option("mode.copy_on_write") is True
+    except KeyError:
+        return False
+
+
+@contextlib.contextmanager
+def copy_on_write() -> Iterator[bool]:
+    """Activate pandas' copy-on-write mode within the context, if it is supported by the installed version of pandas.
+
+    :yield: True if the copy-on-write mode is active, False otherwise
+    """
+    if copy_on_write_enabled():
+        yield True
+        return
+
+    try:
+        pd.set_option("mode.copy_on_write", True)
+    except KeyError:
+        yield False
+        return
+
+    try:
+        yield True
+    finally:
+        pd.set_option("mode.copy_on_write", False)
+
+
+def read_only_view(value: Any) -> Any:
+    """Create a view of a value that cannot be used to modify the original, without copying its data if possible.
+
+    Numpy arrays are returned as read-only views, i.e., modifying them raises a :code:`ValueError`.
+    Dataframes and series are returned as shallow copies if pandas' copy-on-write mode is active,
+    i.e., the data is only copied once the view is modified, and are copied otherwise.
+    All other values are returned as is.
+
+    :param value: the value
+    :return: a view of the value
+    """
+    if isinstance(value, np.ndarray):
+        view = value.view()
+        view.flags.writeable = False
+        return view
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return value.copy(deep=not copy_on_write_enabled())
+    return value
+
+
+def hash_dataframe(df: pd.DataFrame) -> Optional[str]:
+    """Compute a hash of the content of a dataframe, i.e., its values, index, column names, and dtypes.
+
+    Uses :py:func:`pd.util.hash_pandas_object` to hash the values of each column and the index.
+
+    :param df: the dataframe to hash
+    :return: the hex digest of the content, or None if the dataframe contains unhashable values
+    """
+    digest = hashlib.sha256()
+    digest.update(repr([(col, str(dtype)) for col, dtype in df.dtypes.items()]).encode())
+    digest.update(repr([df.index.names, str(df.index.dtype)]).encode())
+
+    try:
+        digest.update(pd.util.hash_pandas_object(df.index, index=False).to_numpy().tobytes())
+        for i in range(df.shape[1]):
+            digest.update(pd.util.hash_pandas_object(df.iloc[:, i], index=False).to_numpy().tobytes())
+    except TypeError:
+        return None
+
+    return digest.hexdigest()
+
 
 def compare_dataframes(
     df1: pd.DataFrame,
@@ -28,9 +138,11 @@ def compare_dataframes(
     common_columns_only: bool = False,
     ignore_index: bool = False,
     ignore_dtypes: bool = False,
+    ignore_row_order: bool = False,
     atol: float = 1e-8,
     rtol: float = 1e-5,
     check_exact: bool = False,
+    max_report_rows: int = 10,
 ) -> None:
     """Compare two given dataframes.
 
@@ -38,6 +150,23 @@ def compare_dataframes(
 
     Ignores the order of columns in the dataframe.
 
+    Before the detailed comparison, all columns with matching dtypes that can be compared exactly
+    (i.e., numerical, datetime, and string columns) are checked for identical values using vectorized comparisons.
+    If all of them are identical, they are also equal within any tolerance, so only the index
+    and the remaining columns are compared in detail. Otherwise, all columns are compared in detail.
+    Both cases are counted by the counters :code:`compare_dataframes.fast_path`
+    and :code:`compare_dataframes.full_comparison` (see :py:func:`beehyve.utils.counters.get_counters`).
+
+    When ignoring the row order, rows are not sorted lexicographically. Instead, all values that can be compared
+    exactly (including the index, if it is not ignored) are combined into a single hash per row.
+    If there are no other values, the dataframes are equal if each hash occurs equally often in both dataframes,
+    which is checked using order-independent sums of the hashes.
+    Otherwise, e.g., for floats compared with a tolerance, rows are ordered by their hash and the
+    remaining values before comparing them in detail.
+
+    If the dataframes are not equal, the message of pandas' assertion is extended by a report of all
+    mismatching values (see :py:func:`find_mismatches`), whose size is limited by :code:`max_report_rows`.
+
     :param df1: a dataframe
     :param df2: another dataframe
     :param common_columns_only: whether or not to only compare columns present in both dataframes.
@@ -46,9 +175,13 @@ def compare_dataframes(
     :param ignore_index: whether or not to ignore the index of the dataframes
         (using :py:meth:`pd.DataFrame.reset_index`), defaults to False
     :param ignore_dtypes: whether or not to ignore the dtypes when checking the dataframes, defaults to False
+    :param ignore_row_order: whether or not to ignore the order of the rows, i.e., to compare the dataframes
+        as multisets of rows, defaults to False
     :param atol: absolute tolerance when comparing numerical values, defaults to 1e-8
     :param rtol: relative tolerance when comparing numerical values, defaults to 1e-5
     :param check_exact: whether or not to check for exact values, defaults to False
+    :param max_report_rows: the maximum number of mismatching rows and missing index labels
+        shown if the dataframes are not equal, defaults to 10
     """
     assert_kwargs = {}
 
@@ -68,7 +201,228 @@ def compare_dataframes(
     if ignore_dtypes:
         assert_kwargs.update(IGNORE_DF_DTYPE_KWARGS)
 
-    pd.testing.assert_frame_equal(df1, df2, atol=atol, rtol=rtol, check_exact=check_exact, **assert_kwargs)
+    if ignore_row_order:
+        row_order = _get_row_order(df1, df2, ignore_index=ignore_index, check_exact=check_exact)
+
+        if row_order is None:
+            # all values are equal, so only the column names, dtypes and index types still need to be checked
+            pd.testing.assert_frame_equal(df1.iloc[:0], df2.iloc[:0], **assert_kwargs)
+            return
+
+        df1 = _reorder_rows(df1, row_order[0], ignore_index=ignore_index)
+        df2 = _reorder_rows(df2, row_order[1], ignore_index=ignore_index)
+
+    exact_columns = _get_exactly_comparable_columns(df1, df2)
+
+    if exact_columns and _values_equal(df1, df2, exact_columns):
+        increment_counter("compare_dataframes.fast_path")
+
+        pd.testing.assert_index_equal(
+            df1.columns, df2.columns, exact=assert_kwargs.get("check_column_type", "equiv"), obj="DataFrame.columns"
+        )
+
+        remaining_columns = [col for col in columns_to_compare if col not in exact_columns]
+        df1 = df1[remaining_columns]
+        df2 = df2[remaining_columns]
+    else:
+        increment_counter("compare_dataframes.full_comparison")
+
+    _assert_frame_equal_with_report(
+        df1, df2, atol=atol, rtol=rtol, check_exact=check_exact, max_report_rows=max_report_rows, **assert_kwargs
+    )
+
+
+def _assert_frame_equal_with_report(
+    df1: pd.DataFrame,
+    df2: pd.DataFrame,
+    *,
+    atol: float,
+    rtol: float,
+    check_exact: bool,
+    max_report_rows: int,
+    **assert_kwargs: Any,
+) -> None:
+    try:
+        pd.testing.assert_frame_equal(df1, df2, atol=atol, rtol=rtol, check_exact=check_exact, **assert_kwargs)
+    except AssertionError as e:
+        mismatches = find_mismatches(df1, df2, atol=atol, rtol=rtol, check_exact=check_exact, max_rows=max_report_rows)
+        if not mismatches:
+            raise
+        raise AssertionError(f"{e}\n\n{mismatches}") from None
+
+
+def _get_exactly_comparable_columns(df1: pd.DataFrame, df2: pd.DataFrame) -> List[str]:
+    if len(df1) != len(df2) or not df1.columns.is_unique:
+        return []
+
+    return [col for col in df1.columns if _are_exactly_comparable(df1[col], df2[col])]
+
+
+def _are_exactly_comparable(series1: pd.Series, series2: pd.Series) -> bool:
+    return series1.dtype == series2.dtype and _is_exactly_comparable(series1) and _is_exactly_comparable(series2)
+
+
+def _is_exactly_comparable(series: pd.Series) -> bool:
+    if isinstance(series.dtype, np.dtype) and series.dtype.kind in "biufmM":
+        return True
+    # elementwise comparison of objects is only well-defined for columns containing nothing but strings,
+    # extension dtypes (e.g. nullable strings) may contain pd.NA and are left to the full comparison
+    if isinstance(series.dtype, np.dtype) and series.dtype == object:
+        return pd.api.types.infer_dtype(series, skipna=False) == "string"
+    return False
+
+
+def _values_equal(df1: pd.DataFrame, df2: pd.DataFrame, columns: Sequence[str]) -> bool:
+    for col in columns:
+        values1 = df1[col].to_numpy()
+        values2 = df2[col].to_numpy()
+        if not np.array_equal(values1, values2, equal_nan=values1.dtype.kind in "fmM"):
+            return False
+    return True
+
+
+def _get_row_components(data: pd.DataFrame, *, ignore_index: bool) -> List[pd.Series]:
+    if not data.columns.is_unique:
+        raise ValueError("Ignoring the row order requires unique column names")
+
+    components = [data[col] for col in data.columns]
+
+    if not ignore_index:
+        components.extend([pd.Series(data.index.get_level_values(i)) for i in range(data.index.nlevels)])
+
+    return components
+
+
+def _get_row_order(
+    df1: pd.DataFrame,
+    df2: pd.DataFrame,
+    *,
+    ignore_index: bool,
+    check_exact: bool,
+) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+    """Determine an order of rows in which equal rows of both dataframes are at the same position.
+
+    Components (i.e., columns or index levels) that can be compared exactly are combined into a single hash per row.
+    If all components can be compared exactly, the multisets of row hashes are compared,
+    which does not require any sorting. In that case, None is returned if the rows match
+    (e.g., always for dataframes without columns whose index is ignored).
+    Otherwise, rows are ordered by their hash and the values of the remaining components,
+    e.g., floats compared with a tolerance.
+    """
+    if len(df1) != len(df2):
+        raise AssertionError(f"Number of rows do not match. Got {len(df1)} and {len(df2)}")
+
+    components1 = _get_row_components(df1, ignore_index=ignore_index)
+    components2 = _get_row_components(df2, ignore_index=ignore_index)
+
+    key_components = []
+    other_components = []
+    for component1, component2 in zip(components1, components2):
+        if _are_exactly_comparable(component1, component2) and (check_exact or component1.dtype.kind not in "fc"):
+            key_components.append((component1, component2))
+        else:
+            other_components.append((component1, component2))
+
+    hashes1 = _hash_rows([component1 for component1, _ in key_components], len(df1))
+    hashes2 = _hash_rows([component2 for _, component2 in key_components], len(df2))
+
+    if not other_components:
+        _assert_equal_hash_counts(hashes1, hashes2)
+        return None
+
+    sort_keys1 = [hashes1]
+    sort_keys2 = [hashes2]
+    for component1, component2 in other_components:
+        sort_key1, sort_key2 = _get_sort_keys(component1, component2)
+        sort_keys1.append(sort_key1)
+        sort_keys2.append(sort_key2)
+
+    return _get_lexicographic_order(sort_keys1), _get_lexicographic_order(sort_keys2)
+
+
+def _hash_rows(components: Sequence[pd.Series], n_rows: int) -> np.ndarray:
+    hashes = np.zeros(n_rows, dtype=np.uint64)
+    for component in components:
+        component_hashes = pd.util.hash_pandas_object(component, index=False).to_numpy()
+        hashes = (hashes * np.uint64(1000003)) ^ component_hashes
+    return hashes
+
+
+def _assert_equal_hash_counts(hashes1: np.ndarray, hashes2: np.ndarray) -> None:
+    # two sums of (mixed) hashes form a fingerprint of the multiset of rows that can be computed without sorting,
+    # rows are only counted to describe the difference if the fingerprints do not match
+    if _multiset_fingerprint(hashes1) == _multiset_fingerprint(hashes2):
+        return
+
+    count_differences = pd.Series(hashes1).value_counts().sub(pd.Series(hashes2).value_counts(), fill_value=0)
+
+    n_missing_in_2 = int(count_differences[count_differences > 0].sum())
+    n_missing_in_1 = int(-count_differences[count_differences < 0].sum())
+
+    raise AssertionError(
+        f"Rows do not match (ignoring the row order). {n_missing_in_2} row(s) of the first object "
+        f"are missing in the second, {n_missing_in_1} row(s) of the second object are missing in the first."
+    )
+
+
+def _multiset_fingerprint(hashes: np.ndarray) -> Tuple[int, int]:
+    mixed = (hashes ^ (hashes >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    mixed = (mixed ^ (mixed >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    mixed = mixed ^ (mixed >> np.uint64(31))
+    return int(hashes.sum(dtype=np.uint64)), int(mixed.sum(dtype=np.uint64))
+
+
+def _get_sort_keys(series1: pd.Series, series2: pd.Series) -> Tuple[np.ndarray, np.ndarray]:
+    if _is_numeric(series1) and _is_numeric(series2):
+        return _as_sortable(series1), _as_sortable(series2)
+
+    values = pd.concat([series1, series2], ignore_index=True)
+    try:
+        ranks, _ = pd.factorize(values, sort=True)
+    except TypeError:
+        ranks, _ = pd.factorize(values.astype(str), sort=True)
+    n_rows = len(series1)
+    return ranks[:n_rows], ranks[n_rows:]
+
+
+def _get_lexicographic_order(sort_keys: Sequence[np.ndarray]) -> np.ndarray:
+    # equivalent to np.lexsort(sort_keys[::-1]), but the keys are successively combined into
+    # a single key of dense ranks, which only requires sorting single integer arrays
+    combined_key = _get_dense_ranks(sort_keys[0])
+    for i, sort_key in enumerate(sort_keys[1:], start=2):
+        combined_key = combined_key * len(sort_key) + _get_dense_ranks(sort_key)
+        if i < len(sort_keys):
+            combined_key = _get_dense_ranks(combined_key)
+    return np.argsort(combined_key)
+
+
+def _get_dense_ranks(values: np.ndarray) -> np.ndarray:
+    order = np.argsort(values)
+    sorted_values = values[order]
+
+    is_new_value = np.ones(len(values), dtype=bool)
+    is_new_value[1:] = sorted_values[1:] != sorted_values[:-1]
+
+    ranks = np.empty(len(values), dtype=np.int64)
+    ranks[order] = np.cumsum(is_new_value) - 1
+    return ranks
+
+
+def _is_numeric(series: pd.Series) -> bool:
+    return isinstance(series.dtype, np.dtype) and series.dtype.kind in "biufmM"
+
+
+def _as_sortable(series: pd.Series) -> np.ndarray:
+    if series.dtype.kind in "mM":
+        return series.to_numpy().view(np.int64)
+    return series.to_numpy(dtype=np.float64)
+
+
+def _reorder_rows(data: Any, order: np.ndarray, *, ignore_index: bool) -> Any:
+    data = data.iloc[order]
+    if ignore_index:
+        data = data.reset_index(drop=True)
+    return data
 
 
 def _get_common_columns(columns1: Sequence[str], columns2: Sequence[str]) -> Sequence[str]:
@@ -82,6 +436,7 @@ def compare_series(
     ignore_index: bool = False,
     ignore_dtypes: bool = False,
     ignore_names: bool = False,
+    ignore_row_order: bool = False,
     atol: float = 1e-8,
     rtol: float = 1e-5,
     check_exact: bool = False,
@@ -96,6 +451,8 @@ def compare_series(
         (using :py:meth:`pd.Series.reset_index`), defaults to False
     :param ignore_dtypes: whether or not to ignore the dtypes when checking the series, defaults to False
     :param ignore_names: whether to ignore the Series and Index names attribute, defaults to False
+    :param ignore_row_order: whether or not to ignore the order of the values, i.e., to compare the series
+        as multisets of values (see :py:func:`compare_dataframes`), defaults to False
     :param atol: absolute tolerance when comparing numerical values, defaults to 1e-8
     :param rtol: relative tolerance when comparing numerical values, defaults to 1e-5
     :param check_exact: whether or not to check for exact values, defaults to False
@@ -112,4 +469,227 @@ def compare_series(
     if ignore_names:
         assert_kwargs["check_names"] = False
 
+    if ignore_row_order:
+        row_order = _get_row_order(
+            series1.to_frame(name=0), series2.to_frame(name=0), ignore_index=ignore_index, check_exact=check_exact
+        )
+
+        if row_order is None:
+            # all values are equal, so only the names, dtypes and index types still need to be checked
+            pd.testing.assert_series_equal(series1.iloc[:0], series2.iloc[:0], **assert_kwargs)
+            return
+
+        series1 = _reorder_rows(series1, row_order[0], ignore_index=ignore_index)
+        series2 = _reorder_rows(series2, row_order[1], ignore_index=ignore_index)
+
     pd.testing.assert_series_equal(series1, series2, atol=atol, rtol=rtol, check_exact=check_exact, **assert_kwargs)
+
+
+class MismatchReport(NamedTuple):
+    """The mismatching values and rows of two dataframes (see :py:func:`find_mismatches`)."""
+
+    mismatch_counts: Dict[Hashable, int]
+    mismatching_rows: pd.DataFrame
+    n_missing_in_second: int
+    n_missing_in_first: int
+    missing_in_second: List[Hashable]
+    missing_in_first: List[Hashable]
+
+    def __bool__(self) -> bool:
+        """Check whether any mismatches were found."""
+        return bool(self.mismatch_counts) or self.n_missing_in_second > 0 or self.n_missing_in_first > 0
+
+    def __str__(self) -> str:
+        """Format the report as a human-readable message."""
+        lines = []
+
+        if self.n_missing_in_second:
+            lines.append(
+                f"{self.n_missing_in_second} row(s) of the first dataframe are missing in the second, "
+                f"index labels: {_format_labels(self.missing_in_second, self.n_missing_in_second)}"
+            )
+        if self.n_missing_in_first:
+            lines.append(
+                f"{self.n_missing_in_first} row(s) of the second dataframe are missing in the first, "
+                f"index labels: {_format_labels(self.missing_in_first, self.n_missing_in_first)}"
+            )
+
+        if self.mismatch_counts:
+            lines.append("Number of mismatching values per column:")
+            lines.extend([f"    {col}: {count}" for col, count in self.mismatch_counts.items()])
+            lines.append(f"First {len(self.mismatching_rows)} mismatching row(s):")
+            lines.append(self.mismatching_rows.to_string())
+
+        return "\n".join(lines)
+
+
+def find_mismatches(
+    df1: pd.DataFrame,
+    df2: pd.DataFrame,
+    *,
+    atol: float = 1e-8,
+    rtol: float = 1e-5,
+    check_exact: bool = False,
+    max_rows: int = 10,
+) -> MismatchReport:
+    """Find all mismatching values of two dataframes.
+
+    Rows are matched by their index labels if the indices are unique, otherwise by their position.
+    Values of the common columns are compared using vectorized masks, column by column and in chunks of rows,
+    so no aligned copy of the dataframes is created. Missing values are considered equal to each other.
+    The size of the report does not depend on the size of the dataframes:
+    it contains the number of mismatching values per column, but only the first :code:`max_rows`
+    mismatching rows (side by side) and index labels of rows missing on either side.
+
+    :param df1: a dataframe
+    :param df2: another dataframe
+    :param atol: absolute tolerance when comparing numerical values, defaults to 1e-8
+    :param rtol: relative tolerance when comparing numerical values, defaults to 1e-5
+    :param check_exact: whether or not to check for exact values, defaults to False
+    :param max_rows: the maximum number of mismatching rows and missing index labels to report, defaults to 10
+    :return: the report of all mismatches
+    """
+    positions1, positions2, missing_in_second, missing_in_first = _align_rows(df1.index, df2.index)
+    n_rows = len(positions1) if positions1 is not None else min(len(df1), len(df2))
+
+    columns = _get_common_columns(df1.columns, df2.columns) if df1.columns.is_unique and df2.columns.is_unique else []
+    mismatch_counts: Dict[Hashable, int] = dict.fromkeys(columns, 0)
+    mismatching_rows = np.empty(0, dtype=np.int64)
+
+    for start in range(0, n_rows, _MISMATCH_CHUNK_SIZE):
+        stop = min(start + _MISMATCH_CHUNK_SIZE, n_rows)
+        is_mismatch = np.zeros(stop - start, dtype=bool)
+
+        for col in columns:
+            mask = _get_mismatch_mask(
+                _take_rows(df1[col], positions1, start, stop),
+                _take_rows(df2[col], positions2, start, stop),
+                atol=atol,
+                rtol=rtol,
+                check_exact=check_exact,
+            )
+            mismatch_counts[col] += int(mask.sum())
+            is_mismatch |= mask
+
+        if len(mismatching_rows) < max_rows:
+            new_rows = start + np.flatnonzero(is_mismatch)[: max_rows - len(mismatching_rows)]
+            mismatching_rows = np.concatenate([mismatching_rows, new_rows])
+
+    mismatch_counts = {col: count for col, count in mismatch_counts.items() if count > 0}
+
+    return MismatchReport(
+        mismatch_counts=mismatch_counts,
+        mismatching_rows=_get_side_by_side_rows(
+            df1, df2, positions1, positions2, mismatching_rows, list(mismatch_counts)
+        ),
+        n_missing_in_second=int(missing_in_second.sum()),
+        n_missing_in_first=int(missing_in_first.sum()),
+        missing_in_second=df1.index[_get_first_positions(missing_in_second, max_rows)].tolist(),
+        missing_in_first=df2.index[_get_first_positions(missing_in_first, max_rows)].tolist(),
+    )
+
+
+def _align_rows(
+    index1: pd.Index, index2: pd.Index
+) -> Tuple[Optional[np.ndarray], Optional[np.ndarray], np.ndarray, np.ndarray]:
+    # returns the positions of matching rows in both dataframes (None if rows match by their position)
+    # and masks of the rows that are missing in the other dataframe
+    if index1.equals(index2) or not index1.is_unique or not index2.is_unique:
+        n_rows = min(len(index1), len(index2))
+        missing_in_second = np.zeros(len(index1), dtype=bool)
+        missing_in_second[n_rows:] = True
+        missing_in_first = np.zeros(len(index2), dtype=bool)
+        missing_in_first[n_rows:] = True
+        return None, None, missing_in_second, missing_in_first
+
+    indexer = index2.get_indexer(index1)
+    is_found = indexer >= 0
+
+    positions1 = np.flatnonzero(is_found)
+    positions2 = indexer[is_found]
+
+    missing_in_first = np.ones(len(index2), dtype=bool)
+    missing_in_first[positions2] = False
+
+    return positions1, positions2, ~is_found, missing_in_first
+
+
+def _take_rows(series: pd.Series, positions: Optional[np.ndarray], start: int, stop: int) -> pd.Series:
+    if positions is None:
+        return series.iloc[start:stop]
+    return series.iloc[positions[start:stop]]
+
+
+def _get_mismatch_mask(
+    series1: pd.Series, series2: pd.Series, *, atol: float, rtol: float, check_exact: bool
+) -> np.ndarray:
+    is_missing1 = series1.isna().to_numpy()
+    is_missing2 = series2.isna().to_numpy()
+
+    if _is_real(series1) and _is_real(series2):
+        values1 = series1.to_numpy(dtype=np.float64)
+        values2 = series2.to_numpy(dtype=np.float64)
+        if check_exact:
+            is_equal = values1 == values2
+        else:
+            is_equal = np.isclose(values1, values2, atol=atol, rtol=rtol)
+    else:
+        is_equal = _get_equal_mask(series1, series2)
+
+    return ~((is_equal & ~is_missing1 & ~is_missing2) | (is_missing1 & is_missing2))
+
+
+def _is_real(series: pd.Series) -> bool:
+    return isinstance(series.dtype, np.dtype) and series.dtype.kind in "biuf"
+
+
+def _get_equal_mask(series1: pd.Series, series2: pd.Series) -> np.ndarray:
+    values1 = series1.to_numpy()
+    values2 = series2.to_numpy()
+    try:
+        is_equal = np.asarray(values1 == values2, dtype=bool)
+        if is_equal.shape == values1.shape:
+            return is_equal
+    except (TypeError, ValueError):
+        pass
+    # values that cannot be compared elementwise (e.g., missing values of extension types) are compared as strings
+    return series1.astype(str).to_numpy() == series2.astype(str).to_numpy()
+
+
+def _get_first_positions(mask: np.ndarray, n: int) -> np.ndarray:
+    positions = []
+    n_found = 0
+    for start in range(0, len(mask), _MISMATCH_CHUNK_SIZE):
+        if n_found >= n:
+            break
+        stop = start + _MISMATCH_CHUNK_SIZE
+        chunk_positions = start + np.flatnonzero(mask[start:stop])[: n - n_found]
+        positions.append(chunk_positions)
+        n_found += len(chunk_positions)
+    return np.concatenate(positions) if positions else np.empty(0, dtype=np.int64)
+
+
+def _get_side_by_side_rows(
+    df1: pd.DataFrame,
+    df2: pd.DataFrame,
+    positions1: Optional[np.ndarray],
+    positions2: Optional[np.ndarray],
+    rows: np.ndarray,
+    columns: Sequence[Hashable],
+) -> pd.DataFrame:
+    rows1 = positions1[rows] if positions1 is not None else rows
+    rows2 = positions2[rows] if positions2 is not None else rows
+
+    side_by_side = {}
+    for col in columns:
+        side_by_side[(col, "left")] = df1[col].iloc[rows1].to_numpy()
+        side_by_side[(col, "right")] = df2[col].iloc[rows2].to_numpy()
+
+    return pd.DataFrame(side_by_side, index=df1.index[rows1])
+
+
+def _format_labels(labels: Sequence[Hashable], n_total: int) -> str:
+    formatted = ", ".join([repr(label) for label in labels])
+    if n_total > len(labels):
+        formatted += ", ..."
+    return f"[{formatted}]"
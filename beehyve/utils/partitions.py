@@ -0,0 +1,117 @@
+"""Collection of functions to apply a function to the partitions of a large file, i.e., chunks of its rows.
+
+The file is read in chunks (see :py:func:`read_chunks`), the function is called for every chunk, optionally in
+a pool of threads or processes, and the outputs are combined one after another in the order of the chunks
+(see :py:func:`map_chunks`). Only a bounded number of chunks is in flight at a time, so the memory used
+is proportional to the chunk size rather than the size of the file unless the outputs are concatenated.
+"""
+
+import os
+from collections import deque
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Callable, Deque, Iterable, Iterator, Optional
+
+import pandas as pd
+
+from beehyve.utils.files import read_csv_chunks, read_parquet_chunks
+
+DEFAULT_CHUNK_SIZE = 100_000
+EXECUTORS = ("thread", "process")
+
+_CSV_EXTENSIONS = (".csv", ".CSV")
+_PARQUET_EXTENSIONS = (".parquet", ".PARQUET", ".pq")
+
+
+def read_chunks(file_name: str, chunksize: int = DEFAULT_CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+    """Read a CSV or Parquet file in chunks of rows, depending on the extension of the file.
+
+    See :py:func:`read_csv_chunks` and :py:func:`read_parquet_chunks`.
+
+    :param file_name: the path of the file
+    :param chunksize: the maximum number of rows of every chunk, defaults to 100,000
+    :raises ValueError: if the file is neither a CSV nor a Parquet file
+    :return: an iterator of the chunks of the file
+    """
+    if file_name.endswith(_CSV_EXTENSIONS):
+        return read_csv_chunks(file_name, chunksize=chunksize)
+    if file_name.endswith(_PARQUET_EXTENSIONS):
+        return read_parquet_chunks(file_name, chunksize=chunksize)
+    raise ValueError(f"only CSV and Parquet files can be read in chunks, got {file_name}")
+
+
+def map_chunks(
+    func: Callable[[pd.DataFrame], Any],
+    chunks: Iterable[pd.DataFrame],
+    executor: Optional[str] = None,
+    max_workers: Optional[int] = None,
+) -> Iterator[Any]:
+    """Call a function for every chunk, optionally in a pool of threads or processes.
+
+    In a pool, at most twice as many chunks as workers are submitted before the oldest output is yielded,
+    so chunks are read while others are processed without reading the whole file ahead.
+    For a process pool, the function and its arguments need to be picklable (e.g., a module-level function).
+
+    :param func: the function, called with a chunk as its only argument
+    :param chunks: the chunks, e.g., see :py:func:`read_chunks`
+    :param executor: the kind of pool, :code:`thread` or :code:`process`,
+        defaults to None (the chunks are processed one after another in the current thread)
+    :param max_workers: the number of workers of the pool, defaults to None (the number of CPUs)
+    :raises ValueError: if the kind of pool is unknown
+    :yield: the outputs in the order of the chunks
+    """
+    if executor is None:
+        yield from map(func, chunks)
+        return
+    if executor not in EXECUTORS:
+        raise ValueError(f"unknown executor {executor}, use one of {', '.join(EXECUTORS)}")
+
+    max_workers = max_workers or os.cpu_count() or 1
+    pool_class = ThreadPoolExecutor if executor == "thread" else ProcessPoolExecutor
+    with pool_class(max_workers=max_workers) as pool:
+        yield from _map_bounded(pool, func, chunks, max_in_flight=2 * max_workers)
+
+
+def _map_bounded(
+    pool: Executor, func: Callable[[Any], Any], chunks: Iterable[Any], max_in_flight: int
+) -> Iterator[Any]:
+    futures: Deque[Future] = deque()
+    try:
+        for chunk in chunks:
+            futures.append(pool.submit(func, chunk))
+            if len(futures) >= max_in_flight:
+                yield futures.popleft().result()
+        while futures:
+            yield futures.popleft().result()
+    finally:
+        # outputs that are no longer needed, e.g., after a failing chunk, are not computed
+        for future in futures:
+            future.cancel()
+
+
+def concat_outputs(outputs: Iterable[Any]) -> Any:
+    """Concatenate the outputs of all chunks.
+
+    :param outputs: the outputs, dataframes or series are concatenated using :py:func:`pd.concat`
+    :return: the concatenated dataframe or series, a list of the outputs if they are neither,
+        or None if there are no outputs (like :py:func:`reduce_outputs`)
+    """
+    outputs = list(outputs)
+    if not outputs:
+        return None
+    if all([isinstance(output, (pd.DataFrame, pd.Series)) for output in outputs]):
+        return pd.concat(outputs)
+    return outputs
+
+
+def reduce_outputs(outputs: Iterable[Any], combiner: Callable[[Any, Any], Any]) -> Any:
+    """Combine the outputs of all chunks one after another, e.g., to aggregate them.
+
+    :param outputs: the outputs
+    :param combiner: a function combining the combined outputs so far with the next output
+    :return: the combined output, or None if there are no outputs
+    """
+    iterator = iter(outputs)
+    result = next(iterator, None)
+    for output in iterator:
+        result = combiner(result, output)
+    return result
@@ -0,0 +1,184 @@
+"""Collection of functions to create and load an index of the step definitions of beehyve.
+
+When registering a step definition, behave checks that it is not matched by any existing step definition,
+which compiles the regexes of all parse patterns and dominates the time of importing the steps of beehyve.
+The index, created using :code:`create-beehyve-stubs --registry-index <file>`, records the step definitions
+that have been checked already, so only new step definitions are checked once the index is loaded
+(see :py:func:`load_registry_index`). The regexes are then only compiled once a step line is matched.
+
+The index is only used if it is up to date, i.e., if the versions of beehyve, behave, and parse
+as well as the source code of all modules defining steps or types are the same as when the index was created.
+"""
+
+import hashlib
+import importlib.util
+import json
+import string
+import warnings
+from typing import Any, Callable, Dict, Optional, Set, Tuple
+
+import parse
+from behave import __version__ as behave_version
+from behave import step_registry
+from behave.matchers import Match, Matcher, ParseMatcher, get_matcher
+from behave.step_registry import AmbiguousStep, StepRegistry
+
+from beehyve.__version__ import __version__ as beehyve_version
+from beehyve.utils.matching import compile_literal_segments, get_literal_segments
+
+REGISTRY_INDEX_VERSION = 1
+
+_StepKey = Tuple[str, str, str, str]
+
+
+def create_registry_index(registry: Optional[StepRegistry] = None) -> Dict[str, Any]:
+    """Create an index of the step definitions of beehyve registered in a registry.
+
+    :param registry: the step registry, defaults to the global registry of behave
+    :return: the index, containing the step definitions with their custom types and the versions it is valid for
+    """
+    registry = registry or step_registry.registry
+
+    steps = []
+    types = {}
+    for step_type, matchers in registry.steps.items():
+        for matcher in matchers:
+            if not getattr(matcher.func, "__module__", "").startswith("beehyve."):
+                continue
+            steps.append(list(_get_step_key(step_type, matcher.pattern, matcher.func)))
+            types.update(_get_custom_types(matcher))
+
+    modules = sorted({module for _, _, module, _ in steps} | {converter.__module__ for converter in types.values()})
+    converters = {name: f"{converter.__module__}.{converter.__qualname__}" for name, converter in types.items()}
+    return {
+        "index_version": REGISTRY_INDEX_VERSION,
+        "versions": _get_versions(),
+        "modules": {module: _hash_module(module) for module in modules},
+        "types": dict(sorted(converters.items())),
+        "steps": steps,
+    }
+
+
+def write_registry_index(file_name: str, registry: Optional[StepRegistry] = None) -> None:
+    """Write an index of the step definitions of beehyve as JSON.
+
+    :param file_name: the path of the index file
+    :param registry: the step registry, defaults to the global registry of behave
+    """
+    with open(file_name, "w") as f:
+        json.dump(create_registry_index(registry), f, indent=2)
+
+
+def read_registry_index(file_name: str) -> Optional[Dict[str, Any]]:
+    """Read an index of the step definitions of beehyve, if it exists and is up to date.
+
+    :param file_name: the path of the index file
+    :return: the index, or None if it does not exist or is outdated (raising a warning)
+    """
+    try:
+        with open(file_name) as f:
+            index = json.load(f)
+    except FileNotFoundError:
+        warnings.warn(f"registry index {file_name} does not exist, steps are registered without it")
+        return None
+
+    if not is_up_to_date(index):
+        warnings.warn(
+            f"registry index {file_name} is outdated, steps are registered without it "
+            f"(recreate it using create-beehyve-stubs --registry-index {file_name})"
+        )
+        return None
+
+    return index
+
+
+def is_up_to_date(index: Dict[str, Any]) -> bool:
+    """Check whether an index has been created for the current versions and source code of the step modules.
+
+    :param index: the index
+    :return: True if the index can be used, False otherwise
+    """
+    return (
+        index.get("index_version") == REGISTRY_INDEX_VERSION
+        and index.get("versions") == _get_versions()
+        and all([_hash_module(module) == content_hash for module, content_hash in index.get("modules", {}).items()])
+    )
+
+
+def load_registry_index(file_name: str, registry: Optional[StepRegistry] = None) -> bool:
+    """Use an index to register the step definitions of beehyve, to be called before the steps are imported.
+
+    Step definitions contained in the index are not checked against each other,
+    all other checks are prefiltered by the literal text of the patterns before running the full parse.
+
+    :param file_name: the path of the index file
+    :param registry: the step registry, defaults to the global registry of behave
+    :return: True if the index has been loaded, False if it does not exist or is outdated
+    """
+    index = read_registry_index(file_name)
+    if index is None:
+        return False
+
+    registry = registry or step_registry.registry
+    registry.add_step_definition = _IndexedRegistration(registry, index).add_step_definition
+    return True
+
+
+class _IndexedRegistration:
+    def __init__(self, registry: StepRegistry, index: Dict[str, Any]) -> None:
+        self.registry = registry
+        self.steps: Set[_StepKey] = {tuple(step) for step in index["steps"]}  # type: ignore
+        self.indexed_matchers: Set[int] = set()
+
+    def add_step_definition(self, keyword: str, step_text: str, func: Callable) -> None:
+        # same as StepRegistry.add_step_definition, except for the checks skipped or prefiltered using the index
+        step_location = Match.make_location(func)
+        step_type = keyword.lower()
+        is_indexed = _get_step_key(step_type, step_text, func) in self.steps
+
+        step_definitions = self.registry.steps[step_type]
+        for existing in step_definitions:
+            if self.registry.same_step_definition(existing, step_text, step_location):
+                return
+            if is_indexed and id(existing) in self.indexed_matchers:
+                continue
+            if _may_match(existing, step_text) and existing.match(step_text):
+                existing.step_type = step_type
+                raise AmbiguousStep(
+                    f"@{step_type}('{step_text}') has already been defined in\n"
+                    f"  existing step {existing.describe()} at {existing.location}"
+                )
+
+        matcher = get_matcher(func, step_text)
+        step_definitions.append(matcher)
+        if is_indexed:
+            self.indexed_matchers.add(id(matcher))
+
+
+def _get_step_key(step_type: str, pattern: str, func: Callable) -> _StepKey:
+    return step_type, pattern, getattr(func, "__module__", ""), getattr(func, "__qualname__", "")
+
+
+def _may_match(matcher: Matcher, text: str) -> bool:
+    segments = get_literal_segments(matcher)
+    return segments is None or compile_literal_segments(segments).match(text) is not None
+
+
+def _get_custom_types(matcher: Matcher) -> Dict[str, Callable]:
+    if not isinstance(matcher, ParseMatcher):
+        return {}
+    type_names = {format_spec for _, field, format_spec, _ in string.Formatter().parse(matcher.pattern) if field}
+    return {name: converter for name, converter in matcher.custom_types.items() if name in type_names}
+
+
+def _get_versions() -> Dict[str, str]:
+    return {"beehyve": beehyve_version, "behave": behave_version, "parse": parse.__version__}
+
+
+def _hash_module(module: str) -> Optional[str]:
+    # modules are hashed by their source code without importing them
+    spec = importlib.util.find_spec(module)
+    if spec is None or spec.origin is None:
+        return None
+    with open(spec.origin, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
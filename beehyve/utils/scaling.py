@@ -0,0 +1,143 @@
+"""Collection of functions to measure how the runtime of a function grows with the size of its input.
+
+A function is called on inputs of increasing size, which are generated or resampled from an existing input,
+and the growth of its runtime is described by the exponent :code:`k` of a power law :code:`runtime ~ n^k`,
+fitted on a log-log scale. A complexity such as :code:`O(n log n)` is checked by fitting the exponent of the
+runtime divided by the complexity, which should not grow with the size of the input.
+"""
+
+import math
+from typing import Any, Callable, Dict, List, NamedTuple, Sequence
+
+import numpy as np
+import pandas as pd
+
+from beehyve.utils.benchmarking import benchmark
+
+DEFAULT_N_SIZES = 5
+DEFAULT_REPEAT = 3
+DEFAULT_EXPONENT_TOLERANCE = 0.25
+DEFAULT_SEED = 0
+
+COMPLEXITIES: Dict[str, Callable[[int], float]] = {
+    "O(1)": lambda n: 1.0,
+    "O(log n)": lambda n: math.log(n),
+    "O(n)": lambda n: float(n),
+    "O(n log n)": lambda n: n * math.log(n),
+    "O(n^2)": lambda n: float(n) ** 2,
+    "O(n^3)": lambda n: float(n) ** 3,
+}
+
+
+class ScalingMeasurement(NamedTuple):
+    """The runtime of a function for an input of a given size."""
+
+    size: int
+    runtime: float
+
+
+def get_sizes(max_size: int, n_sizes: int = DEFAULT_N_SIZES) -> List[int]:
+    """Get input sizes, halving the size starting from the maximum size.
+
+    :param max_size: the largest size
+    :param n_sizes: the number of sizes, defaults to 5
+    :return: the distinct sizes in increasing order, all of them at least 2
+    """
+    return sorted({max(max_size // 2**i, 2) for i in range(n_sizes)})
+
+
+def resample(value: Any, size: int, seed: int = DEFAULT_SEED) -> Any:
+    """Sample rows of a dataframe, series, or numpy array with replacement.
+
+    :param value: the dataframe, series, or numpy array to sample from
+    :param size: the number of rows to sample
+    :param seed: the seed of the random number generator, defaults to 0
+    :raises TypeError: if the value cannot be resampled
+    :return: the sampled rows
+    """
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return value.sample(n=size, replace=True, random_state=seed)
+    if isinstance(value, np.ndarray):
+        return value[np.random.default_rng(seed).integers(0, len(value), size=size)]
+    raise TypeError(f"only dataframes, series, and numpy arrays can be resampled, got {type(value).__name__}")
+
+
+def measure_scaling(
+    func: Callable[[Any], Any],
+    make_input: Callable[[int], Any],
+    sizes: Sequence[int],
+    repeat: int = DEFAULT_REPEAT,
+) -> List[ScalingMeasurement]:
+    """Measure the runtime of a function for inputs of the given sizes.
+
+    The inputs are created before the measurement and the minimal runtime of the given number of calls is used.
+
+    :param func: the function to measure, called with the input as its only argument
+    :param make_input: a function creating the input of a given size
+    :param sizes: the sizes of the inputs
+    :param repeat: the number of calls for each size, defaults to 3
+    :return: the measurements in the order of the sizes
+    """
+    measurements = []
+    for size in sizes:
+        value = make_input(size)
+        runtime = min(benchmark(lambda: func(value), repeat=repeat))
+        measurements.append(ScalingMeasurement(size, runtime))
+    return measurements
+
+
+def fit_exponent(sizes: Sequence[float], values: Sequence[float]) -> float:
+    """Fit the exponent :code:`k` of a power law :code:`value ~ size^k` using least squares on a log-log scale.
+
+    :param sizes: the sizes, at least two distinct ones
+    :param values: the positive values measured for the sizes
+    :raises ValueError: if the number of sizes and values differ or there are less than two distinct sizes
+    :return: the fitted exponent
+    """
+    if len(sizes) != len(values):
+        raise ValueError(f"got {len(sizes)} sizes but {len(values)} values")
+    if len(set(sizes)) < 2:
+        raise ValueError(f"fitting an exponent requires at least two distinct sizes, got {list(sizes)}")
+
+    log_sizes = [math.log(size) for size in sizes]
+    log_values = [math.log(max(value, 1e-12)) for value in values]
+    mean_size = sum(log_sizes) / len(log_sizes)
+    mean_value = sum(log_values) / len(log_values)
+    covariance = sum([(x - mean_size) * (y - mean_value) for x, y in zip(log_sizes, log_values)])
+    variance = sum([(x - mean_size) ** 2 for x in log_sizes])
+    return covariance / variance
+
+
+def check_complexity(
+    measurements: Sequence[ScalingMeasurement],
+    complexity: str,
+    tolerance: float = DEFAULT_EXPONENT_TOLERANCE,
+) -> None:
+    """Check that the runtime of a function grows at most as fast as a given complexity.
+
+    :param measurements: the measurements of the function, see :py:func:`measure_scaling`
+    :param complexity: the complexity, one of :code:`O(1)`, :code:`O(log n)`, :code:`O(n)`, :code:`O(n log n)`,
+        :code:`O(n^2)`, or :code:`O(n^3)`
+    :param tolerance: the maximum exponent of the runtime divided by the complexity, defaults to 0.25
+    :raises ValueError: if the complexity is unknown or there are less than two distinct sizes
+    :raises AssertionError: if the runtime grows faster than the complexity
+    """
+    if complexity not in COMPLEXITIES:
+        raise ValueError(f"unknown complexity {complexity}, use one of {', '.join(COMPLEXITIES)}")
+
+    sizes = [measurement.size for measurement in measurements]
+    if len(set(sizes)) < 2:
+        raise ValueError(
+            f"checking the complexity requires measurements for at least two distinct sizes, got {sizes}, "
+            "use a larger maximum size"
+        )
+
+    runtimes = [measurement.runtime for measurement in measurements]
+    relative_runtimes = [runtime / COMPLEXITIES[complexity](size) for size, runtime in zip(sizes, runtimes)]
+
+    excess_exponent = fit_exponent(sizes, relative_runtimes)
+    assert excess_exponent <= tolerance, (
+        f"runtime grows faster than {complexity}: the fitted growth exponent is {fit_exponent(sizes, runtimes):.2f}, "
+        f"exceeding the complexity by {excess_exponent:.2f} (tolerance: {tolerance}), "
+        f"measurements: {', '.join([f'{size}: {runtime:.6f} s' for size, runtime in zip(sizes, runtimes)])}"
+    )
@@ -0,0 +1,129 @@
+"""Collection of functions to compare dataframes to golden snapshots stored as Parquet files.
+
+Snapshots are stored content-addressed, i.e., as :code:`<content hash>.parquet`, in a snapshot directory.
+The file :code:`index.json` of the directory maps the names of the snapshots to their content hashes,
+so an unchanged dataframe can be verified by its hash without loading the Parquet file.
+"""
+
+import json
+import os
+from typing import Any, Dict
+
+import pandas as pd
+
+from beehyve.utils.counters import increment_counter
+from beehyve.utils.files import read_parquet
+from beehyve.utils.pandas import compare_dataframes, hash_dataframe
+
+SNAPSHOT_DIR_NAME = "snapshots"
+UPDATE_SNAPSHOTS_ENV_VAR = "BEEHYVE_UPDATE_SNAPSHOTS"
+
+_INDEX_FILE_NAME = "index.json"
+
+
+def is_update_requested() -> bool:
+    """Check whether snapshots should be updated based on the environment variable :code:`BEEHYVE_UPDATE_SNAPSHOTS`.
+
+    :return: True if the environment variable is set to "1", "true", or "yes", False otherwise
+    """
+    return os.environ.get(UPDATE_SNAPSHOTS_ENV_VAR, "").lower() in ("1", "true", "yes")
+
+
+def compare_dataframe_to_snapshot(
+    df: pd.DataFrame,
+    name: str,
+    directory: str,
+    update: bool = False,
+    **compare_kwargs: Any,
+) -> None:
+    """Compare a dataframe to the snapshot with the given name.
+
+    If the content hash of the dataframe matches the hash stored in the index, the snapshot is not loaded.
+    Otherwise, the snapshot is loaded and compared using :py:func:`compare_dataframes`.
+    Both cases are counted by the counters :code:`snapshots.verified_by_hash` and :code:`snapshots.compared`
+    (see :py:func:`beehyve.utils.counters.get_counters`).
+
+    In update mode, missing snapshots and snapshots that do not match the dataframe are (re-)written
+    instead of failing the comparison, which is counted by the counter :code:`snapshots.updated`.
+
+    :param df: the actual dataframe
+    :param name: the name of the snapshot
+    :param directory: the snapshot directory
+    :param update: whether or not to write missing or changed snapshots, defaults to False
+    :param compare_kwargs: keyword arguments passed to :py:func:`compare_dataframes`
+    :raises AssertionError: if the snapshot does not exist or does not match the dataframe (unless updating)
+    """
+    index = _read_index(directory)
+    content_hash = hash_dataframe(df)
+
+    if name in index:
+        if content_hash is not None and index[name] == content_hash:
+            increment_counter("snapshots.verified_by_hash")
+            return
+
+        increment_counter("snapshots.compared")
+        try:
+            compare_dataframes(df, read_parquet(_get_snapshot_path(directory, index[name])), **compare_kwargs)
+            return
+        except AssertionError:
+            if not update:
+                raise
+    elif not update:
+        raise AssertionError(
+            f"snapshot {name} does not exist in {directory}, "
+            f"set the environment variable {UPDATE_SNAPSHOTS_ENV_VAR}=1 to create it"
+        )
+
+    write_snapshot(df, name, directory)
+
+
+def write_snapshot(df: pd.DataFrame, name: str, directory: str) -> str:
+    """Write a dataframe as a zstd-compressed Parquet file and store its hash under the given name in the index.
+
+    Snapshot files no longer referenced by any name are removed.
+
+    :param df: the dataframe to store
+    :param name: the name of the snapshot
+    :param directory: the snapshot directory
+    :return: the content hash of the dataframe, which is also the name of the Parquet file
+    """
+    content_hash = hash_dataframe(df)
+    if content_hash is None:
+        raise ValueError(f"snapshot {name} cannot be written as the dataframe contains unhashable values")
+
+    os.makedirs(directory, exist_ok=True)
+
+    path = _get_snapshot_path(directory, content_hash)
+    if not os.path.exists(path):
+        df.to_parquet(path, engine="pyarrow", compression="zstd")
+
+    index = _read_index(directory)
+    old_hash = index.get(name)
+    index[name] = content_hash
+    _write_index(directory, index)
+
+    if old_hash is not None and old_hash not in index.values():
+        os.remove(_get_snapshot_path(directory, old_hash))
+
+    increment_counter("snapshots.updated")
+    return content_hash
+
+
+def _get_snapshot_path(directory: str, content_hash: str) -> str:
+    return os.path.join(directory, f"{content_hash}.parquet")
+
+
+def _read_index(directory: str) -> Dict[str, str]:
+    path = os.path.join(directory, _INDEX_FILE_NAME)
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def _write_index(directory: str, index: Dict[str, str]) -> None:
+    path = os.path.join(directory, _INDEX_FILE_NAME)
+    with open(path + ".tmp", "w") as f:
+        json.dump(index, f, indent=2, sort_keys=True)
+        f.write("\n")
+    os.replace(path + ".tmp", path)
@@ -0,0 +1,230 @@
+"""Collection of classes to keep the memory used by the variables of a scenario within a budget.
+
+Large dataframes, series, and numpy arrays that have not been used recently are spilled to files in a temporary
+directory once the budget is exceeded and are reloaded transparently once they are used again.
+Dataframes and series are stored in the Arrow IPC format (requiring pyarrow), numpy arrays in the numpy format,
+both are read using memory mapping.
+
+The budget is only enforced between steps (see :py:func:`beehyve.utils.variables.after_step`),
+so values used by a running step, e.g., modified in place, are never spilled while the step holds them.
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterator, MutableMapping, Optional
+
+import numpy as np
+import pandas as pd
+
+from beehyve.utils.counters import increment_counter
+from beehyve.utils.files import import_pyarrow
+from beehyve.utils.instrumentation import get_size
+
+DEFAULT_SPILL_BUDGET = 2 * 1024**3
+DEFAULT_MIN_SPILL_SIZE = 1024**2
+
+_SERIES_COLUMN = "__beehyve_series__"
+_SERIES_NAME_KEY = b"beehyve_series_name"
+
+
+class SpillingVariableStore(MutableMapping[str, Any]):
+    """A mapping of variable names to values keeping the size of the values in memory within a budget.
+
+    Once the budget is exceeded and :py:meth:`enforce_budget` is called, the least recently used values larger than
+    :code:`min_spill_size` are spilled to files in a temporary directory, which is removed by :py:meth:`close`.
+    Spilled values are reloaded when accessed, which is counted by the counters :code:`variables.spilled`
+    and :code:`variables.reloaded` (see :py:func:`beehyve.utils.counters.get_counters`).
+    Values that cannot be stored without changing them, e.g., dataframes with mixed-type object columns,
+    are never spilled.
+    """
+
+    def __init__(
+        self,
+        budget: int = DEFAULT_SPILL_BUDGET,
+        min_spill_size: int = DEFAULT_MIN_SPILL_SIZE,
+        directory: Optional[str] = None,
+    ) -> None:
+        """Initialize an empty store.
+
+        :param budget: the maximum total size of the values kept in memory in bytes, defaults to 2 GiB
+        :param min_spill_size: the minimum size of a value to be spilled in bytes, defaults to 1 MiB
+        :param directory: the directory in which the temporary directory for spilled values is created,
+            defaults to None (the default temporary directory)
+        """
+        self.budget = budget
+        self.min_spill_size = min_spill_size
+        self._parent_directory = directory
+        self._directory: Optional[str] = None
+
+        self._values: "OrderedDict[str, Any]" = OrderedDict()
+        self._sizes: Dict[str, int] = {}
+        self._spilled: Dict[str, str] = {}
+        self._n_files = 0
+        self._lock = threading.RLock()
+
+    @property
+    def memory_size(self) -> int:
+        """The total size of the values kept in memory in bytes."""
+        return sum(self._sizes.values())
+
+    def is_spilled(self, name: str) -> bool:
+        """Check whether a variable is currently spilled to a file.
+
+        :param name: the name of the variable
+        :return: True if the variable is spilled, False otherwise
+        """
+        return name in self._spilled
+
+    def __getitem__(self, name: str) -> Any:
+        """Get the value of a variable, reloading it if it is spilled."""
+        with self._lock:
+            if name in self._spilled:
+                self._reload(name)
+            self._values.move_to_end(name)
+            return self._values[name]
+
+    def __setitem__(self, name: str, value: Any) -> None:
+        """Set the value of a variable, which is kept in memory until the budget is enforced."""
+        with self._lock:
+            self._remove(name)
+            self._values[name] = value
+            self._sizes[name] = get_size(value)
+
+    def __delitem__(self, name: str) -> None:
+        """Remove a variable."""
+        with self._lock:
+            if name not in self:
+                raise KeyError(name)
+            self._remove(name)
+
+    def __contains__(self, name: object) -> bool:
+        """Check whether a variable is stored, without reloading it."""
+        return name in self._values or name in self._spilled
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate over the names of all variables."""
+        return iter([*self._values, *self._spilled])
+
+    def __len__(self) -> int:
+        """Get the number of variables."""
+        return len(self._values) + len(self._spilled)
+
+    def enforce_budget(self) -> None:
+        """Spill the least recently used values until the values kept in memory are within the budget.
+
+        The most recently used value is never spilled. Values that cannot be spilled are skipped.
+        Values must not be spilled while they are used, e.g., modified in place, since the modification would be lost.
+        """
+        with self._lock:
+            keep = next(reversed(self._values), None)
+            for name in list(self._values):
+                if self.memory_size <= self.budget:
+                    return
+                if name != keep and self._sizes[name] >= self.min_spill_size:
+                    self._spill(name)
+
+    def close(self) -> None:
+        """Remove all variables and the files of spilled variables."""
+        with self._lock:
+            self._values.clear()
+            self._sizes.clear()
+            self._spilled.clear()
+            if self._directory is not None:
+                shutil.rmtree(self._directory, ignore_errors=True)
+                self._directory = None
+
+    def _remove(self, name: str) -> None:
+        self._values.pop(name, None)
+        self._sizes.pop(name, None)
+        path = self._spilled.pop(name, None)
+        if path is not None:
+            os.remove(path)
+
+    def _spill(self, name: str) -> None:
+        if self._directory is None:
+            self._directory = tempfile.mkdtemp(prefix="beehyve_spill_", dir=self._parent_directory)
+
+        self._n_files += 1
+        path = _write_value(self._values[name], os.path.join(self._directory, f"{self._n_files}_{name}"))
+        if path is None:
+            return
+
+        del self._values[name]
+        del self._sizes[name]
+        self._spilled[name] = path
+        increment_counter("variables.spilled")
+
+    def _reload(self, name: str) -> None:
+        path = self._spilled.pop(name)
+        value = _read_value(path)
+        # reloaded arrays stay memory-mapped, so their files are only removed by close
+        if not path.endswith(".npy"):
+            os.remove(path)
+
+        self._values[name] = value
+        self._sizes[name] = get_size(value)
+        increment_counter("variables.reloaded")
+
+
+def _write_value(value: Any, path: str) -> Optional[str]:
+    if isinstance(value, np.ndarray):
+        if value.dtype == object:
+            return None
+        np.save(path + ".npy", value, allow_pickle=False)
+        return path + ".npy"
+
+    metadata = {}
+    if isinstance(value, pd.Series):
+        # the name of the series is stored as JSON in the metadata of the table
+        if not isinstance(value.name, (str, int, float, type(None))):
+            return None
+        metadata[_SERIES_NAME_KEY] = json.dumps(value.name)
+        value = value.to_frame(name=_SERIES_COLUMN)
+    elif not isinstance(value, pd.DataFrame):
+        return None
+
+    if not _is_arrow_compatible(value):
+        return None
+
+    pa = import_pyarrow("pyarrow")
+    try:
+        table = pa.Table.from_pandas(value, preserve_index=True)
+    except (pa.ArrowException, TypeError, ValueError):
+        return None
+    table = table.replace_schema_metadata({**(table.schema.metadata or {}), **metadata})
+
+    with pa.OSFile(path + ".arrow", "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+        writer.write_table(table)
+    return path + ".arrow"
+
+
+def _read_value(path: str) -> Any:
+    if path.endswith(".npy"):
+        # the copy-on-write mode keeps modifications in memory, the file is never changed
+        return np.load(path, mmap_mode="c", allow_pickle=False)
+
+    pa = import_pyarrow("pyarrow")
+    with pa.memory_map(path) as source:
+        table = pa.ipc.open_file(source).read_all()
+        df = table.to_pandas()
+
+    metadata = table.schema.metadata or {}
+    if _SERIES_NAME_KEY in metadata:
+        return df[_SERIES_COLUMN].rename(json.loads(metadata[_SERIES_NAME_KEY]))
+    return df
+
+
+def _is_arrow_compatible(df: pd.DataFrame) -> bool:
+    # object columns are only stored if they contain strings, which are restored without changes
+    columns = [df.iloc[:, i] for i in range(df.shape[1])]
+    indexes = [df.index.get_level_values(i) for i in range(df.index.nlevels)]
+    return all(
+        [
+            values.dtype != object or pd.api.types.infer_dtype(values, skipna=True) in ("string", "empty")
+            for values in [*columns, *indexes]
+        ]
+    )
@@ -0,0 +1,171 @@
+"""Collection of functions to check the results of functions that return dataframes in chunks, e.g., generators.
+
+Chunks are consumed one after another and are not kept after they have been checked,
+i.e., the memory used is proportional to the size of a chunk rather than the size of all results.
+Since generators can only be consumed once, every function consumes the chunks it is given.
+"""
+
+import inspect
+import itertools
+from typing import Any, Callable, Iterable, Iterator, Mapping, Optional, Tuple
+
+import pandas as pd
+
+from beehyve.utils.files import DEFAULT_CSV_CHUNK_SIZE, read_csv_chunks
+from beehyve.utils.pandas import compare_dataframes
+
+
+def iterate_chunks(value: Any) -> Iterator[pd.DataFrame]:
+    """Iterate the chunks of a result.
+
+    :param value: an iterable of dataframes (e.g., a generator or a reader returned by :py:func:`pd.read_csv`),
+        a single dataframe is treated as a single chunk
+    :raises ValueError: if the value is a generator that has been consumed already
+    :raises TypeError: if the value is neither a dataframe nor an iterable
+    :return: an iterator of the chunks
+    """
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        return iter([value])
+    if inspect.isgenerator(value) and inspect.getgeneratorstate(value) == inspect.GEN_CLOSED:
+        raise ValueError("the chunks have already been consumed, generators can only be consumed once")
+    if not isinstance(value, Iterable):
+        raise TypeError(f"expected a dataframe or an iterable of dataframes, got {type(value).__name__}")
+    return iter(value)
+
+
+def count_rows(chunks: Any, max_rows: Optional[int] = None) -> Tuple[int, int]:
+    """Count the rows of all chunks.
+
+    :param chunks: the chunks, see :py:func:`iterate_chunks`
+    :param max_rows: the maximum number of rows of every chunk, defaults to None (chunks of any size)
+    :raises AssertionError: if a chunk has more rows than the maximum
+    :return: the number of chunks and the total number of rows
+    """
+    n_chunks, n_rows = 0, 0
+    for chunk in iterate_chunks(chunks):
+        if max_rows is not None and len(chunk) > max_rows:
+            raise AssertionError(f"chunk {n_chunks} has {len(chunk)} rows, more than the maximum of {max_rows}")
+        n_chunks += 1
+        n_rows += len(chunk)
+    return n_chunks, n_rows
+
+
+def check_chunks(chunks: Any, check: Callable[[pd.DataFrame], Any]) -> int:
+    """Check an invariant for every chunk.
+
+    :param chunks: the chunks, see :py:func:`iterate_chunks`
+    :param check: a function called with every chunk, which fails by returning a falsy value
+        (except for None) or by raising an :py:class:`AssertionError`
+    :raises AssertionError: if the check fails for a chunk, the message contains the number of the chunk
+    :return: the number of checked chunks
+    """
+    n_chunks, n_rows = 0, 0
+    for chunk in iterate_chunks(chunks):
+        rows = _format_rows(n_rows, len(chunk))
+        try:
+            result = check(chunk)
+        except AssertionError as e:
+            raise AssertionError(f"chunk {n_chunks} ({rows}) does not satisfy {_get_name(check)}: {e}") from None
+        if result is not None and not result:
+            raise AssertionError(f"chunk {n_chunks} ({rows}) does not satisfy {_get_name(check)}")
+        n_chunks += 1
+        n_rows += len(chunk)
+    return n_chunks
+
+
+def compare_chunks(chunks: Any, df: pd.DataFrame, **compare_kwargs: Any) -> int:
+    """Compare chunks of rows to a dataframe, chunk by chunk.
+
+    Each chunk is compared to the corresponding rows of the dataframe using :py:func:`compare_dataframes`,
+    stopping at the first chunk that does not match.
+
+    :param chunks: the actual chunks, see :py:func:`iterate_chunks`
+    :param df: the expected dataframe
+    :param compare_kwargs: keyword arguments passed to :py:func:`compare_dataframes`,
+        ignoring the row order is not supported
+    :raises ValueError: if the row order should be ignored
+    :raises AssertionError: if a chunk does not match or the number of rows differs
+    :return: the number of compared rows
+    """
+    return _compare_chunks(chunks, iter([df]), "the dataframe", compare_kwargs)
+
+
+def compare_chunks_to_csv(
+    chunks: Any,
+    file_name: str,
+    *,
+    chunksize: int = DEFAULT_CSV_CHUNK_SIZE,
+    read_kwargs: Optional[Mapping[str, Any]] = None,
+    **compare_kwargs: Any,
+) -> int:
+    """Compare chunks of rows to a CSV file without loading the whole file into memory.
+
+    The file is read in chunks as well (see :py:func:`read_csv_chunks`), which do not need to be aligned
+    with the actual chunks and are cast to the dtypes of the first actual chunk where this is lossless.
+    At most one actual and one expected chunk are kept in memory at a time.
+
+    :param chunks: the actual chunks, see :py:func:`iterate_chunks`
+    :param file_name: the path of the CSV file containing the expected rows
+    :param chunksize: the number of rows to read from the file at once, defaults to 100,000
+    :param read_kwargs: keyword arguments passed to :py:func:`pd.read_csv`, defaults to None
+    :param compare_kwargs: keyword arguments passed to :py:func:`compare_dataframes`,
+        ignoring the row order is not supported
+    :raises ValueError: if the row order should be ignored
+    :raises AssertionError: if a chunk does not match or the number of rows differs
+    :return: the number of compared rows
+    """
+    actual_chunks = iterate_chunks(chunks)
+    first = _next_chunk(actual_chunks)
+    dtypes = None
+    if first is not None:
+        actual_chunks = itertools.chain([first], actual_chunks)
+        dtypes = first.dtypes
+    expected = read_csv_chunks(file_name, chunksize=chunksize, read_kwargs=read_kwargs, dtypes=dtypes)
+    return _compare_chunks(actual_chunks, expected, f"CSV file {file_name}", compare_kwargs)
+
+
+def _compare_chunks(
+    chunks: Any, expected_chunks: Iterator[pd.DataFrame], expected_name: str, compare_kwargs: Mapping[str, Any]
+) -> int:
+    if compare_kwargs.get("ignore_row_order"):
+        raise ValueError("ignoring the row order is not supported when comparing chunks")
+
+    actual_chunks = iterate_chunks(chunks)
+    actual, expected = _next_chunk(actual_chunks), _next_chunk(expected_chunks)
+    n_rows = 0
+    while actual is not None and expected is not None:
+        # the chunks are compared on their overlap, the remaining rows are compared to the next chunk
+        n = min(len(actual), len(expected))
+        try:
+            compare_dataframes(actual.iloc[:n], expected.iloc[:n], **compare_kwargs)
+        except AssertionError as e:
+            rows = _format_rows(n_rows, n)
+            raise AssertionError(f"{rows.capitalize()} do not match {expected_name}\n\n{e}") from None
+        n_rows += n
+
+        actual = actual.iloc[n:] if n < len(actual) else _next_chunk(actual_chunks)
+        expected = expected.iloc[n:] if n < len(expected) else _next_chunk(expected_chunks)
+
+    if actual is not None:
+        n_actual = n_rows + len(actual) + sum([len(chunk) for chunk in actual_chunks])
+        raise AssertionError(f"Number of rows do not match. Got {n_actual} and {n_rows} in {expected_name}")
+    if expected is not None:
+        n_expected = n_rows + len(expected) + sum([len(chunk) for chunk in expected_chunks])
+        raise AssertionError(f"Number of rows do not match. Got {n_rows} and {n_expected} in {expected_name}")
+    return n_rows
+
+
+def _next_chunk(chunks: Iterator[pd.DataFrame]) -> Optional[pd.DataFrame]:
+    # empty chunks are skipped, so the loop comparing chunks always makes progress
+    for chunk in chunks:
+        if len(chunk) > 0:
+            return chunk
+    return None
+
+
+def _format_rows(start: int, n: int) -> str:
+    return f"rows {start} to {start + n - 1}"
+
+
+def _get_name(func: Callable) -> str:
+    return getattr(func, "__qualname__", repr(func))
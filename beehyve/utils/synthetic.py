@@ -0,0 +1,196 @@
+"""Collection of functions to generate large synthetic dataframes from a compact schema, e.g., for load tests.
+
+Every column is generated by a single vectorized numpy operation using its own random number generator,
+which is derived from the seed of the dataframe and the position of the column,
+so the same schema, number of rows, and seed always result in the same dataframe.
+
+A column is described by its dtype and optionally
+its distribution (e.g., :code:`normal(100, 15)`), its cardinality (the number of distinct values),
+its null rate (the fraction of missing values), and a reference to a column of another dataframe
+(e.g., :code:`users.user_id`), from which its values are sampled, so the dataframes can be joined.
+"""
+
+import re
+from ast import literal_eval
+from typing import Any, Dict, Mapping, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+DEFAULT_SEED = 0
+DEFAULT_STRING_CARDINALITY = 100
+
+DTYPES = ("int", "float", "str", "category", "bool", "datetime")
+
+DEFAULT_DISTRIBUTIONS = {
+    "int": "uniform(0, 1000000)",
+    "float": "uniform(0, 1)",
+    "str": "uniform",
+    "category": "uniform",
+    "bool": "bernoulli(0.5)",
+    "datetime": "uniform('2020-01-01', '2021-01-01')",
+}
+
+_DISTRIBUTION_PATTERN = re.compile(r"^\s*(\w+)\s*(?:\((.*)\))?\s*$")
+
+
+class ColumnSpec(NamedTuple):
+    """The description of a column of a synthetic dataframe."""
+
+    name: str
+    dtype: str
+    distribution: str = ""
+    params: Tuple[Any, ...] = ()
+    cardinality: Optional[int] = None
+    null_rate: float = 0.0
+    reference: Optional[Tuple[str, str]] = None
+
+
+def parse_column_spec(row: Mapping[str, str]) -> ColumnSpec:
+    """Parse the description of a column from a row of a schema table.
+
+    The row needs to contain the keys :code:`column` and :code:`dtype` (one of :code:`int`, :code:`float`,
+    :code:`str`, :code:`category`, :code:`bool`, or :code:`datetime`) and optionally the keys
+    :code:`distribution`, :code:`cardinality`, :code:`null_rate`, and :code:`references`.
+    Empty values are replaced by the defaults.
+
+    :param row: the row of the schema table
+    :raises ValueError: if the dtype or the distribution cannot be parsed
+    :return: the description of the column
+    """
+    dtype = row["dtype"].strip()
+    if dtype not in DTYPES:
+        raise ValueError(f"unknown dtype {dtype} of column {row['column']}, use one of {', '.join(DTYPES)}")
+
+    distribution = (row.get("distribution") or "").strip() or DEFAULT_DISTRIBUTIONS[dtype]
+    match = _DISTRIBUTION_PATTERN.match(distribution)
+    if match is None:
+        raise ValueError(f"distribution {distribution} of column {row['column']} cannot be parsed")
+    params = literal_eval(f"({match.group(2)},)") if match.group(2) else ()
+
+    cardinality = (row.get("cardinality") or "").strip()
+    null_rate = (row.get("null_rate") or "").strip()
+    reference = (row.get("references") or "").strip()
+
+    return ColumnSpec(
+        name=row["column"].strip(),
+        dtype=dtype,
+        distribution=match.group(1),
+        params=params,
+        cardinality=int(float(cardinality)) if cardinality else None,
+        null_rate=float(null_rate) if null_rate else 0.0,
+        reference=tuple(reference.split(".", 1)) if reference else None,  # type: ignore
+    )
+
+
+def generate_dataframe(
+    columns: Sequence[ColumnSpec],
+    n_rows: int,
+    seed: int = DEFAULT_SEED,
+    references: Optional[Mapping[str, pd.DataFrame]] = None,
+) -> pd.DataFrame:
+    """Generate a dataframe of random values following the given column descriptions.
+
+    Supported distributions are :code:`sequence(start)` (consecutive integers, e.g., unique keys),
+    :code:`uniform(low, high)`, :code:`normal(mean, std)`, :code:`exponential(scale)`,
+    :code:`bernoulli(p)` (for booleans), and :code:`zipf(a)` (skewed values, e.g., for columns with a cardinality).
+    Columns with a cardinality take the values :code:`0` to :code:`cardinality - 1` (prefixed by the column name
+    for strings and categories, which have a cardinality of 100 by default)
+    and are distributed uniformly unless the distribution is :code:`zipf`.
+    Columns with a reference sample their values uniformly from the referenced column.
+
+    :param columns: the descriptions of the columns, see :py:func:`parse_column_spec`
+    :param n_rows: the number of rows
+    :param seed: the seed of the random number generators, defaults to 0
+    :param references: the dataframes referenced by the columns by name, defaults to None
+    :return: the generated dataframe
+    """
+    generators = [np.random.default_rng(child) for child in np.random.SeedSequence(seed).spawn(len(columns))]
+    data: Dict[str, Any] = {}
+    for spec, rng in zip(columns, generators):
+        data[spec.name] = _generate_column(spec, n_rows, rng, references or {})
+    return pd.DataFrame(data)
+
+
+def _generate_column(spec: ColumnSpec, n_rows: int, rng: np.random.Generator, references: Mapping[str, Any]) -> Any:
+    if spec.dtype in ("str", "category") and spec.cardinality is None and spec.reference is None:
+        spec = spec._replace(cardinality=DEFAULT_STRING_CARDINALITY)
+
+    if spec.reference is not None:
+        frame, column = spec.reference
+        if frame not in references:
+            raise KeyError(f"dataframe {frame} referenced by column {spec.name} is not available")
+        referenced = references[frame][column].to_numpy()
+        values = referenced[rng.integers(0, len(referenced), size=n_rows)]
+    elif spec.cardinality is not None:
+        values = _generate_codes(spec, n_rows, rng)
+    else:
+        values = _sample(spec, n_rows, rng)
+
+    column = _convert(spec, values)
+    if spec.null_rate > 0:
+        column = column.mask(rng.random(n_rows) < spec.null_rate)
+    return column
+
+
+def _generate_codes(spec: ColumnSpec, n_rows: int, rng: np.random.Generator) -> np.ndarray:
+    cardinality = spec.cardinality or 1
+    if spec.distribution == "zipf":
+        # a zipf distribution truncated to the cardinality, i.e., small codes are the most frequent
+        (a,) = spec.params or (2.0,)
+        weights = 1.0 / np.arange(1, cardinality + 1) ** a
+        return rng.choice(cardinality, size=n_rows, p=weights / weights.sum())
+    return rng.integers(0, cardinality, size=n_rows)
+
+
+def _sample(spec: ColumnSpec, n_rows: int, rng: np.random.Generator) -> np.ndarray:
+    if spec.distribution == "sequence":
+        (start,) = spec.params or (0,)
+        return np.arange(start, start + n_rows)
+    if spec.distribution == "bernoulli":
+        (p,) = spec.params or (0.5,)
+        return rng.random(n_rows) < p
+    if spec.distribution == "normal":
+        mean, std = spec.params or (0.0, 1.0)
+        return rng.normal(mean, std, size=n_rows)
+    if spec.distribution == "exponential":
+        (scale,) = spec.params or (1.0,)
+        return rng.exponential(scale, size=n_rows)
+    if spec.distribution == "zipf":
+        (a,) = spec.params or (2.0,)
+        return rng.zipf(a, size=n_rows)
+    if spec.distribution == "uniform":
+        return _sample_uniform(spec, n_rows, rng)
+    raise ValueError(f"unknown distribution {spec.distribution} of column {spec.name}")
+
+
+def _sample_uniform(spec: ColumnSpec, n_rows: int, rng: np.random.Generator) -> np.ndarray:
+    if spec.dtype == "datetime":
+        low, high = [np.datetime64(pd.Timestamp(param), "s").astype(np.int64) for param in spec.params]
+        return rng.integers(low, high, size=n_rows).astype("datetime64[s]")
+    low, high = spec.params or (0, 1)
+    if spec.dtype == "int":
+        return rng.integers(low, high, size=n_rows)
+    return rng.uniform(low, high, size=n_rows)
+
+
+def _convert(spec: ColumnSpec, values: np.ndarray) -> pd.Series:
+    if spec.cardinality is not None and spec.reference is None and spec.dtype in ("str", "category"):
+        categories = pd.Index([f"{spec.name}_{code}" for code in range(spec.cardinality)])
+        categorical = pd.Categorical.from_codes(values, categories=categories)
+        if spec.dtype == "category":
+            return pd.Series(categorical)
+        return pd.Series(np.asarray(categories, dtype=object)[values], dtype=object)
+
+    if spec.dtype == "int":
+        # nullable integers keep their dtype if values are masked
+        return pd.Series(values.astype(np.int64), dtype="Int64" if spec.null_rate > 0 else np.int64)
+    if spec.dtype == "float":
+        return pd.Series(values.astype(np.float64))
+    if spec.dtype == "bool":
+        return pd.Series(values.astype(bool), dtype="boolean" if spec.null_rate > 0 else bool)
+    if spec.dtype == "datetime":
+        return pd.Series(values.astype("datetime64[ns]"))
+    if spec.dtype == "category":
+        return pd.Series(pd.Categorical(values))
+    return pd.Series(values.astype(str).astype(object), dtype=object)
@@ -0,0 +1,77 @@
+"""Collection of functions to parse behave tables into pandas objects."""
+
+import hashlib
+from typing import Any, Hashable
+
+import pandas as pd
+from behave.model import Table
+from behave_pandas import table_to_dataframe
+
+from beehyve.utils.cache import CacheStats, LRUCache
+from beehyve.utils.pandas import isolated_copy
+
+DEFAULT_TABLE_CACHE_MAX_ENTRIES = 1024
+
+_MISSING = object()
+
+_table_cache = LRUCache(max_size=DEFAULT_TABLE_CACHE_MAX_ENTRIES)
+
+
+def enable_table_cache(max_entries: int = DEFAULT_TABLE_CACHE_MAX_ENTRIES) -> None:
+    """Enable the process-wide cache for tables parsed by :py:func:`parse_table` (enabled by default).
+
+    Cached dataframes are evicted in least-recently-used order once the given number of entries is exceeded.
+
+    :param max_entries: the maximum number of cached dataframes, defaults to 1024
+    """
+    _table_cache.resize(max_entries)
+
+
+def disable_table_cache() -> None:
+    """Disable the table cache and remove all cached dataframes."""
+    _table_cache.resize(0)
+    _table_cache.clear()
+
+
+def get_table_cache_stats() -> CacheStats:
+    """Get the hit and miss counters as well as the number of entries of the table cache.
+
+    :return: the current statistics of the table cache
+    """
+    return _table_cache.stats()
+
+
+def parse_table(table: Table, **kwargs: Any) -> pd.DataFrame:
+    """Parse a behave table into a dataframe.
+
+    Uses `behave_pandas <https://pypi.org/project/behave-pandas/>`_.
+    Identical tables, e.g., in a *Background* or in scenario outlines, are only parsed once
+    as long as the table cache is enabled (see :py:func:`enable_table_cache`).
+    The cache is keyed on a hash of the headings and cells of the table and the given keyword arguments.
+    Every call returns an isolated copy of the cached dataframe (see :py:func:`isolated_copy`).
+
+    :param table: the table to parse
+    :param kwargs: keyword arguments passed to :py:func:`behave_pandas.table_to_dataframe`, e.g., :code:`column_levels`
+    :return: the parsed dataframe
+    """
+    if not _table_cache.enabled:
+        return table_to_dataframe(table, **kwargs)
+
+    key = _get_table_cache_key(table, kwargs)
+
+    df = _table_cache.get(key, _MISSING)
+    if df is _MISSING:
+        df = table_to_dataframe(table, **kwargs)
+        _table_cache.put(key, df)
+
+    return isolated_copy(df)
+
+
+def _get_table_cache_key(table: Table, kwargs: Any) -> Hashable:
+    digest = hashlib.sha256()
+    for cells in [table.headings, *[row.cells for row in table.rows]]:
+        # cells are separated by the unit separator and rows by the record separator
+        digest.update("\x1f".join(cells).encode())
+        digest.update(b"\x1e")
+    digest.update(repr(sorted(kwargs.items())).encode())
+    return digest.hexdigest()
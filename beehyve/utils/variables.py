@@ -1,11 +1,201 @@
 """Collection of functions to handle variables in the behave context."""
 
+import copy
 import importlib
 import os
-from typing import Any, Optional
+from typing import TYPE_CHECKING, Any, Callable, Dict, Generator, Optional, Set
 
+from behave import fixture, use_fixture
+from behave.matchers import Match, MatchWithError
+from behave.model import Step
 from behave.runner import Context
 
+from beehyve.utils.counters import increment_counter
+from beehyve.utils.lazy import lazy_import
+
+if TYPE_CHECKING:
+    from beehyve.utils.spilling import SpillingVariableStore
+
+pandas_utils = lazy_import("beehyve.utils.pandas")
+spilling = lazy_import("beehyve.utils.spilling")
+
+READ_ONLY_VARS_TAG = "read_only_vars"
+SPILL_VARS_TAG = "spill_vars"
+SHARED_BACKGROUND_TAG = "shared_background"
+
+
+@fixture
+def use_read_only_vars(context: Context) -> Generator[bool, None, None]:
+    """Behave fixture making variables read-only, i.e., :py:func:`get_var` returns views of the stored values.
+
+    Activates pandas' copy-on-write mode (see :py:func:`beehyve.utils.pandas.copy_on_write`),
+    so dataframes and series are not copied unless they are modified.
+
+    :param context: the current context
+    :yield: True if the copy-on-write mode is active, False if dataframes and series are copied instead
+    """
+    with pandas_utils.copy_on_write() as copy_on_write:
+        # attributes of the context are removed again at the end of the scenario
+        context.read_only_vars = True
+        yield copy_on_write
+
+
+@fixture
+def use_spilling_vars(context: Context) -> Generator["SpillingVariableStore", None, None]:
+    """Behave fixture storing variables in a :py:class:`beehyve.utils.spilling.SpillingVariableStore`.
+
+    The budget and the minimum size of spilled variables are configured in bytes using behave's user data,
+    i.e., :code:`-D spill_vars_budget=<bytes>` and :code:`-D spill_vars_min_size=<bytes>`.
+    The budget is enforced after every step by :py:func:`after_step`, which needs to be called by the environment.
+    The files of spilled variables are removed at the end of the scenario.
+
+    :param context: the current context
+    :yield: the store used for the variables
+    """
+    userdata = context.config.userdata
+    store = spilling.SpillingVariableStore(
+        budget=userdata.getint("spill_vars_budget", spilling.DEFAULT_SPILL_BUDGET),
+        min_spill_size=userdata.getint("spill_vars_min_size", spilling.DEFAULT_MIN_SPILL_SIZE),
+    )
+    if "vars" in context:
+        store.update(context.vars)
+    context.vars = store
+    # attributes of the context are removed again at the end of the scenario
+    context.spilling_vars = store
+
+    yield store
+
+    store.close()
+
+
+@fixture
+def use_shared_background(context: Context) -> Generator[None, None, None]:
+    """Behave fixture running the background of a feature only once, sharing the variables it loads.
+
+    The background steps are executed in the first scenario of the feature run by the current process
+    (e.g., the first scenario of a shard when running scenarios in parallel), all later scenarios get views
+    of the variables loaded by them (see :py:func:`get_isolated_view`) and report the background steps as passed
+    without executing them, which is counted by the counter :code:`variables.shared_background_reused`.
+    If a background step fails, the background is executed again in the next scenario.
+    Only variables are shared, so the background must not have other side effects needed by later scenarios.
+    pandas' copy-on-write mode is active for the whole feature and the shared variables are released at its end.
+
+    :param context: the current context, at the layer of the feature
+    """
+    registry = context._runner.step_registry
+    shared_background = _SharedBackground(context, registry.find_match)
+
+    with pandas_utils.copy_on_write():
+        registry.find_match = shared_background.find_match
+        try:
+            yield
+        finally:
+            registry.find_match = shared_background.find_match_without_sharing
+            shared_background.variables = None
+
+
+def before_tag(context: Context, tag: str) -> None:
+    """Handle tags in behave feature files for making variables read-only, spilling them to disk, or sharing them.
+
+    Scenarios whose variables should be protected from modifications, e.g., by functions modifying their inputs,
+    can be tagged using :code:`@read_only_vars`.
+    Scenarios whose variables should be kept within a memory budget can be tagged using :code:`@spill_vars`
+    (see :py:func:`use_spilling_vars`).
+    Features whose background loads expensive variables can be tagged using :code:`@shared_background`
+    to run the background only once (see :py:func:`use_shared_background`).
+
+    :param context: the current context
+    :param tag: the tag to process,
+        only implemented for :code:`tag in ("read_only_vars", "spill_vars", "shared_background")`
+    """
+    if tag == READ_ONLY_VARS_TAG:
+        use_fixture(use_read_only_vars, context)
+    elif tag == SPILL_VARS_TAG:
+        use_fixture(use_spilling_vars, context)
+    elif tag == SHARED_BACKGROUND_TAG:
+        use_fixture(use_shared_background, context)
+
+
+def after_step(context: Context, step: Step) -> None:
+    """Enforce the memory budget of the variables of scenarios tagged using :code:`@spill_vars` after a step.
+
+    Variables are only spilled between steps, so no step loses in-place modifications of the values it holds.
+
+    :param context: the current context
+    :param step: the finished step
+    """
+    if "spilling_vars" in context:
+        context.spilling_vars.enforce_budget()
+
+
+def get_isolated_view(value: Any) -> Any:
+    """Create a view of a shared value, such that modifying the view does not modify the shared value.
+
+    Dataframes, series, and numpy arrays are returned as views (see :py:func:`beehyve.utils.pandas.read_only_view`),
+    all other values are deep copies, or the values themselves if they cannot be copied (e.g., modules).
+
+    :param value: the shared value
+    :return: a view of the value
+    """
+    view = pandas_utils.read_only_view(value)
+    if view is not value:
+        return view
+
+    try:
+        return copy.deepcopy(value)
+    except (TypeError, copy.Error):
+        return value
+
+
+class _SharedBackground:
+    def __init__(self, context: Context, find_match: Callable[[Step], Optional[Match]]) -> None:
+        self.context = context
+        self.find_match_without_sharing = find_match
+        self.variables: Optional[Dict[str, Any]] = None
+        self.existing_names: Set[str] = set()
+
+    def find_match(self, step: Step) -> Optional[Match]:
+        # wraps the functions of the matched background steps to share or restore the variables
+        match = self.find_match_without_sharing(step)
+        if match is None or isinstance(match, MatchWithError) or "scenario" not in self.context:
+            return match
+
+        background_steps = self.context.scenario.background_steps
+        if not any([step is background_step for background_step in background_steps]):
+            return match
+
+        if self.variables is not None:
+            match.func = self._restore_variables if step is background_steps[0] else _skip_step
+        else:
+            match.func = self._wrap_step(match.func, step is background_steps[0], step is background_steps[-1])
+        return match
+
+    def _wrap_step(self, func: Callable, is_first: bool, is_last: bool) -> Callable:
+        def run_step(context: Context, *args: Any, **kwargs: Any) -> None:
+            if is_first:
+                self.existing_names = set(context.vars) if "vars" in context else set()
+            func(context, *args, **kwargs)
+            if is_last:
+                self._share_variables(context)
+
+        return run_step
+
+    def _share_variables(self, context: Context) -> None:
+        # the first scenario uses views as well, so it cannot modify the shared variables
+        names = [name for name in context.vars if name not in self.existing_names] if "vars" in context else []
+        self.variables = {name: context.vars[name] for name in names}
+        for name, value in self.variables.items():
+            context.vars[name] = get_isolated_view(value)
+
+    def _restore_variables(self, context: Context, *args: Any, **kwargs: Any) -> None:
+        for name, value in (self.variables or {}).items():
+            add_var(context, name, get_isolated_view(value))
+        increment_counter("variables.shared_background_reused")
+
+
+def _skip_step(context: Context, *args: Any, **kwargs: Any) -> None:
+    pass
+
 
 def add_var(context: Context, name: str, val: Any) -> None:
     """Add a variable to the context, making it available in future steps.
@@ -26,6 +216,9 @@ def add_var(context: Context, name: str, val: Any) -> None:
 def get_var(context: Context, name: str) -> Any:
     """Get a value from a variable stored in the context.
 
+    If variables are read-only (see :py:func:`before_tag`), a view of the value is returned
+    (see :py:func:`beehyve.utils.pandas.read_only_view`).
+
     :param context: the current context
     :param name: the name of the variable to get
     :return: the value of the variable
@@ -33,6 +226,8 @@ def get_var(context: Context, name: str) -> Any:
     if "vars" not in context or name not in context.vars:
         raise KeyError(f"variable {name} has not been set")
 
+    if "read_only_vars" in context:
+        return pandas_utils.read_only_view(context.vars[name])
     return context.vars[name]
 
 
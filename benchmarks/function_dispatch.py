@@ -0,0 +1,49 @@
+"""Micro-benchmark of the per-call dispatch overhead of the steps executing functions.
+
+Measures how long :py:func:`beehyve.utils.functions.execute_function` and
+:py:func:`beehyve.utils.functions.execute_function_from_context` take per call
+compared to calling the function directly. Run using :code:`python -m benchmarks.function_dispatch`.
+"""
+
+import timeit
+from typing import Any, Optional
+
+from behave.runner import Context
+
+from beehyve.utils.functions import execute_function, execute_function_from_context
+from beehyve.utils.variables import add_var
+
+N_CALLS = 100_000
+
+
+def target(a: Any, b: Any, c: Any = None, *, d: Any, e: Optional[Any] = None) -> None:
+    """Do nothing, the function called in the benchmark."""
+
+
+class _Runner:
+    config = None
+
+
+def main() -> None:
+    """Run the benchmark and print the time per call."""
+    context = Context(_Runner())
+    for name in ("a", "b", "c", "d"):
+        add_var(context, name, name)
+
+    timings = {
+        "direct call": lambda: target("a", "b", "c", d="d"),
+        "execute_function": lambda: execute_function(
+            context=context, func_name="target", module=__name__, args=["a", "b", "c"], kwargs={"d": "d"}
+        ),
+        "execute_function_from_context": lambda: execute_function_from_context(
+            context=context, func_name="target", module=__name__
+        ),
+    }
+
+    for name, func in timings.items():
+        seconds = min(timeit.repeat(func, number=N_CALLS, repeat=5))
+        print(f"{name:>30}: {seconds / N_CALLS * 1e6:6.2f} µs per call")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Micro-benchmark of resolving step lines to the step definitions of beehyve.
+
+Measures how long behave's :code:`StepRegistry.find_match` and :py:meth:`beehyve.utils.matching.StepIndex.find_match`
+take per step line for all step lines of the feature files in :code:`features`,
+and checks that both resolve every step line to the same step definition and arguments.
+Run using :code:`python -m benchmarks.step_matching`.
+"""
+
+import glob
+import timeit
+from typing import Any, List, Optional, Tuple
+
+from behave.matchers import Match
+from behave.model import Step
+from behave.parser import parse_file
+from behave.step_registry import StepRegistry, registry
+
+from beehyve.steps.all_steps import *  # noqa: F401,F403
+from beehyve.utils.matching import StepIndex
+
+FEATURE_FILES = "features/*.feature"
+
+
+def load_steps() -> List[Step]:
+    """Load all step lines of the feature files, including backgrounds and expanded scenario outlines."""
+    steps = []
+    for file_name in sorted(glob.glob(FEATURE_FILES)):
+        feature = parse_file(file_name)
+        for scenario in feature.walk_scenarios():
+            steps.extend(scenario.all_steps)
+    return steps
+
+
+def main() -> None:
+    """Check the index and print the time per step line."""
+    steps = load_steps()
+    index = StepIndex(registry)
+
+    for step in steps:
+        expected, actual = StepRegistry.find_match(registry, step), index.find_match(step)
+        assert _describe(expected) == _describe(actual), f"step line resolved differently: {step.name}"
+
+    timings = {
+        "StepRegistry.find_match": lambda: [StepRegistry.find_match(registry, step) for step in steps],
+        "StepIndex.find_match": lambda: [index.find_match(step) for step in steps],
+    }
+
+    print(f"{len(steps)} step lines, {sum([len(matchers) for matchers in registry.steps.values()])} step definitions")
+    for name, func in timings.items():
+        seconds = min(timeit.repeat(func, number=10, repeat=5)) / 10
+        print(f"{name:>30}: {seconds / len(steps) * 1e6:6.2f} µs per step line")
+
+
+def _describe(match: Optional[Match]) -> Optional[Tuple[Any, ...]]:
+    if match is None:
+        return None
+    return match.func, [(arg.start, arg.end, arg.name, repr(arg.value)) for arg in match.arguments]
+
+
+if __name__ == "__main__":
+    main()
@@ -2,21 +2,99 @@
 # flake8: noqa
 
 import os
+import shutil
+import tempfile
 
 from behave.runner import Context
 
-from beehyve.utils import monkeypatch
+from beehyve.utils import (
+    files,
+    functions,
+    instrumentation,
+    matching,
+    monkeypatch,
+    tables,
+    variables,
+)
+from beehyve.utils.variables import add_var, get_var
+
+CHUNKS_OUTPUT_FILE = "features/chunks_output.parquet"
+# generous, so that slow or busy machines (e.g., CI runners) do not fail, override using -D import_time_budget=<s>
+DEFAULT_IMPORT_TIME_BUDGET = "2.0"
+
+
+def before_all(context: Context):
+    matching.before_all(context)
+
+
+def before_scenario(context: Context, scenario):
+    instrumentation.before_scenario(context, scenario)
+
+
+def after_scenario(context: Context, scenario):
+    instrumentation.after_scenario(context, scenario)
+
+
+def before_step(context: Context, step):
+    instrumentation.before_step(context, step)
+
+
+def after_step(context: Context, step):
+    instrumentation.after_step(context, step)
+    variables.after_step(context, step)
 
 
 def before_tag(context: Context, tag: str):
     if tag == "dummy_env":
         os.environ["ENV_A"] = "1"
         os.environ["ENV_B"] = "abc"
+    elif tag == "csv_cache":
+        files.enable_csv_cache()
+    elif tag == "table_cache":
+        # start with an empty cache to count hits and misses of the scenario only
+        tables.disable_table_cache()
+        tables.enable_table_cache()
+    elif tag == "function_cache":
+        functions.enable_function_cache()
+    elif tag == "instrumentation":
+        instrumentation.reset_instrumentation()
+    elif tag == "tmp_dir":
+        add_var(context, "tmp_dir", tempfile.mkdtemp())
+    elif tag == "small_spill_budget":
+        # spill every dataframe, series, and array except the most recently used one
+        context.config.userdata.update(spill_vars_budget="1", spill_vars_min_size="1")
+    elif tag == "rss_sampling":
+        context.config.userdata["rss_sampling_interval"] = "0.001"
+    elif tag == "import_time_budget":
+        budget = context.config.userdata.get("import_time_budget", DEFAULT_IMPORT_TIME_BUDGET)
+        add_var(context, "budget", float(budget))
+    elif tag == "benchmark_history":
+        # requires the tag tmp_dir
+        add_var(context, "history_file", os.path.join(get_var(context, "tmp_dir"), "history.jsonl"))
+        context.config.userdata["benchmark_history"] = get_var(context, "history_file")
     else:
         monkeypatch.before_tag(context, tag)
+        functions.before_tag(context, tag)
+        variables.before_tag(context, tag)
 
 
-def after_tag(_context: Context, tag: str):
+def after_tag(context: Context, tag: str):
     if tag == "dummy_env":
         del os.environ["ENV_A"]
         del os.environ["ENV_B"]
+    elif tag == "csv_cache":
+        files.disable_csv_cache()
+    elif tag == "function_cache":
+        functions.disable_function_cache()
+    elif tag == "tmp_dir":
+        shutil.rmtree(get_var(context, "tmp_dir"))
+    elif tag == "small_spill_budget":
+        del context.config.userdata["spill_vars_budget"]
+        del context.config.userdata["spill_vars_min_size"]
+    elif tag == "benchmark_history":
+        del context.config.userdata["benchmark_history"]
+    elif tag == "rss_sampling":
+        del context.config.userdata["rss_sampling_interval"]
+    elif tag == "chunks_output":
+        # the output file written by the scenario
+        os.remove(CHUNKS_OUTPUT_FILE)
@@ -1,7 +1,24 @@
 # flake8: noqa
 
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import time
+import tracemalloc
+
 import pandas as pd
 
+from beehyve.utils.counters import get_counters
+from beehyve.utils.event_loop import run_awaitable
+from beehyve.utils.files import compare_dataframe_to_csv
+from beehyve.utils.functions import call_detecting_mutations
+from beehyve.utils.memory import measure_memory
+from beehyve.utils.pandas import compare_dataframes
+from beehyve.utils.scaling import ScalingMeasurement, check_complexity
+from beehyve.utils.streaming import compare_chunks
+
 SOME_CONSTANT = "abcdef"
 
 ANOTHER_CONSTANT = "tuvxyz"
@@ -19,12 +36,218 @@ class AnotherObject:
         return 987654
 
 
+class Box:
+    def __init__(self, value):
+        self.value = value
+
+
+def create_box(value):
+    return Box(value)
+
+
+def get_box_value(box):
+    return box.value
+
+
+def set_box_value(box, value):
+    box.value = value
+
+
 def add_2_to_dataframe(df, col):
     df = df.copy()
     df[col] = df[col] + 2
     return df
 
 
+def add_2_to_dataframe_inplace(df, col):
+    df[col] += 2
+
+
+def get_mutation_error(df, col):
+    try:
+        call_detecting_mutations(add_2_to_dataframe_inplace, [df, col], {})
+    except AssertionError as e:
+        return str(e)
+
+
+def is_writeable(arr):
+    return arr.flags.writeable
+
+
+_N_CALLS = {}
+
+
+def count_calls(name):
+    _N_CALLS[name] = _N_CALLS.get(name, 0) + 1
+    return _N_CALLS[name]
+
+
+def record_call(name):
+    count_calls(name)
+
+
+def count_reused_backgrounds():
+    return get_counters().get("variables.shared_background_reused", 0)
+
+
+def check_background_reuse(n_reused_before):
+    # the background is executed in the first scenario run by this process and reused by all later ones
+    n_scenarios = count_calls("shared_background_scenarios")
+    return count_reused_backgrounds() - n_reused_before == n_scenarios - 1
+
+
+async def async_add(a, b):
+    await asyncio.sleep(0)
+    return a + b
+
+
+async def async_sleep(seconds):
+    await asyncio.sleep(seconds)
+    return seconds
+
+
+async def async_count(n):
+    for i in range(n):
+        await asyncio.sleep(0)
+        yield i
+
+
+async def get_running_loop_id():
+    return id(asyncio.get_running_loop())
+
+
+_EVENTS = {}
+
+
+async def wait_for_partner(own, partner):
+    # only completes if the partner is awaited concurrently
+    _EVENTS.setdefault(own, asyncio.Event()).set()
+    await asyncio.wait_for(_EVENTS.setdefault(partner, asyncio.Event()).wait(), 1)
+    return own
+
+
+def get_timeout_error(seconds, timeout):
+    try:
+        run_awaitable(async_sleep(seconds), timeout)
+    except AssertionError as e:
+        return str(e)
+
+
+def sync_sleep(seconds):
+    time.sleep(seconds)
+    return seconds
+
+
+def get_sync_timeout_error(seconds, timeout):
+    try:
+        call_detecting_mutations(sync_sleep, [seconds], {}, timeout)
+    except AssertionError as e:
+        return str(e).split(",")[0]
+
+
+def create_large_df(n_rows):
+    return pd.DataFrame({"col_a": range(n_rows), "col_b": [0.5] * n_rows})
+
+
+def describe_synthetic(df):
+    return {"n_rows": len(df), "dtypes": [str(dtype) for dtype in df.dtypes]}
+
+
+def count_missing_references(df, column, referenced_df, referenced_column):
+    return int((~df[column].isin(referenced_df[referenced_column])).sum())
+
+
+def iterate_in_chunks(df, chunk_size):
+    for start in range(0, len(df), chunk_size):
+        yield df.iloc[start : start + chunk_size]
+
+
+def has_no_missing_values(chunk):
+    return not chunk.isna().any().any()
+
+
+def get_chunk_comparison_error(chunks, df):
+    try:
+        compare_chunks(chunks, df)
+    except AssertionError as e:
+        return str(e).splitlines()[0]
+
+
+def get_csv_comparison_error(df, file_name, chunksize, ignore_dtypes=False):
+    try:
+        compare_dataframe_to_csv(df, file_name, chunksize=chunksize, ignore_dtypes=ignore_dtypes)
+    except AssertionError as e:
+        return str(e).splitlines()[0]
+
+
+def create_df_without_columns(n_rows):
+    return pd.DataFrame(index=range(n_rows))
+
+
+def create_nullable_string_df(*values):
+    return pd.DataFrame({"s": pd.array(values, dtype="string")})
+
+
+def get_comparison_error(df1, df2):
+    try:
+        compare_dataframes(df1, df2)
+    except AssertionError as e:
+        return str(e).splitlines()[0]
+
+
+def get_row_order_comparison_error(df1, df2):
+    try:
+        compare_dataframes(df1, df2, ignore_index=True, ignore_row_order=True)
+    except AssertionError as e:
+        return str(e).splitlines()[0]
+
+
+def double_values(chunk):
+    return chunk[["val1", "val2"]] * 2
+
+
+def scale_values(factor, chunk):
+    return chunk[["val1", "val2"]] * factor
+
+
+def count_values(*, chunk):
+    return {"rows": len(chunk), "val1": int(chunk["val1"].sum())}
+
+
+def add_counts(counts1, counts2):
+    return {key: counts1[key] + counts2[key] for key in counts1}
+
+
+def increment_in_place(*dfs):
+    for df in dfs:
+        for col in df.columns:
+            df[col] = df[col] + 1
+
+
+def sum_columns(df):
+    return df.sum()
+
+
+def count_smaller_pairs(df):
+    values = df["col_a"].tolist()
+    return sum([1 for a in values for b in values if a < b])
+
+
+def fails_complexity(measurements, complexity):
+    try:
+        check_complexity([ScalingMeasurement(**record) for record in measurements], complexity)
+    except AssertionError:
+        return True
+    return False
+
+
+def get_complexity_check_error(measurements, complexity):
+    try:
+        check_complexity([ScalingMeasurement(**record) for record in measurements], complexity)
+    except ValueError as e:
+        return str(e)
+
+
 def create_new_df(fill_val=0):
     return pd.DataFrame({col: [fill_val for _ in range(3)] for col in ("col_a", "col_b", "col_c")})
 
@@ -81,3 +304,88 @@ def return_abc():
 
 def get_some_property_from_some_object():
     return SomeObject().some_property
+
+
+_MEASURE_IMPORT_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+import {module_name}
+duration = time.perf_counter() - start
+loaded = [name for name in {heavy_modules!r} if type(sys.modules.get(name)).__name__ not in ("NoneType", "_LazyModule")]
+print(json.dumps([duration, loaded]))
+"""
+
+
+def measure_import(module_name, heavy_modules, budget=None, repeat=3):
+    # every import is measured in a fresh interpreter, the fastest run is compared to the budget (in seconds)
+    script = _MEASURE_IMPORT_SCRIPT.format(module_name=module_name, heavy_modules=list(heavy_modules))
+    cwd = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    runs = [
+        json.loads(subprocess.run([sys.executable, "-c", script], cwd=cwd, capture_output=True, check=True).stdout)
+        for _ in range(repeat)
+    ]
+    duration = min([run[0] for run in runs])
+    within_budget = duration <= budget if budget is not None else None
+    return within_budget, sorted(set().union(*[run[1] for run in runs]))
+
+
+_IMPORT_STEPS_SCRIPT = """
+import json, sys
+from behave.step_registry import registry
+from beehyve.utils.registry_index import load_registry_index
+loaded = len(sys.argv) > 1 and load_registry_index(sys.argv[1])
+import beehyve.steps.all_steps
+matchers = [matcher for matchers in registry.steps.values() for matcher in matchers]
+n_compiled = len([matcher for matcher in matchers if matcher.parser._Parser__match_re is not None])
+print(json.dumps([loaded, [matcher.pattern for matcher in matchers], n_compiled]))
+"""
+
+
+def import_steps_with_registry_index(directory):
+    # the index is created using the script and the steps are imported with and without it in fresh interpreters
+    cwd = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    file_name = os.path.join(directory, "registry_index.json")
+    create_stubs = "from beehyve.create_beehyve_step_stubs import main; main()"
+    stubs_file_name = os.path.join(directory, "stubs")
+    subprocess.run([sys.executable, "-c", create_stubs, "-o", stubs_file_name, "-r", file_name], cwd=cwd, check=True)
+
+    def import_steps(*args):
+        result = subprocess.run(
+            [sys.executable, "-c", _IMPORT_STEPS_SCRIPT, *args], cwd=cwd, capture_output=True, check=True
+        )
+        return json.loads(result.stdout)
+
+    loaded, patterns, n_compiled = import_steps(file_name)
+    _, expected_patterns, _ = import_steps()
+    return loaded, patterns == expected_patterns, n_compiled
+
+
+def get_shard_statuses(results):
+    return [
+        (exit_code, [element["status"] for feature in report for element in feature["elements"]])
+        for exit_code, report, _ in results
+    ]
+
+
+def get_report_statuses(report):
+    return {element["location"]: element["status"] for feature in report for element in feature["elements"]}
+
+
+def measure_memory_without_reset_peak(n_bytes):
+    # simulates python < 3.9, whose tracemalloc cannot reset the peak
+    reset_peak = tracemalloc.reset_peak
+    del tracemalloc.reset_peak
+    tracemalloc.start()
+    try:
+        block = bytearray(n_bytes)
+        del block
+        _, usage = measure_memory(lambda: None)
+    finally:
+        tracemalloc.stop()
+        tracemalloc.reset_peak = reset_peak
+    return usage.peak
+
+
+def read_json(file_name):
+    with open(file_name) as f:
+        return json.load(f)
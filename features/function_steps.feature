@@ -223,4 +223,205 @@ Feature: Call functions using BeeHyve
             | g     | 1   |
             | h     | 2   |
             | i     | 3   |
-        When features.example_functions.do_nothing_w_input(not_a, not_b, a, b, c, d=g, e=h, f=i) is called
\ No newline at end of file
+        When features.example_functions.do_nothing_w_input(not_a, not_b, a, b, c, d=g, e=h, f=i) is called
+
+    @function_cache
+    Scenario: Call the same function with identical inputs using the function cache
+        Given the following table is loaded into dataframe df
+            | int  | float | str  |
+            | val1 | val2  | val3 |
+            | 1    | 1.23  | text |
+            | 5    | -4.5  | ABC  |
+        And the following variables are loaded
+            | var | val    |
+            | col | "val1" |
+        When df2 <- features.example_functions.add_2_to_dataframe()
+        And df3 <- features.example_functions.add_2_to_dataframe(df, col)
+        And features.example_functions.add_2_to_dataframe_inplace(df2, col) is called
+        And stats <- beehyve.utils.functions.get_function_cache_stats()
+        And hits <- stats[0]
+        And misses <- stats[1]
+        Then hits equals 1
+        And misses equals 2
+        And dataframe df3 is equal to
+            | int  | float | str  |
+            | val1 | val2  | val3 |
+            | 3    | 1.23  | text |
+            | 7    | -4.5  | ABC  |
+
+    @function_cache
+    Scenario: The function cache detects modified objects and does not skip functions without results
+        Given value <- 1
+        And other_value <- 2
+        And name <- "function_cache_side_effects"
+        When box <- features.example_functions.create_box(value)
+        And first_value <- features.example_functions.get_box_value(box)
+        And features.example_functions.set_box_value(box, other_value) is called
+        And second_value <- features.example_functions.get_box_value(box)
+        And features.example_functions.record_call(name) is called
+        And features.example_functions.record_call(name) is called
+        And n_calls <- features.example_functions.count_calls(name)
+        Then first_value equals 1
+        And second_value equals 2
+        And n_calls equals 3
+
+    @function_cache @no_function_cache
+    Scenario: Opt out of the function cache
+        Given the following table is loaded into dataframe df
+            | int  | float | str  |
+            | val1 | val2  | val3 |
+            | 1    | 1.23  | text |
+        And the following variables are loaded
+            | var | val    |
+            | col | "val1" |
+        When df2 <- features.example_functions.add_2_to_dataframe()
+        And df3 <- features.example_functions.add_2_to_dataframe(df, col)
+        And stats <- beehyve.utils.functions.get_function_cache_stats()
+        And hits <- stats[0]
+        And misses <- stats[1]
+        Then hits equals 0
+        And misses equals 0
+
+    @read_only_vars
+    Scenario: Functions modifying their inputs do not affect read-only variables
+        Given the following table is loaded into dataframe df
+            | int  | float | str  |
+            | val1 | val2  | val3 |
+            | 1    | 1.23  | text |
+            | 5    | -4.5  | ABC  |
+        And the following variables are loaded
+            | var | val    |
+            | col | "val1" |
+        When features.example_functions.add_2_to_dataframe_inplace(df, col) is called
+        Then dataframe df is equal to
+            | int  | float | str  |
+            | val1 | val2  | val3 |
+            | 1    | 1.23  | text |
+            | 5    | -4.5  | ABC  |
+
+    @read_only_vars
+    Scenario: Arrays are passed to functions as read-only views
+        Given n <- 3
+        When arr <- numpy.arange(n)
+        And writeable <- features.example_functions.is_writeable(arr)
+        Then writeable equals False
+
+    @detect_mutations
+    Scenario: Call a function not modifying its inputs while detecting mutations
+        Given the following table is loaded into dataframe df
+            | int  | float | str  |
+            | val1 | val2  | val3 |
+            | 1    | 1.23  | text |
+        And the following variables are loaded
+            | var | val    |
+            | col | "val1" |
+        When df2 <- features.example_functions.add_2_to_dataframe(df, col)
+        Then dataframe df2 is equal to
+            | int  | float | str  |
+            | val1 | val2  | val3 |
+            | 3    | 1.23  | text |
+
+    Scenario: Report the arguments modified by a function
+        Given the following table is loaded into dataframe df
+            | int  | float | str  |
+            | val1 | val2  | val3 |
+            | 1    | 1.23  | text |
+        And the following variables are loaded
+            | var | val    |
+            | col | "val1" |
+        When message <- features.example_functions.get_mutation_error(df, col)
+        Then message equals "function add_2_to_dataframe_inplace modified its arguments: df"
+
+    Scenario: Call async functions
+        Given a <- 1
+        And b <- 2
+        When c <- features.example_functions.async_add(a, b)
+        And loop_id_1 <- features.example_functions.get_running_loop_id()
+        And loop_id_2 <- features.example_functions.get_running_loop_id()
+        And same_loop <- operator.eq(loop_id_1, loop_id_2)
+        Then c equals 3
+        And same_loop equals True
+
+    Scenario: Call an async function within a timeout
+        Given seconds <- 0.01
+        When result <- features.example_functions.async_sleep(seconds) within 5 seconds
+        Then result equals 0.01
+
+    Scenario: Async functions exceeding the timeout fail
+        Given seconds <- 5
+        And timeout <- 0.01
+        When message <- features.example_functions.get_timeout_error(seconds, timeout)
+        Then message equals "async_sleep did not complete within 0.01 seconds"
+
+    Scenario: Call a sync function within a timeout
+        Given seconds <- 0.01
+        When result <- features.example_functions.sync_sleep(seconds) within 5 seconds
+        Then result equals 0.01
+
+    Scenario: Sync functions exceeding the timeout fail after they completed
+        Given seconds <- 0.05
+        And timeout <- 0.01
+        When message <- features.example_functions.get_sync_timeout_error(seconds, timeout)
+        Then message equals "sync_sleep did not complete within 0.01 seconds"
+
+    Scenario: Async generators are iterated lazily
+        Given n <- 3
+        When numbers <- features.example_functions.async_count(n)
+        Then type(numbers) equals generator
+        When values <- builtins.list(numbers)
+        Then values equals [0, 1, 2]
+
+    Scenario: Call async functions concurrently
+        Given a <- 1
+        And b <- 2
+        And ping <- "ping"
+        And pong <- "pong"
+        When the following functions are called concurrently within 5 seconds
+            | function                                                 | results |
+            | features.example_functions.wait_for_partner(ping, pong) | r1      |
+            | features.example_functions.wait_for_partner(pong, ping) | r2      |
+            | features.example_functions.async_add(a, b)               | c       |
+            | features.example_functions.do_nothing()                  |         |
+        Then r1 equals "ping"
+        And r2 equals "pong"
+        And c equals 3
+
+    Scenario: Call a function on chunks of a CSV file
+        When the function double_values of module features.example_functions is called on chunks of features/example_table.csv as chunk writing the results to doubled (options: chunksize=2)
+        Then dataframe doubled equals
+            | int64 | float64 |
+            | val1  | val2    |
+            | 2     | 2.46    |
+            | 10    | -9.0    |
+            | -6    | 13.56   |
+
+    Scenario: Call a function on chunks of a Parquet file in a thread pool (alternative step)
+        Given factor <- 3
+        When scaled <- features.example_functions.scale_values(factor) on chunks of features/example_table.parquet as chunk (chunksize=1, executor="thread", max_workers=2)
+        Then dataframe scaled equals
+            | int64 | float64 |
+            | val1  | val2    |
+            | 3     | 3.69    |
+            | 15    | -13.5   |
+            | -9    | 20.34   |
+
+    Scenario: Call a function on chunks of a file in a process pool and combine the outputs
+        When totals <- features.example_functions.count_values() on chunks of features/example_table.csv as chunk (chunksize=1, executor="process", max_workers=2, combine="features.example_functions.add_counts")
+        Then totals equals {"rows": 3, "val1": 3}
+
+    Scenario: Concatenating the outputs of no chunks gives no result
+        Given outputs <- []
+        When concatenated <- beehyve.utils.partitions.concat_outputs(outputs)
+        Then concatenated equals None
+
+    @chunks_output
+    Scenario: Call a function on chunks of a file writing the outputs to a Parquet file
+        Given factor <- 2
+        When features.example_functions.scale_values(factor) is called on chunks of features/example_table.csv as chunk (chunksize=2, output="features/chunks_output.parquet")
+        Given dataframe doubled <- read(features/chunks_output.parquet)
+        Then dataframe doubled equals
+            | int64 | float64 |
+            | val1  | val2    |
+            | 2     | 2.46    |
+            | 10    | -9.0    |
+            | -6    | 13.56   |
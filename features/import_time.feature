@@ -0,0 +1,18 @@
+Feature: Import the step definitions of BeeHyve quickly
+
+    Scenario: Importing all steps does not import heavy dependencies
+        Given the following variables are loaded
+            | var           | val                                                         |
+            | module_name   | "beehyve.steps.all_steps"                                   |
+            | heavy_modules | ["pandas", "numpy", "pyarrow", "behave_pandas", "pytest"]  |
+        When (within_budget, imported_modules) <- features.example_functions.measure_import(module_name, heavy_modules)
+        Then imported_modules equals []
+
+    @import_time_budget
+    Scenario: Importing all steps is within the time budget
+        Given the following variables are loaded
+            | var           | val                                                         |
+            | module_name   | "beehyve.steps.all_steps"                                   |
+            | heavy_modules | ["pandas", "numpy", "pyarrow", "behave_pandas", "pytest"]  |
+        When (within_budget, imported_modules) <- features.example_functions.measure_import(module_name, heavy_modules, budget)
+        Then within_budget equals True
@@ -0,0 +1,42 @@
+Feature: Instrumentation
+
+    @instrumentation
+    Scenario: Steps are instrumented
+        Given dataframe df1 <-
+            | int64 | str  |
+            | val1  | val3 |
+            | 1     | text |
+            | 5     | ABC  |
+        When records <- beehyve.utils.instrumentation.get_step_records()
+        And n_records <- builtins.len(records)
+        And record <- records[0]
+        And (feature, scenario, step, pattern, status, start, wall_time, cpu_time, memory_peak, variable_sizes) <- record
+        And variable_names <- builtins.list(variable_sizes)
+        Then n_records equals 1
+        And feature equals "Instrumentation"
+        And scenario equals "Steps are instrumented"
+        And step equals "Given dataframe df1 <-"
+        And pattern equals "dataframe {name:w} <-"
+        And status equals "passed"
+        And variable_names equals ["df1"]
+
+    @instrumentation @tmp_dir
+    Scenario: Steps with the same text get the same pattern and counters are exported
+        Given df1 <- 1
+        And file_name <- "instrumentation.json"
+        Then df1 equals 1
+        And df1 equals 1
+        When beehyve.utils.counters.reset_counters() is called
+        And beehyve.utils.counters.increment_counter(file_name) is called
+        And json_file <- os.path.join(tmp_dir, file_name)
+        And beehyve.utils.instrumentation.export_json(json_file) is called
+        And data <- features.example_functions.read_json(json_file)
+        And counters <- data["counters"]
+        And steps <- data["steps"]
+        And first_check <- steps[2]
+        And second_check <- steps[3]
+        And first_pattern <- first_check["pattern"]
+        And second_pattern <- second_check["pattern"]
+        Then counters equals {"instrumentation.json": 1}
+        And first_pattern equals "{name:w} equals {expected_value}"
+        And second_pattern equals "{name:w} equals {expected_value}"
@@ -46,6 +46,33 @@ Feature: Example Feature
             | 5     | -4.5    | ABC  |
             | -3    | 6.78    | 123  |
 
+    @table_cache
+    Scenario: Identical tables are only parsed once
+        Given the following table is loaded into dataframe df1
+            | int64 | str  |
+            | val1  | val3 |
+            | 1     | text |
+            | 5     | ABC  |
+        And dataframe df2 <-
+            | int64 | str  |
+            | val1  | val3 |
+            | 1     | text |
+            | 5     | ABC  |
+        And the following variables are loaded
+            | var | val    |
+            | col | "val1" |
+        When features.example_functions.add_2_to_dataframe_inplace(df1, col) is called
+        And stats <- beehyve.utils.tables.get_table_cache_stats()
+        And hits <- stats[0]
+        And misses <- stats[1]
+        Then hits equals 1
+        And misses equals 1
+        And dataframe df2 is equal to
+            | int64 | str  |
+            | val1  | val3 |
+            | 1     | text |
+            | 5     | ABC  |
+
     Scenario: Load CSV into pandas Dataframe with kwargs
         Given the CSV file features/example_table_malformed.csv is loaded into dataframe df1 (read_csv kwargs: {"delimiter": ";", "skiprows": 1})
         Then dataframe df1 is equal to
@@ -64,6 +91,91 @@ Feature: Example Feature
             | 5     | -4.5    | ABC  |
             | -3    | 6.78    | 123  |
 
+    Scenario: Load Parquet file into pandas Dataframe
+        Given the Parquet file features/example_table.parquet is loaded into dataframe df1
+        Then dataframe df1 is equal to
+            | int64 | float64 | str  |
+            | val1  | val2    | val3 |
+            | 1     | 1.23    | text |
+            | 5     | -4.5    | ABC  |
+            | -3    | 6.78    | 123  |
+
+    Scenario: Load Parquet file into pandas Dataframe with columns and filters (alternative step)
+        Given dataframe df1 <- read(features/example_table.parquet, kwargs={"columns": ["val1", "val3"], "filters": [("val1", ">", 0)]})
+        Then dataframe df1 is equal to (kwargs: ignore_index=True)
+            | int64 | str  |
+            | val1  | val3 |
+            | 1     | text |
+            | 5     | ABC  |
+
+    Scenario: Load Feather file into pandas Dataframe
+        Given dataframe df1 <- read(features/example_table.feather)
+        Then dataframe df1 is equal to
+            | int64 | float64 | str  |
+            | val1  | val2    | val3 |
+            | 1     | 1.23    | text |
+            | 5     | -4.5    | ABC  |
+            | -3    | 6.78    | 123  |
+
+    Scenario: Load Feather file into pandas Dataframe with columns and filters
+        Given the Feather file features/example_table.feather is loaded into dataframe df1 (read kwargs: {"columns": ["val2"], "filters": [("val2", "<", 5)]})
+        Then dataframe df1 is equal to (kwargs: ignore_index=True)
+            | float64 |
+            | val2    |
+            | 1.23    |
+            | -4.5    |
+
+    Scenario: Load Feather file into pandas Dataframe filtering by columns that are not loaded
+        Given dataframe df1 <- read(features/example_table.feather, kwargs={"columns": ["val3"], "filters": [("val1", ">", 0)]})
+        And dataframe df2 <- read(features/example_table.feather, kwargs={"columns": ["val3"], "filters": [[("val1", "<", 0)], [("val2", "<", 0)]]})
+        And dataframe df3 <- read(features/example_table.feather, kwargs={"columns": ["val3"], "filters": [["val1", ">", 0], ["val2", ">", 0]]})
+        Then dataframe df1 is equal to (kwargs: ignore_index=True)
+            | str  |
+            | val3 |
+            | text |
+            | ABC  |
+        And dataframe df3 is equal to (kwargs: ignore_index=True)
+            | str  |
+            | val3 |
+            | text |
+        And dataframe df2 is equal to (kwargs: ignore_index=True)
+            | str  |
+            | val3 |
+            | ABC  |
+            | 123  |
+
+    @csv_cache
+    Scenario: Load CSV into pandas Dataframe using the CSV cache
+        Given the CSV file features/example_table.csv is loaded into dataframe df1
+        And dataframe df2 <- read(features/example_table.csv)
+        And dataframe df3 <- read(features/example_table_malformed.csv, kwargs={"delimiter": ";", "skiprows": 1})
+        When stats <- beehyve.utils.files.get_csv_cache_stats()
+        And hits <- stats[0]
+        And misses <- stats[1]
+        Then hits equals 1
+        And misses equals 2
+
+    @csv_cache
+    Scenario: Modifying a dataframe loaded using the CSV cache does not affect later loads
+        Given the CSV file features/example_table.csv is loaded into dataframe df1
+        And dataframe df2 <- read(features/example_table.csv)
+        And the following variables are loaded
+            | var | val    |
+            | col | "val1" |
+        When features.example_functions.add_2_to_dataframe_inplace(df1, col) is called
+        Then dataframe df1 is equal to
+            | int64 | float64 | str  |
+            | val1  | val2    | val3 |
+            | 3     | 1.23    | text |
+            | 7     | -4.5    | ABC  |
+            | -1    | 6.78    | 123  |
+        And dataframe df2 is equal to
+            | int64 | float64 | str  |
+            | val1  | val2    | val3 |
+            | 1     | 1.23    | text |
+            | 5     | -4.5    | ABC  |
+            | -3    | 6.78    | 123  |
+
     Scenario: Compare two dataframes
         Given the following table is loaded into dataframe df1
             | int  | float | str  |
@@ -124,6 +236,240 @@ Feature: Example Feature
             | -3   | 6.78  | 123  |
         Then dataframe df1 equals df2 (ignore_index=True, common_columns_only=True, ignore_dtypes=True, atol=1e-8, rtol=1e-5, check_exact=True)
 
+    Scenario: Compare two identical dataframes using the fast path
+        Given the following table is loaded into dataframe df1
+            | int  | float | str  |
+            | val1 | val2  | val3 |
+            | 1    | 1.23  | text |
+            | 5    | -4.5  | ABC  |
+            | -3   | 6.78  | 123  |
+        And the following table is loaded into dataframe df2
+            | int  | float | str  |
+            | val1 | val2  | val3 |
+            | 1    | 1.23  | text |
+            | 5    | -4.5  | ABC  |
+            | -3   | 6.78  | 123  |
+        When beehyve.utils.counters.reset_counters() is called
+        Then dataframe df1 is equal to dataframe df2
+        When counters <- beehyve.utils.counters.get_counters()
+        Then counters equals {"compare_dataframes.fast_path": 1}
+
+    Scenario: Compare two dataframes equal within tolerance using the full comparison
+        Given the following table is loaded into dataframe df1
+            | int  | float      | str  |
+            | val1 | val2       | val3 |
+            | 1    | 1.23       | text |
+            | 5    | -4.5       | ABC  |
+            | -3   | 6.78       | 123  |
+        And the following table is loaded into dataframe df2
+            | int  | float      | str  |
+            | val1 | val2       | val3 |
+            | 1    | 1.23       | text |
+            | 5    | -4.5       | ABC  |
+            | -3   | 6.78000001 | 123  |
+        When beehyve.utils.counters.reset_counters() is called
+        Then dataframe df1 is equal to dataframe df2
+        When counters <- beehyve.utils.counters.get_counters()
+        Then counters equals {"compare_dataframes.full_comparison": 1}
+
+    Scenario: Compare dataframes with a nullable string column containing a missing value
+        Given value <- "a"
+        And other_value <- "b"
+        And missing <- None
+        When df1 <- example_functions.create_nullable_string_df(value, missing)
+        And df2 <- example_functions.create_nullable_string_df(value, missing)
+        And df3 <- example_functions.create_nullable_string_df(other_value, missing)
+        And error <- example_functions.get_comparison_error(df1, df3)
+        Then dataframe df1 is equal to dataframe df2
+        And error equals 'DataFrame.iloc[:, 0] (column name="s") are different'
+
+    Scenario: Compare two dataframes ignoring the row order
+        Given the following table is loaded into dataframe df1
+            | int  | str  |
+            | val1 | val3 |
+            | 1    | text |
+            | 5    | ABC  |
+            | 5    | ABC  |
+            | -3   | 123  |
+        And the following table is loaded into dataframe df2
+            | int  | str  |
+            | val1 | val3 |
+            | -3   | 123  |
+            | 5    | ABC  |
+            | 1    | text |
+            | 5    | ABC  |
+        Then dataframe df1 is equal to dataframe df2 (kwargs: ignore_index=True, ignore_row_order=True)
+
+    Scenario: Report rows that occur a different number of times ignoring the row order
+        Given the following table is loaded into dataframe df1
+            | int  | str  |
+            | val1 | val3 |
+            | 1    | text |
+            | 5    | ABC  |
+            | 5    | ABC  |
+        And the following table is loaded into dataframe df2
+            | int  | str  |
+            | val1 | val3 |
+            | 5    | ABC  |
+            | 1    | text |
+            | 1    | text |
+        When error <- example_functions.get_row_order_comparison_error(df1, df2)
+        Then error equals "Rows do not match (ignoring the row order). 1 row(s) of the first object are missing in the second, 1 row(s) of the second object are missing in the first."
+
+    Scenario: Compare two dataframes without columns ignoring the row order
+        Given n_rows <- 3
+        And n_other_rows <- 2
+        When df1 <- example_functions.create_df_without_columns(n_rows)
+        And df2 <- example_functions.create_df_without_columns(n_rows)
+        And df3 <- example_functions.create_df_without_columns(n_other_rows)
+        And error <- example_functions.get_row_order_comparison_error(df1, df3)
+        Then dataframe df1 is equal to dataframe df2 (kwargs: ignore_index=True, ignore_row_order=True)
+        And error equals "Number of rows do not match. Got 3 and 2"
+
+    Scenario: Compare two dataframes with floats ignoring the row order (alternative step)
+        Given dataframe df1 <-
+            | int  | float | str  |
+            | val1 | val2  | val3 |
+            | 1    | 1.23  | text |
+            | 5    | -4.5  | ABC  |
+            | 5    | 4.5   | ABC  |
+            | -3   | 6.78  | 123  |
+        Then dataframe df1 equals (ignore_index=True, ignore_row_order=True)
+            | int  | float      | str  |
+            | val1 | val2       | val3 |
+            | 5    | 4.5        | ABC  |
+            | -3   | 6.78000001 | 123  |
+            | 5    | -4.5       | ABC  |
+            | 1    | 1.23       | text |
+
+    Scenario: Find all mismatches of two dataframes
+        Given the following table is loaded into dataframe df1
+            | int  | float | str  |
+            | val1 | val2  | val3 |
+            | 1    | 1.23  | text |
+            | 5    | -4.5  | ABC  |
+            | -3   | 6.78  | 123  |
+            | 7    | 0.0   | xyz  |
+        And the following table is loaded into dataframe df2
+            | int  | float | str  |
+            | val1 | val2  | val3 |
+            | 1    | 1.23  | text |
+            | 6    | -4.5  | abc  |
+            | -3   | 6.79  | 123  |
+        When report <- beehyve.utils.pandas.find_mismatches(df1, df2)
+        And (counts, rows, n_missing_in_second, n_missing_in_first, missing_in_second, missing_in_first) <- report
+        Then counts equals {"val1": 1, "val2": 1, "val3": 1}
+        And n_missing_in_second equals 1
+        And n_missing_in_first equals 0
+        And missing_in_second equals [3]
+        When n_rows <- builtins.len(rows)
+        Then n_rows equals 2
+        And dataframe df2 is equal to dataframe df2 (kwargs: max_report_rows=5)
+
+    Scenario: Compare pandas dataframe to a CSV file in chunks
+        Given the following table is loaded into dataframe df1
+            | int64 | float64 | str  |
+            | val1  | val2    | val3 |
+            | 1     | 1.23    | text |
+            | 5     | -4.5    | ABC  |
+            | -3    | 6.78    | 123  |
+        Then dataframe df1 is equal to CSV file features/example_table.csv (kwargs: chunksize=2)
+        And dataframe df1 equals read(features/example_table.csv)
+
+    Scenario: Compare pandas dataframe to a CSV file in chunks with kwargs
+        Given the following table is loaded into dataframe df1
+            | int64 | float64 | str  |
+            | val1  | val2    | val3 |
+            | 1     | 1.23    | text |
+            | 5     | -4.5    | ABC  |
+            | -3    | 6.79    | 123  |
+        And the following table is loaded into dataframe df2
+            | int64 | float64 |
+            | val1  | val2    |
+            | 1     | 1.23    |
+            | 5     | -4.5    |
+            | -3    | 6.78    |
+        Then dataframe df1 is equal to CSV file features/example_table.csv (kwargs: chunksize=1, rtol=0.01)
+        And dataframe df2 equals read(features/example_table.csv) (chunksize=1, common_columns_only=True)
+
+    Scenario: Compare pandas dataframe to a CSV file with missing values and decimals in later chunks
+        Given dataframe df1 <- read(features/example_table_missing.csv)
+        Then dataframe df1 is equal to CSV file features/example_table_missing.csv (kwargs: chunksize=2)
+        And dataframe df1 equals read(features/example_table_missing.csv) (chunksize=1)
+        And dataframe df1 equals read(features/example_table_missing.csv) (chunksize=1, ignore_dtypes=True)
+
+    Scenario: Report missing values in later chunks of a CSV file as mismatches
+        Given dataframe df1 <-
+            | int64 | int64 | object |
+            | val1  | val2  | val3   |
+            | 1     | 1     | a      |
+            | 2     | 2     | 1      |
+            | 3     | 3     | 2      |
+            | 4     | 4     | x      |
+        And file_name <- "features/example_table_missing.csv"
+        And chunksize <- 2
+        And ignore_dtypes <- True
+        When error <- example_functions.get_csv_comparison_error(df1, file_name, chunksize)
+        And error_ignoring_dtypes <- example_functions.get_csv_comparison_error(df1, file_name, chunksize, ignore_dtypes)
+        Then error equals "Rows 2 to 3 do not match CSV file features/example_table_missing.csv"
+        And error_ignoring_dtypes equals "Rows 2 to 3 do not match CSV file features/example_table_missing.csv"
+
+    Scenario: Compare pandas dataframe to a CSV file in chunks with read_csv kwargs
+        Given the CSV file features/example_table.csv is loaded into dataframe df1
+        And chunk_size <- 2
+        Then dataframe df1 is equal to CSV file features/example_table_malformed.csv (kwargs: chunksize=1, read_csv kwargs: {"delimiter": ";", "skiprows": 1})
+        And dataframe df1 equals read(features/example_table_malformed.csv, kwargs={"delimiter": ";", "skiprows": 1})
+        When chunks <- example_functions.iterate_in_chunks(df1, chunk_size)
+        Then the chunks of chunks are equal to CSV file features/example_table_malformed.csv (read_csv kwargs: {"delimiter": ";", "skiprows": 1})
+
+    Scenario: Compare pandas dataframe to an unchanged snapshot
+        Given the CSV file features/example_table.csv is loaded into dataframe df1
+        When beehyve.utils.counters.reset_counters() is called
+        Then dataframe df1 matches snapshot example_table
+        When counters <- beehyve.utils.counters.get_counters()
+        Then counters equals {"snapshots.verified_by_hash": 1}
+
+    Scenario: Compare pandas dataframe to a snapshot within tolerance
+        Given the following table is loaded into dataframe df1
+            | int64 | float64    | str  |
+            | val1  | val2       | val3 |
+            | 1     | 1.23       | text |
+            | 5     | -4.5       | ABC  |
+            | -3    | 6.78000001 | 123  |
+        When beehyve.utils.counters.reset_counters() is called
+        Then dataframe df1 equals snapshot(example_table)
+        And dataframe df1 matches snapshot example_table (kwargs: atol=0.01)
+        When counters <- beehyve.utils.counters.get_counters()
+        And n_compared <- counters["snapshots.compared"]
+        Then n_compared equals 2
+
+    @tmp_dir
+    Scenario: Update a snapshot
+        Given the CSV file features/example_table.csv is loaded into dataframe df1
+        And the following variables are loaded
+            | var           | val        |
+            | snapshot_name | "my_table" |
+            | update        | True       |
+        When beehyve.utils.counters.reset_counters() is called
+        And beehyve.utils.snapshots.compare_dataframe_to_snapshot(df1, snapshot_name, tmp_dir, update) is called
+        And beehyve.utils.snapshots.compare_dataframe_to_snapshot(df1, snapshot_name, tmp_dir) is called
+        And counters <- beehyve.utils.counters.get_counters()
+        Then counters equals {"snapshots.updated": 1, "snapshots.verified_by_hash": 1}
+
+    Scenario: Compare two series ignoring the row order
+        Given the following table is loaded into series series1
+            | int  |
+            | val1 |
+            | 1    |
+            | 5    |
+            | -3   |
+        Then series series1 is equal to (kwargs: ignore_index=True, ignore_row_order=True)
+            | int  |
+            | val1 |
+            | -3   |
+            | 1    |
+            | 5    |
+
     Scenario: Compare pandas dataframe to table with kwargs
         Given the following table is loaded into dataframe df1
             | int64 | float64 | str  |
@@ -266,4 +612,103 @@ Feature: Example Feature
             | val1 |
             | 1    |
             | 5    |
-            | -3   |
\ No newline at end of file
+            | -3   |
+    Scenario: Generate synthetic dataframes from a schema
+        Given a synthetic dataframe users with 1000 rows is generated from the following schema
+            | column  | dtype    | distribution    | cardinality | null_rate |
+            | user_id | int      | sequence(1)     |             |           |
+            | country | category | zipf(1.5)       | 20          |           |
+            | score   | float    | normal(100, 15) |             | 0.1       |
+            | active  | bool     |                 |             |           |
+            | created | datetime |                 |             |           |
+        And a synthetic dataframe orders with 5000 rows is generated from the following schema (seed: 7)
+            | column  | dtype | distribution     | references    |
+            | user_id | int   |                  | users.user_id |
+            | amount  | float | exponential(20)  |               |
+            | items   | int   | uniform(1, 10)   |               |
+        And key <- "user_id"
+        When summary <- example_functions.describe_synthetic(users)
+        And n_missing <- example_functions.count_missing_references(orders, key, users, key)
+        Then summary equals {"n_rows": 1000, "dtypes": ["int64", "category", "float64", "bool", "datetime64[ns]"]}
+        And n_missing equals 0
+
+    Scenario: Generate synthetic dataframes reproducibly (alternative step)
+        Given dataframe df1 <- generate(1e4 rows, seed=3)
+            | column | dtype | cardinality | null_rate |
+            | name   | str   | 50          | 0.2       |
+            | count  | int   |             | 0.2       |
+        And dataframe df2 <- generate(1e4 rows, seed=3)
+            | column | dtype | cardinality | null_rate |
+            | name   | str   | 50          | 0.2       |
+            | count  | int   |             | 0.2       |
+        When summary <- example_functions.describe_synthetic(df1)
+        Then dataframe df1 equals df2
+        And summary equals {"n_rows": 10000, "dtypes": ["object", "Int64"]}
+
+    Scenario: Compare chunks of a generator to a dataframe
+        Given the CSV file features/example_table.csv is loaded into dataframe df1
+        And chunk_size <- 2
+        When chunks <- example_functions.iterate_in_chunks(df1, chunk_size)
+        Then type(chunks) equals generator
+        And the chunks of chunks are equal to dataframe df1
+
+    Scenario: Compare chunks of a generator to a dataframe with kwargs (alternative step)
+        Given dataframe df1 <- read(features/example_table.csv)
+        And dataframe df2 <-
+            | int64 | float64 | str  |
+            | val1  | val2    | val3 |
+            | 1     | 1.23    | text |
+            | 5     | -4.5    | ABC  |
+            | -3    | 6.78    | 123  |
+        And chunk_size <- 2
+        When chunks <- example_functions.iterate_in_chunks(df1, chunk_size)
+        Then chunks(chunks) equals df2 (ignore_index=True, ignore_dtypes=True)
+
+    Scenario: Compare chunks of a generator to a CSV file in chunks of a different size
+        Given dataframe df1 <- read(features/example_table.csv)
+        And chunk_size <- 2
+        When chunks <- example_functions.iterate_in_chunks(df1, chunk_size)
+        Then the chunks of chunks are equal to CSV file features/example_table.csv (kwargs: chunksize=1)
+
+    Scenario: Compare chunks of a generator to a CSV file (alternative step)
+        Given dataframe df1 <- read(features/example_table.csv)
+        And chunk_size <- 1
+        When chunks <- example_functions.iterate_in_chunks(df1, chunk_size)
+        Then chunks(chunks) equals read(features/example_table.csv)
+
+    Scenario: Report the rows of the first mismatching chunk
+        Given dataframe df1 <- read(features/example_table.csv)
+        And dataframe df2 <-
+            | int64 | float64 | object |
+            | val1  | val2    | val3   |
+            | 1     | 1.23    | text   |
+            | 5     | -4.5    | ABC    |
+            | -3    | 0.0     | 123    |
+        And chunk_size <- 2
+        When chunks <- example_functions.iterate_in_chunks(df1, chunk_size)
+        And error <- example_functions.get_chunk_comparison_error(chunks, df2)
+        Then error equals "Rows 2 to 2 do not match the dataframe"
+
+    Scenario: Count the rows of chunks
+        Given dataframe df1 <- read(features/example_table.csv)
+        And chunk_size <- 2
+        When chunks <- example_functions.iterate_in_chunks(df1, chunk_size)
+        Then the chunks of chunks have 3 rows in total (at most 2 rows per chunk)
+
+    Scenario: Count the rows of chunks (alternative step)
+        Given dataframe df1 <- read(features/example_table.csv)
+        And chunk_size <- 1
+        When chunks <- example_functions.iterate_in_chunks(df1, chunk_size)
+        Then len(chunks(chunks)) equals 3
+
+    Scenario: Check an invariant for every chunk
+        Given dataframe df1 <- read(features/example_table.csv)
+        And chunk_size <- 2
+        When chunks <- example_functions.iterate_in_chunks(df1, chunk_size)
+        Then every chunk of chunks satisfies example_functions.has_no_missing_values
+
+    Scenario: Check an invariant for every chunk (alternative step)
+        Given dataframe df1 <- read(features/example_table.csv)
+        And chunk_size <- 2
+        When chunks <- example_functions.iterate_in_chunks(df1, chunk_size)
+        Then chunks(chunks) satisfy example_functions.has_no_missing_values
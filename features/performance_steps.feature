@@ -0,0 +1,100 @@
+Feature: Performance Steps
+
+    Scenario: Benchmark a function using the variables in the context
+        Given df <- 1
+        When the function do_nothing of module features.example_functions is benchmarked 10 times
+        And n <- do_nothing_runtime["repeat"]
+        Then n equals 10
+        And the max runtime of do_nothing is below 1 s
+
+    Scenario: Benchmark a function after warm-up runs
+        Given the following table is loaded into dataframe df
+            | int  | float |
+            | val1 | val2  |
+            | 1    | 1.5   |
+            | 2    | 2.5   |
+        And col <- "val1"
+        When features.example_functions.add_2_to_dataframe(df, col) is benchmarked 20 times after 2 warm-up runs
+        And n <- add_2_to_dataframe_runtime["repeat"]
+        Then n equals 20
+        And the p95 runtime of add_2_to_dataframe is below 1000 ms
+        And the median runtime of add_2_to_dataframe is below 1 s
+
+    Scenario: Benchmark the same function twice writing the statistics to named variables
+        Given df <- 1
+        And small <- "a"
+        And large <- "aaaaaaaaaa"
+        When small_runtime <- features.example_functions.join(small, small) benchmarked 5 times
+        And large_runtime <- features.example_functions.join(large, large) benchmarked 5 times after 1 warm-up runs
+        And the function do_nothing of module features.example_functions is benchmarked 3 times writing the statistics to stats
+        And n <- stats["repeat"]
+        Then n equals 3
+        And the max runtime stored in small_runtime is below 1 s
+        And the median runtime stored in large_runtime is below 1000 ms
+
+    @tmp_dir @benchmark_history
+    Scenario: Benchmarks are appended to the history file
+        Given a <- "a"
+        And b <- "b"
+        And function <- "features.example_functions.join"
+        When features.example_functions.join(a, b) is benchmarked 3 times
+        And features.example_functions.do_nothing() is benchmarked 3 times
+        And records <- beehyve.utils.benchmarking.read_benchmark_history(history_file, function)
+        And n_records <- builtins.len(records)
+        And record <- records[0]
+        And scenario <- record["scenario"]
+        And n <- record["repeat"]
+        Then n_records equals 1
+        And scenario equals "Benchmarks are appended to the history file"
+        And n equals 3
+
+    Scenario: Measure the peak memory of a function call
+        Given n_rows <- 100000
+        And col <- "col_a"
+        When df <- features.example_functions.create_large_df(n_rows) measuring its peak memory
+        And df2 <- features.example_functions.add_2_to_dataframe(df, col) measuring its peak memory
+        And rss_peak <- add_2_to_dataframe_memory["rss_peak"]
+        Then rss_peak equals None
+        And the peak memory of create_large_df is below 100 MB
+        And the peak memory of add_2_to_dataframe is below 3 times the size of its input dataframes
+
+    Scenario: Earlier allocations are not part of the peak memory if the peak cannot be reset
+        Given n_bytes <- 100000000
+        And one_mb <- 1000000
+        When peak <- features.example_functions.measure_memory_without_reset_peak(n_bytes)
+        And below_one_mb <- operator.lt(peak, one_mb)
+        Then below_one_mb equals True
+
+    @rss_sampling
+    Scenario: Sample the RSS while measuring the peak memory of a function call
+        Given n_rows <- 100000
+        When the function create_large_df of module features.example_functions is called writing the results to df measuring its peak memory
+        And rss_peak <- create_large_df_memory["rss_peak"]
+        Then type(rss_peak) equals int
+        And the peak RSS of create_large_df is below 1 GiB
+
+    Scenario: Measure the scaling of a function on generated inputs
+        When the scaling of features.example_functions.sum_columns is measured on inputs of features.example_functions.create_large_df up to 1e5 rows
+        And n_sizes <- builtins.len(sum_columns_scaling)
+        And largest <- sum_columns_scaling[-1]
+        And size <- largest["size"]
+        Then n_sizes equals 5
+        And size equals 100000
+        And sum_columns scales at most O(n log n)
+
+    Scenario: Functions growing faster than a complexity are detected
+        Given n_rows <- 100
+        And complexity <- "O(n)"
+        When df <- features.example_functions.create_large_df(n_rows)
+        And the scaling of features.example_functions.count_smaller_pairs is measured on df resampled up to 800 rows
+        And fails <- features.example_functions.fails_complexity(count_smaller_pairs_scaling, complexity)
+        Then fails equals True
+        And count_smaller_pairs scales at most O(n^2)
+
+    Scenario: Checking the complexity requires at least two distinct sizes
+        Given complexity <- "O(n)"
+        When the scaling of features.example_functions.sum_columns is measured on inputs of features.example_functions.create_large_df up to 2 rows
+        And n_sizes <- builtins.len(sum_columns_scaling)
+        And error <- features.example_functions.get_complexity_check_error(sum_columns_scaling, complexity)
+        Then n_sizes equals 1
+        And error equals "checking the complexity requires measurements for at least two distinct sizes, got [2], use a larger maximum size"
@@ -0,0 +1,25 @@
+Feature: Register the steps of BeeHyve using a precompiled index
+
+    Scenario: An index of the registered steps is up to date
+        When index <- beehyve.utils.registry_index.create_registry_index()
+        And up_to_date <- beehyve.utils.registry_index.is_up_to_date(index)
+        Then up_to_date equals True
+
+    Scenario: An index created for other versions is outdated
+        Given the following variables are loaded
+            | var   | val                                                                                 |
+            | index | {"index_version": 1, "versions": {"beehyve": "0.0.0"}, "modules": {}, "steps": []}  |
+        When up_to_date <- beehyve.utils.registry_index.is_up_to_date(index)
+        Then up_to_date equals False
+
+    Scenario: A missing index is not loaded
+        Given file_name <- "features/does_not_exist.json"
+        When loaded <- beehyve.utils.registry_index.load_registry_index(file_name)
+        Then loaded equals False
+
+    @tmp_dir
+    Scenario: Steps are registered using the index without compiling their patterns
+        When (loaded, same_steps, n_compiled) <- features.example_functions.import_steps_with_registry_index(tmp_dir)
+        Then loaded equals True
+        And same_steps equals True
+        And n_compiled equals 0
@@ -0,0 +1,47 @@
+Feature: Run scenarios in parallel using BeeHyve
+
+    Scenario: Distribute scenarios across shards
+        Given the following variables are loaded
+            | var       | val                                              |
+            | locations | ["a.feature:1", "a.feature:5", "b.feature:3"]    |
+            | n_shards  | 2                                                |
+        When shards <- beehyve.run_beehyve.shard_scenarios(locations, n_shards)
+        Then shards equals [["a.feature:1", "b.feature:3"], ["a.feature:5"]]
+
+    Scenario: Distribute scenarios across more shards than scenarios
+        Given the following variables are loaded
+            | var       | val                            |
+            | locations | ["a.feature:1", "a.feature:5"] |
+            | n_shards  | 4                              |
+        When shards <- beehyve.run_beehyve.shard_scenarios(locations, n_shards)
+        Then shards equals [["a.feature:1"], ["a.feature:5"]]
+
+    Scenario: Distribute scenarios across shards using a seed
+        Given the following variables are loaded
+            | var       | val                                                           |
+            | locations | ["a.feature:1", "a.feature:5", "b.feature:3", "b.feature:9"] |
+            | n_shards  | 2                                                             |
+            | seed      | 42                                                            |
+        When shards <- beehyve.run_beehyve.shard_scenarios()
+        And same_shards <- beehyve.run_beehyve.shard_scenarios()
+        Then the value of variable shards is [["b.feature:3", "b.feature:9"], ["a.feature:1", "a.feature:5"]]
+        And the value of variable same_shards is [["b.feature:3", "b.feature:9"], ["a.feature:1", "a.feature:5"]]
+
+    Scenario: Run shards in subprocesses that can start process pools
+        Given the following variables are loaded
+            | var         | val                                             |
+            | shards      | [["features/function_steps.feature"]]           |
+            | behave_args | ["--name", "in a process pool", "--no-skipped"] |
+        When results <- beehyve.run_beehyve.run_shards(shards, behave_args)
+        And statuses <- features.example_functions.get_shard_statuses(results)
+        Then statuses equals [(0, ["passed"])]
+
+    Scenario: Merge the reports of multiple shards
+        Given the following variables are loaded
+            | var     | val                                                                                                                                                                                                                                                                                                                                                                                                                        |
+            | reports | [[{"location": "b.feature:1", "elements": [{"location": "b.feature:3", "type": "scenario", "status": "passed"}]}, {"location": "a.feature:1", "elements": [{"location": "a.feature:9", "type": "scenario", "status": "skipped"}]}], [{"location": "a.feature:1", "elements": [{"location": "a.feature:9", "type": "scenario", "status": "failed"}, {"location": "a.feature:3", "type": "scenario", "status": "passed"}]}]] |
+        When report <- beehyve.run_beehyve.merge_reports(reports)
+        And statuses <- features.example_functions.get_report_statuses(report)
+        And summary <- beehyve.run_beehyve._summarize_report(report)
+        Then statuses equals {"a.feature:3": "passed", "a.feature:9": "failed", "b.feature:3": "passed"}
+        And summary equals "1 scenarios failed, 2 scenarios passed"
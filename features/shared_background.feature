@@ -0,0 +1,43 @@
+@shared_background
+Feature: Shared Background
+
+    Background: Load variables once per feature
+        Given the following table is loaded into dataframe df
+            | int  | float |
+            | val1 | val2  |
+            | 1    | 1.5   |
+            | 2    | 2.5   |
+        And col <- "val1"
+        And name <- "shared_background"
+        And n <- 3
+        When n_calls <- features.example_functions.count_calls(name)
+        And n_reused_before <- features.example_functions.count_reused_backgrounds()
+        And arr <- numpy.arange(n)
+
+    Scenario: The background is executed in the first scenario
+        When features.example_functions.add_2_to_dataframe_inplace(df, col) is called
+        And reused <- features.example_functions.check_background_reuse(n_reused_before)
+        Then n_calls equals 1
+        And reused equals True
+        And dataframe df is equal to
+            | int  | float |
+            | val1 | val2  |
+            | 3    | 1.5   |
+            | 4    | 2.5   |
+
+    Scenario: Later scenarios reuse the variables of the background without modifications of other scenarios
+        When reused <- features.example_functions.check_background_reuse(n_reused_before)
+        Then n_calls equals 1
+        And reused equals True
+        And dataframe df is equal to
+            | int  | float |
+            | val1 | val2  |
+            | 1    | 1.5   |
+            | 2    | 2.5   |
+
+    Scenario: Shared numpy arrays are read-only
+        When writeable <- features.example_functions.is_writeable(arr)
+        And reused <- features.example_functions.check_background_reuse(n_reused_before)
+        Then writeable equals False
+        And n_calls equals 1
+        And reused equals True
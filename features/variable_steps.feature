@@ -100,4 +100,52 @@ Feature: Example Variable Steps Feature
     @dummy_env
     Scenario: Check environment variables (from existing env)
         Then env(ENV_A) equals 1
-        And env(ENV_B) equals abc
\ No newline at end of file
+        And env(ENV_B) equals abc
+
+    @small_spill_budget @spill_vars
+    Scenario: Variables exceeding the memory budget are spilled to disk and reloaded
+        When beehyve.utils.counters.reset_counters() is called
+        And df1 <- features.example_functions.create_new_df()
+        And df2 <- features.example_functions.create_new_df()
+        And counters <- beehyve.utils.counters.get_counters()
+        Then counters equals {"variables.spilled": 1}
+        And dataframe df1 is equal to
+            | int   | int   | int   |
+            | col_a | col_b | col_c |
+            | 0     | 0     | 0     |
+            | 0     | 0     | 0     |
+            | 0     | 0     | 0     |
+        And dataframe df2 is equal to
+            | int   | int   | int   |
+            | col_a | col_b | col_c |
+            | 0     | 0     | 0     |
+            | 0     | 0     | 0     |
+            | 0     | 0     | 0     |
+
+    @small_spill_budget @spill_vars
+    Scenario: Variables modified in place by a step are not spilled while the step uses them
+        When df1 <- features.example_functions.create_new_df()
+        And df2 <- features.example_functions.create_new_df()
+        And features.example_functions.increment_in_place(df1, df2) is called
+        Then dataframe df1 is equal to
+            | int   | int   | int   |
+            | col_a | col_b | col_c |
+            | 1     | 1     | 1     |
+            | 1     | 1     | 1     |
+            | 1     | 1     | 1     |
+        And dataframe df2 is equal to
+            | int   | int   | int   |
+            | col_a | col_b | col_c |
+            | 1     | 1     | 1     |
+            | 1     | 1     | 1     |
+            | 1     | 1     | 1     |
+
+    @small_spill_budget @spill_vars
+    Scenario: Spilled arrays are reloaded transparently
+        Given n <- 4
+        When arr <- numpy.arange(n)
+        And squares <- numpy.square(arr)
+        And total <- builtins.sum(arr)
+        And total_squares <- builtins.sum(squares)
+        Then total equals 6
+        And total_squares equals 14
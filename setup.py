@@ -22,8 +22,12 @@ REQUIRED = [
     "behave-pandas>=0.4",
     "parse>=1.19",
     "pytest>=6.2.5",
+    "click>=7",
 ]
 EXTRAS = {
+    "arrow": [
+        "pyarrow>=10",
+    ],
     "dev": [
         "black>=20.8b0",
         "coverage>=5.5",
@@ -64,6 +68,7 @@ setup(
     entry_points={
         "console_scripts": [
             "create-beehyve-stubs=beehyve.create_beehyve_step_stubs:main",
+            "beehyve-run=beehyve.run_beehyve:main",
         ],
     },
 )